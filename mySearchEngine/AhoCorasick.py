@@ -0,0 +1,243 @@
+from collections import deque
+
+import numpy as np
+
+from Parser import parse, CONCAT, ALT, QUEST, DOT, CLASS, fold_tree
+from charclass import chars, width
+
+# ========= Aho–Corasick : toutes les occurrences d'un ensemble de mots en une passe =========
+#
+# Trie des mots + liens d'échec (plus long suffixe propre qui est encore un
+# préfixe du trie) : chaque caractère du texte fait avancer un seul état, et
+# l'état courant connaît tous les mots qui finissent à cette position.
+#
+# Deux versions du même automate :
+#   - sur les caractères (dictionnaires) : finditer(ligne), matchs egrep ;
+#   - sur les octets UTF-8 (table dense 256 colonnes) : ends(buf), préfiltre de
+#     bytescan.py. En Python, une boucle par octet plafonne à quelques Mo/s :
+#     le buffer est coupé en LANES tranches parcourues en même temps (une
+#     transition NumPy par colonne pour toutes les tranches). Chaque tranche
+#     démarre max_len - 1 octets plus tôt que sa zone (état initial), ce qui
+#     suffit pour ne rater aucune occurrence à cheval sur deux tranches.
+
+LANES = 1 << 14             # tranches parcourues en parallèle
+MIN_LANE = 64               # octets minimum par tranche (petits buffers : moins de tranches)
+BLOCK_SIZE = 1 << 24        # au-delà, le buffer est traité par blocs (copie bornée)
+MAX_WORDS = 1024            # taille max d'un langage fini développé en liste de mots
+
+
+def _build_trie(sequences):
+    """
+    Trie + liens d'échec (parcours en largeur) sur des séquences de symboles.
+    Renvoie (goto, fail, out) : out[s] = longueurs des mots qui finissent en s.
+    """
+    goto = [{}]
+    out = [set()]
+    for seq in sequences:
+        s = 0
+        for sym in seq:
+            nxt = goto[s].get(sym)
+            if nxt is None:
+                goto.append({})
+                out.append(set())
+                nxt = goto[s][sym] = len(goto) - 1
+            s = nxt
+        out[s].add(len(seq))
+
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        r = queue.popleft()
+        for sym, s in goto[r].items():
+            queue.append(s)
+            f = fail[r]
+            while f and sym not in goto[f]:
+                f = fail[f]
+            fail[s] = goto[f].get(sym, 0)
+            out[s] |= out[fail[s]]
+    return goto, fail, out
+
+
+class AhoCorasick:
+    def __init__(self, words):
+        self.words = sorted(set(words))
+        if not self.words or "" in self.words:
+            raise ValueError("Aho-Corasick needs a non-empty set of non-empty words")
+        self.word_set = frozenset(self.words)
+        self.goto, self.fail, self.out = _build_trie(self.words)
+        self._byte_table = None
+
+    def __str__(self):
+        return f"AhoCorasick({len(self.words)} mots, {len(self.goto)} états)"
+
+    # ----- mot entier (même interface que les autres automates) -----
+
+    def match(self, word: str) -> bool:
+        return word in self.word_set
+
+    # ----- recherche dans une ligne (egrep) -----
+
+    def occurrences(self, line: str):
+        """Toutes les occurrences (début, fin), chevauchements compris, par fin croissante."""
+        goto, fail, out = self.goto, self.fail, self.out
+        s = 0
+        for i, ch in enumerate(line):
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            for length in out[s]:
+                yield i + 1 - length, i + 1
+
+    def finditer(self, line: str):
+        """Matchs (début, fin) sans chevauchement, sémantique egrep "leftmost-longest"."""
+        pos = 0
+        for start, end in sorted(self.occurrences(line), key=lambda m: (m[0], -m[1])):
+            if start >= pos:
+                yield start, end
+                pos = end
+
+    # ----- préfiltre sur des octets (bytescan.py) -----
+
+    def byte_table(self):
+        """
+        (table, first_accept, max_len) de l'automate sur les octets UTF-8.
+        table[s * 256 + b] = 256 * état suivant ; les états acceptants sont
+        renumérotés en dernier : "un mot finit ici" ⇔ état >= first_accept.
+        """
+        if self._byte_table is None:
+            encoded = [w.encode("utf-8") for w in self.words]
+            goto, fail, out = _build_trie(encoded)
+            n = len(goto)
+            dense = np.zeros((n, 256), dtype=np.int64)
+            queue = deque([0])
+            while queue:                        # parcours en largeur : fail[s] est déjà rempli
+                s = queue.popleft()
+                for b in range(256):
+                    t = goto[s].get(b)
+                    if t is not None:
+                        queue.append(t)
+                    else:
+                        t = int(dense[fail[s], b]) if s else 0
+                    dense[s, b] = t
+            order = sorted(range(n), key=lambda s: (bool(out[s]), s))     # 0 reste l'état 0
+            rank = np.empty(n, dtype=np.int64)
+            rank[order] = np.arange(n)
+            table = (rank[dense[order]] * 256).astype(np.int32).ravel()
+            first_accept = 256 * sum(1 for s in range(n) if not out[s])
+            self._byte_table = (table, first_accept, max(map(len, encoded)))
+        return self._byte_table
+
+    def ends(self, buf, start: int = 0, end: int = None) -> np.ndarray:
+        """Positions (absolues, croissantes, fin exclue) où un mot finit dans buf[start:end]."""
+        if end is None:
+            end = len(buf)
+        table, first_accept, max_len = self.byte_table()
+        overlap = max_len - 1
+        data = np.frombuffer(buf, dtype=np.uint8, count=end - start, offset=start)
+        found = []
+        for block in range(0, len(data), BLOCK_SIZE):
+            lead = min(block, overlap)              # octets du bloc précédent, pour l'amorçage
+            hits = self._block_ends(data[block - lead:block + BLOCK_SIZE], lead, table, first_accept, overlap)
+            found.append(hits + (start + block - lead))
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    @staticmethod
+    def _block_ends(data, lead, table, first_accept, overlap):
+        n = len(data)
+        lanes = max(1, min(LANES, n // MIN_LANE))
+        width = -(-n // lanes)
+        padded = np.zeros(overlap + lanes * width, dtype=np.uint8)
+        padded[overlap:overlap + n] = data
+        # rows[c, j] = octet c de la tranche j (amorçage compris) : lignes contiguës
+        rows = np.ascontiguousarray(np.lib.stride_tricks.as_strided(
+            padded, shape=(width + overlap, lanes), strides=(1, width)))
+        base = np.arange(lanes, dtype=np.int64) * width
+        states = np.zeros(lanes, dtype=np.int32)
+        hits = []
+        for c in range(width + overlap):
+            states = table[states + rows[c]]
+            if c >= overlap and states.max() >= first_accept:
+                lane_ids = np.flatnonzero(states >= first_accept)
+                hits.append(base[lane_ids] + (c - overlap + 1))
+        if not hits:
+            return np.empty(0, dtype=np.int64)
+        hits = np.sort(np.concatenate(hits))
+        return hits[(hits > lead) & (hits <= n)]
+
+    def terms_containing(self, terms) -> list:
+        """Ids des termes (vocabulaire) qui contiennent au moins un des mots."""
+        joined = JoinedTerms.for_terms(terms)
+        ends = self.ends(joined.buf)
+        return np.unique(np.searchsorted(joined.newlines, ends - 1)).tolist()
+
+
+class JoinedTerms:
+    """Vocabulaire mis bout à bout ("\\n" entre deux termes) pour un seul passage d'Aho–Corasick."""
+
+    _last = None
+
+    def __init__(self, terms):
+        self.terms = terms
+        self.buf = "\n".join(terms).encode("utf-8")
+        view = np.frombuffer(self.buf, dtype=np.uint8)
+        self.newlines = np.flatnonzero(view == 0x0A)
+
+    @classmethod
+    def for_terms(cls, terms):
+        """Un seul buffer par vocabulaire (construit au premier appel)."""
+        if cls._last is None or cls._last.terms is not terms:
+            cls._last = cls(terms)
+        return cls._last
+
+
+# ========= RegEx = alternative de littéraux =========
+
+def literal_alternatives(pattern: str):
+    """
+    Mots du langage si la RegEx n'a que des caractères, des classes, des
+    concaténations, des alternatives et des '?' (ex: "king|queen|prince|duke",
+    "(king|queen)dom", "gr[ae]y", "colou?r"), au plus MAX_WORDS mots non vides ;
+    None sinon (joker, étoile, plus, ancre, mot vide ou langage trop grand).
+    Un seul mot : la RegEx est un littéral pur (échappements compris, "a\\.b" → "a.b").
+    """
+    def combine(node, subs):
+        if not node.subs:
+            if node.root == CLASS:
+                return set(chars(node.ranges)) if width(node.ranges) <= MAX_WORDS else None
+            if node.root == DOT or node.root > 0x10FFFF:
+                return None                     # joker, ancres
+            return {chr(node.root)}
+        if None in subs:
+            return None
+        if node.root == ALT:
+            words = subs[0] | subs[1]
+        elif node.root == CONCAT:
+            if len(subs[0]) * len(subs[1]) > MAX_WORDS:
+                return None
+            words = {x + y for x in subs[0] for y in subs[1]}
+        elif node.root == QUEST:
+            words = subs[0] | {""}
+        else:
+            return None                         # STAR / PLUS : langage infini
+        return words if len(words) <= MAX_WORDS else None
+
+    words = fold_tree(parse(pattern), combine)
+    if words is None or "" in words:
+        return None
+    return sorted(words)
+
+
+# --------- TESTS ----------
+if __name__ == "__main__":
+    ac = AhoCorasick(["he", "she", "his", "hers"])
+    print(ac)
+    line = "ushers and his sheep"
+    print("occurrences :", [line[s:e] for s, e in ac.occurrences(line)])
+    print("egrep       :", [line[s:e] for s, e in ac.finditer(line)])
+
+    text = ("rien\n" * 1000 + "the king and the queen\n" + "rien\n" * 1000 + "le duc (duke)\n").encode()
+    king = AhoCorasick(["king", "queen", "prince", "duke"])
+    print("fins d'occurrences :", king.ends(text).tolist())
+
+    for p in ["king|queen|prince|duke", "(king|queen)dom", "Sargon", "S(a|g|r)+on", "k.ng", "gr[ae]y", "colou?r"]:
+        print(f"{p!r:26} → {literal_alternatives(p)}")
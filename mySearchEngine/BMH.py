@@ -0,0 +1,104 @@
+from KMP import KMP
+from match_output import iter_line_matches, write_matches
+
+# ========= Boyer–Moore–Horspool : littéraux purs =========
+#
+# On compare le dernier caractère de la fenêtre ; s'il ne convient pas, la
+# fenêtre avance de shift[c] (distance entre la dernière occurrence de c dans
+# le motif, hors dernier caractère, et la fin du motif ; m si c n'y est pas).
+# Pour un motif long sur un grand alphabet, la plupart des sauts valent m :
+# on n'examine qu'environ un caractère sur m (KMP les lit tous).
+# Le test de la fenêtre entière se fait par comparaison de tranches (en C).
+#
+# StrFind : même interface autour de str.find (C, "two-way"/BMH interne de
+# CPython), référence pour tests/bench_literal.py.
+
+# Seuil mesuré (tests/bench_literal.py, texte anglais et ADN) : dès 3 caractères,
+# BMH dépasse KMP même sur un alphabet de 4 lettres ou un motif répétitif ("AAAA") ;
+# à 1-2 caractères les sauts ne compensent pas le test de la fenêtre.
+BMH_MIN_LENGTH = 3
+
+
+class BMH:
+    def __init__(self, pattern: str):
+        if not pattern:
+            raise ValueError("BMH needs a non-empty pattern")
+        self.pattern = pattern
+        self.m = len(pattern)
+        # le dernier caractère est exclu : sinon un match décalerait de 0
+        self.shift = {c: self.m - 1 - i for i, c in enumerate(pattern[:-1])}
+
+    def __str__(self):
+        return f"BMH({self.pattern!r}, sauts={self.shift})"
+
+    def match(self, word: str) -> bool:
+        return word == self.pattern
+
+    def finditer(self, text: str):
+        """Occurrences (début, fin) sans chevauchement, comme egrep (cf. bytescan.py)."""
+        p, m, shift, last = self.pattern, self.m, self.shift, self.pattern[-1]
+        i, limit = 0, len(text) - m
+        while i <= limit:
+            c = text[i + m - 1]
+            if c == last and text[i:i + m] == p:
+                yield i, i + m
+                i += m
+            else:
+                i += shift.get(c, m)
+
+    def count(self, text: str) -> int:
+        return sum(1 for _ in self.finditer(text))
+
+    def search_in_file(self, filepath: str) -> bool:
+        """Même affichage que KMP.search_in_file."""
+        return write_matches(iter_line_matches(self, filepath))
+
+
+class StrFind:
+    """Référence : mêmes occurrences que BMH / KMP, trouvées par str.find."""
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.m = len(pattern)
+
+    def __str__(self):
+        return f"StrFind({self.pattern!r})"
+
+    def match(self, word: str) -> bool:
+        return word == self.pattern
+
+    def finditer(self, text: str):
+        p, m = self.pattern, self.m
+        i = text.find(p)
+        while i >= 0:
+            yield i, i + m
+            i = text.find(p, i + m)
+
+    def count(self, text: str) -> int:
+        return text.count(self.pattern)
+
+
+# ========= Choix du moteur pour un littéral pur =========
+
+def choose_literal_engine(pattern: str) -> str:
+    """
+      "bmh" : motif d'au moins BMH_MIN_LENGTH caractères
+      "kmp" : sinon (sauts d'au plus 2 caractères)
+    """
+    return "bmh" if len(pattern) >= BMH_MIN_LENGTH else "kmp"
+
+
+def literal_matcher(pattern: str):
+    return BMH(pattern) if choose_literal_engine(pattern) == "bmh" else KMP(pattern)
+
+
+# --------- TESTS ----------
+if __name__ == "__main__":
+    text = "le roi Sargon, fils de Sargon ; Sargonide et Saron"
+    bmh = BMH("Sargon")
+    print(bmh)
+    print("BMH     :", list(bmh.finditer(text)))
+    print("StrFind :", list(StrFind("Sargon").finditer(text)))
+    print("KMP     :", list(KMP("Sargon").finditer(text)))
+    for p in ["Sargon", "the", "on", "Mesopotamia"]:
+        print(f"{p!r:14} → {choose_literal_engine(p)}")
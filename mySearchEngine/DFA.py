@@ -1,5 +1,5 @@
 from typing import Dict, Set, Optional, Iterable, Tuple, List, FrozenSet
-from Parser import DOT
+import numpy as np
 from NFA import NFA, EPS, regex_to_nfa
 
 class DFA:
@@ -7,6 +7,7 @@ class DFA:
         self.start = None
         self.final_states: Set[int] = set()
         self.transitions: Dict[int, Dict[int, int]] = {}
+        self.alphabet = None        # intervalles larges des classes (cf. NFA.alphabet)
 
     def add_transition(self, state: int, symbol: int, next_state: int):
         if state not in self.transitions:
@@ -20,7 +21,9 @@ class DFA:
         out.append("transitions:")
         for s, trans in sorted(self.transitions.items()):
             for sym, dest in sorted(trans.items()):
-                ch = '.' if sym == DOT else chr(sym)
+                ch = chr(sym)
+                if self.alphabet is not None and sym in self.alphabet.wide:
+                    ch += f"-{chr(self.alphabet.wide[sym])}"
                 out.append(f"  {s} -'{ch}'-> {dest}")
         return "\n".join(out)
 
@@ -41,8 +44,6 @@ def move(nfa, states, symbol):
         trans = nfa.transitions.get(s, {})
         if symbol in trans:
             dest.update(trans[symbol])
-        if DOT in trans:
-            dest.update(trans[DOT])
     return dest
 
 def extract_symbols_nfa(nfa):
@@ -53,41 +54,186 @@ def extract_symbols_nfa(nfa):
                 symbols.add(sym)
     return symbols
 
-def nfa_to_dfa(nfa: NFA) -> DFA:
+class DFATooLarge(Exception):
+    """La déterminisation dépasse le nombre d'états autorisé (→ DFA paresseux)."""
+
+    def __init__(self, max_states: int):
+        super().__init__(f"DFA > {max_states} états")
+        self.max_states = max_states
+
+# ---------- NFA en bitsets (pour la déterminisation) ----------
+
+DENSE_MEMBERS = 32      # au-delà, décodage des bitsets par NumPy
+
+def epsilon_closure_bits(eps_succ: List[List[int]]) -> List[int]:
+    """
+    ε-fermeture (bitset) de chaque état 0..n-1, eps_succ[i] = successeurs ε de i.
+    Tarjan itératif : les composantes fortement connexes (boucles des étoiles)
+    sortent dans l'ordre topologique inverse, donc
+      fermeture(C) = bits de C | OU des fermetures des successeurs hors de C
+    et chaque arc ε n'est parcouru qu'une fois.
+    """
+    n = len(eps_succ)
+    order = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack: List[int] = []
+    closure = [0] * n
+    counter = 0
+
+    for root in range(n):
+        if order[root] != -1:
+            continue
+        work = [(root, 0)]
+        while work:
+            v, pi = work[-1]
+            if pi == 0 and order[v] == -1:
+                order[v] = low[v] = counter
+                counter += 1
+                stack.append(v)
+                on_stack[v] = True
+            succ = eps_succ[v]
+            if pi < len(succ):
+                work[-1] = (v, pi + 1)
+                w = succ[pi]
+                if order[w] == -1:
+                    work.append((w, 0))
+                elif on_stack[w]:
+                    low[v] = min(low[v], order[w])
+                continue
+
+            work.pop()
+            if work:
+                u = work[-1][0]
+                low[u] = min(low[u], low[v])
+            if low[v] == order[v]:
+                component = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component.append(w)
+                    if w == v:
+                        break
+                bits = 0
+                for w in component:
+                    bits |= 1 << w
+                for w in component:
+                    for x in eps_succ[w]:
+                        bits |= closure[x]          # 0 si x est dans la composante
+                for w in component:
+                    closure[w] = bits
+    return closure
+
+class BitsetNFA:
+    """
+    NFA renuméroté densément (0..n-1) : un ensemble d'états est un entier
+    Python dont le bit i vaut 1 si l'état i est présent.
+    Précalculés une seule fois :
+      closure[i] : ε-fermeture de l'état i (bitset)
+      out[i]     : symbole → bitset des destinations DÉJÀ ε-fermées
+    Un pas de la construction par sous-ensembles devient une suite de OU bit à bit.
+    """
+
+    def __init__(self, nfa: NFA):
+        states = {nfa.start} | set(nfa.finals) | set(nfa.transitions)
+        for trans in nfa.transitions.values():
+            for dests in trans.values():
+                states.update(dests)
+        self.states = sorted(states)
+        self.index = {s: i for i, s in enumerate(self.states)}
+        index = self.index
+
+        # ε-fermetures, calculées une seule fois pour tous les états
+        if nfa.epsilon_free:
+            self.closure = [1 << i for i in range(len(self.states))]
+        else:
+            eps_succ = [[index[t] for t in nfa.transitions.get(s, {}).get(EPS, ())]
+                        for s in self.states]
+            self.closure = epsilon_closure_bits(eps_succ)
+
+        # tables de transitions par état et par symbole
+        self.alphabet = extract_symbols_nfa(nfa)
+        self.out: List[Dict[int, int]] = []
+        for s in self.states:
+            row = {}
+            for sym, dests in nfa.transitions.get(s, {}).items():
+                if sym is EPS:
+                    continue
+                bits = 0
+                for t in dests:
+                    bits |= self.closure[index[t]]
+                row[sym] = bits
+            self.out.append(row)
+
+        # seuls les états qui ont des transitions sur un symbole comptent pour successors()
+        self.active_mask = 0
+        for i, row in enumerate(self.out):
+            if row:
+                self.active_mask |= 1 << i
+        self.nbytes = (len(self.states) + 7) // 8
+
+        self.start = self.closure[index[nfa.start]]
+        self.final_mask = 0
+        for f in nfa.finals:
+            self.final_mask |= 1 << index[f]
+
+    def members(self, bits: int) -> List[int]:
+        """Indices des bits à 1 (NumPy pour les ensembles denses : pas de boucle sur des entiers géants)."""
+        if bits.bit_count() > DENSE_MEMBERS:
+            raw = np.frombuffer(bits.to_bytes(self.nbytes, "little"), dtype=np.uint8)
+            return np.flatnonzero(np.unpackbits(raw, bitorder="little")).tolist()
+        out = []
+        while bits:
+            low = bits & -bits
+            out.append(low.bit_length() - 1)
+            bits ^= low
+        return out
+
+    def successors(self, bits: int):
+        """
+        Pour un ensemble d'états : symbole → bitset atteint ('.' est déjà
+        développé en ses intervalles, cf. NFA.leaf_symbols).
+        """
+        succ: Dict[int, int] = {}
+        out = self.out
+        for i in self.members(bits & self.active_mask):
+            for sym, dest in out[i].items():
+                succ[sym] = succ.get(sym, 0) | dest
+        return succ
+
+    def is_final(self, bits: int) -> bool:
+        return bool(bits & self.final_mask)
+
+def nfa_to_dfa(nfa: NFA, max_states: Optional[int] = None) -> DFA:
     dfa = DFA()
-    alpha = extract_symbols_nfa(nfa)
+    dfa.alphabet = nfa.alphabet
+    bnfa = BitsetNFA(nfa)
 
-    start_set = frozenset(epsilon_closure(nfa, {nfa.start}))
-    set_id: Dict[frozenset, int] = {start_set: 0}
-    id_set: List[frozenset] = [start_set]
+    start_set = bnfa.start
+    set_id: Dict[int, int] = {start_set: 0}
+    id_set: List[int] = [start_set]
     dfa.start = 0
 
-    if nfa.end in start_set:
+    if bnfa.is_final(start_set):
         dfa.final_states.add(0)
 
     work: List[int] = [0]
 
     while work:
         cur_id = work.pop()
-        cur_set = id_set[cur_id]
-
-        for sym in alpha:
-            if sym == EPS:
-                continue
-            dest_raw = move(nfa, cur_set, sym)
-            if not dest_raw:
-                continue
-            dest_set = frozenset(epsilon_closure(nfa, dest_raw))
-
-            if dest_set not in set_id:
-                new_id = len(id_set)
-                set_id[dest_set] = new_id
+        for sym, dest_set in bnfa.successors(id_set[cur_id]).items():
+            dest_id = set_id.get(dest_set)
+            if dest_id is None:
+                dest_id = len(id_set)
+                if max_states is not None and dest_id >= max_states:
+                    raise DFATooLarge(max_states)
+                set_id[dest_set] = dest_id
                 id_set.append(dest_set)
-                work.append(new_id)
-                if nfa.end in dest_set:
-                    dfa.final_states.add(new_id)
+                work.append(dest_id)
+                if bnfa.is_final(dest_set):
+                    dfa.final_states.add(dest_id)
 
-            dfa.add_transition(cur_id, sym, set_id[dest_set])
+            dfa.add_transition(cur_id, sym, dest_id)
     return dfa
 
 def extract_symbols_dfa(dfa: DFA):
@@ -105,81 +251,122 @@ def dfa_states(dfa: DFA):
     states.update(dfa.final_states)
     return states
 
-def minimize_dfa_hopcroft(dfa: DFA) -> DFA:
-    all_states = dfa_states(dfa)
-    alphabet = extract_symbols_dfa(dfa)
-
-    final_states = dfa.final_states
-    non_final_states = all_states - final_states
-
-    partitions: List[FrozenSet[int]] = []
-
-    if final_states:
-        partitions.append(frozenset(final_states))
-    if non_final_states:
-        partitions.append(frozenset(non_final_states))
-
-    worklist: Set[Tuple[FrozenSet[int], int]] = set()
+# ---------- Minimisation de Hopcroft (raffinement de partition) ----------
+#
+# Le DFA est d'abord complété : chaque état a une transition pour chaque
+# symbole (symbole absent → état puits, comme dans la simulation).
+# Puis raffinement de Hopcroft :
+#   - inverse[sym][q] : états p tels que p -sym-> q (calculé une fois) ;
+#   - block_of[état]  : numéro du bloc courant ;
+#   - pour un séparateur (A, sym), on ne touche qu'aux blocs qui contiennent
+#     un prédécesseur, et on ne remet dans la file que la plus petite moitié.
+# Complexité O(n·k·log n) (n états, k symboles).
 
-    if partitions:
-        smallest_group = min(partitions, key = len )
-        for symbol in alphabet:
-            worklist.add((smallest_group, symbol))
-
-    while worklist:
-        current_group, symbol = worklist.pop()
-
-        predecessors = set()
-        for state, transitions in dfa.transitions.items():
-            if transitions.get(symbol) in current_group:
-                predecessors.add(state)
-
-        new_partitions: List[FrozenSet[int]] = []
-
-        for group in partitions:
-            intersect = frozenset(group & predecessors)
-            difference = frozenset(group - predecessors)
-
-            if intersect and difference:
-                new_partitions.extend([intersect, difference])
-
-                for sym in alphabet:
-                    if (group, sym) in worklist:
-                        worklist.remove((group, sym))
-                        worklist.add((intersect, sym))
-                        worklist.add((difference, sym))
-                    else:
-                        smaller = intersect if len(intersect) <= len(difference) else difference
-                        worklist.add((smaller, sym))
-            else:
-                new_partitions.append(group)
-
-        partitions = new_partitions
+SINK = object()         # état puits ajouté pour compléter le DFA
 
+def minimize_dfa_hopcroft(dfa: DFA) -> DFA:
     minimized_dfa = DFA()
+    minimized_dfa.alphabet = dfa.alphabet
+    if dfa.start is None:
+        return minimized_dfa
+
+    real_states = sorted(dfa_states(dfa))
+    states = real_states + [SINK]
+    alphabet = sorted(extract_symbols_dfa(dfa))
+
+    def delta(state, sym):
+        trans = dfa.transitions.get(state) if state is not SINK else None
+        if not trans:
+            return SINK
+        return trans.get(sym, SINK)
+
+    # transitions inverses
+    inverse = {sym: {} for sym in alphabet}
+    for p in states:
+        for sym in alphabet:
+            inverse[sym].setdefault(delta(p, sym), []).append(p)
+
+    # partition initiale : finaux / non finaux
+    finals = [q for q in real_states if q in dfa.final_states]
+    others = [q for q in states if q is SINK or q not in dfa.final_states]
+    blocks: List[Set] = [set(b) for b in (finals, others) if b]
+    block_of = {}
+    for i, block in enumerate(blocks):
+        for q in block:
+            block_of[q] = i
+
+    work: List[Tuple[int, int]] = []
+    in_work: Set[Tuple[int, int]] = set()
+    if len(blocks) == 2:
+        smallest = 0 if len(blocks[0]) <= len(blocks[1]) else 1
+        for sym in alphabet:
+            work.append((smallest, sym))
+            in_work.add((smallest, sym))
 
-    state_to_group_id: Dict[int, int] = {}
-    for group_id, group in enumerate(partitions):
-        for state in group:
-            state_to_group_id[state] = group_id
-
-    if dfa.start is not None:
-        minimized_dfa.start = state_to_group_id[dfa.start]
-
-    for state in final_states:
-        minimized_dfa.final_states.add(state_to_group_id[state])
-
-    for state, transitions in dfa.transitions.items():
-        for symbol, next_state in transitions.items():
-            minimized_dfa.add_transition(
-                state_to_group_id[state],
-                symbol,
-                state_to_group_id[next_state]
-            )
+    while work:
+        splitter = work.pop()
+        in_work.discard(splitter)
+        block_id, sym = splitter
+
+        # prédécesseurs des états du séparateur, regroupés par bloc
+        inv = inverse[sym]
+        touched: Dict[int, List] = {}
+        for q in list(blocks[block_id]):
+            for p in inv.get(q, ()):
+                touched.setdefault(block_of[p], []).append(p)
+
+        for b, preds in touched.items():
+            block = blocks[b]
+            if len(preds) == len(block):
+                continue                        # tout le bloc mène au séparateur : pas de coupure
+            # le bloc b garde Y \ X, le nouveau bloc reçoit Y ∩ X
+            new_id = len(blocks)
+            new_block = set(preds)
+            block -= new_block
+            blocks.append(new_block)
+            for p in new_block:
+                block_of[p] = new_id
+            for a in alphabet:
+                if (b, a) in in_work:
+                    work.append((new_id, a))
+                    in_work.add((new_id, a))
+                else:
+                    smaller = new_id if len(new_block) <= len(block) else b
+                    work.append((smaller, a))
+                    in_work.add((smaller, a))
+
+    # ----- construction du DFA minimal -----
+    # bloc puits : celui de SINK (états d'où aucun final n'est accessible)
+    dead = block_of[SINK]
+    representative = {}
+    for q in real_states:                      # plus petit état réel de chaque bloc
+        representative.setdefault(block_of[q], q)
+
+    # numérotation des blocs dans l'ordre de parcours en largeur depuis l'état initial
+    ids: Dict[int, int] = {}
+    start_block = block_of[dfa.start]
+    ids[start_block] = 0
+    minimized_dfa.start = 0
+    queue = [start_block]
+    while queue:
+        b = queue.pop(0)
+        if b == dead:
+            continue                           # état mort explicite : aucune transition
+        rep = representative[b]
+        if rep in dfa.final_states:
+            minimized_dfa.final_states.add(ids[b])
+        trans = dfa.transitions.get(rep, {})
+        for sym, target in trans.items():
+            tb = block_of[target]
+            if tb == dead:
+                continue                       # vers le puits : inutile de l'écrire
+            if tb not in ids:
+                ids[tb] = len(ids)
+                queue.append(tb)
+            minimized_dfa.add_transition(ids[b], sym, ids[tb])
 
     return minimized_dfa
 
-
 if __name__ == "__main__":
     # --- Exemple simple ---
     # Alphabet : { 'a', 'b' }
@@ -1,15 +1,14 @@
 from typing import List
 from Parser import STAR, PLUS, ALT, PROT, DOT, LPAR, RPAR
-from colorama import Fore, Style, init
-init(autoreset=True)
+from match_output import MatchRecord, print_match, iter_line_matches, write_matches
 
 
 class KMP:
     def __init__(self, RegEx: str):
         self.factor = list(RegEx)
         self.CarryOver = self.step1()
-        self.step2()
-        self.step3()
+        # pas d'optimisation de la table (anciens step2 / step3, supprimés) : elles la
+        # cassaient sur des motifs répétitifs (ex: "aabaab" ratait des occurrences)
 
     
     def __str__(self):
@@ -29,59 +28,47 @@ class KMP:
                 co[i] = -1
         return co
     
-    def step2(self):
-        """Optimisation for a particular carry over case."""
-        for i in range(len(self.factor)):
-            if self.factor[i] == self.factor[self.CarryOver[i]]:
-                self.CarryOver[self.CarryOver[i]] = -1
+    def occurrences(self, text: str, line_no: int = 0):
+        """MatchRecord de toutes les occurrences de la ligne, chevauchements compris."""
+        m, n = len(self.factor), len(text)
+        j = 0
 
-    def step3(self):
-        """Optimisation for transitions using carry over."""
-        for i in range(len(self.factor)):
-            if (self.factor[i] == self.factor[self.CarryOver[i]] and 
-                self.CarryOver[self.CarryOver[i]] != -1 and
-                self.CarryOver[self.CarryOver[i]] != 0):
-                self.CarryOver[i] = self.CarryOver[self.CarryOver[i]]
+        for i in range(n):
+            while j > 0 and text[i] != self.factor[j]:
+                j = self.CarryOver[j - 1] + 1 if self.CarryOver[j - 1] != -1 else 0
+            if text[i] == self.factor[j]:
+                j += 1
+            if j == m:
+                yield MatchRecord(line_no, text, i - m + 1, i + 1)
+                j = self.CarryOver[j - 1] + 1 if self.CarryOver[j - 1] != -1 else 0
 
     def search_in_line(self, text: str, line_no : int) -> bool:
         """Search for pattern occurrences in text using KMP."""
         found = False
-        m, n = len(self.factor), len(text)
-        j = 0  
+        for record in self.occurrences(text, line_no):
+            found = True
+            print_match(*record)
+        return found
 
-        for i in range(n):
+    def finditer(self, text: str):
+        """Occurrences (début, fin) sans chevauchement, comme egrep (cf. bytescan.py)."""
+        m = len(self.factor)
+        j = 0
+        for i in range(len(text)):
             while j > 0 and text[i] != self.factor[j]:
                 j = self.CarryOver[j - 1] + 1 if self.CarryOver[j - 1] != -1 else 0
             if text[i] == self.factor[j]:
                 j += 1
             if j == m:
-                found = True
-                start = i - m + 1
-                end = i + 1
-                # Affichage coloré comme dans match_dfa_in_file
-                colored_line = (
-                    text[:start]
-                    + Fore.RED + text[start:end] + Style.RESET_ALL
-                    + text[end:]
-                )
-                print(f"Match found: line {line_no}, column {start+1}, text '{text[start:end]}', full line: {colored_line}")
-                j = self.CarryOver[j - 1] + 1 if self.CarryOver[j - 1] != -1 else 0
+                yield i - m + 1, i + 1
+                j = 0
 
-        return found
     def search_in_file(self, filepath: str) -> bool:
-        """Search for pattern occurrences in an entire file."""
-        found_any = False
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            line_no = 0
-            for line in f:
-                line_no += 1
-                line = line.rstrip('\n')
-                if self.search_in_line(line, line_no):
-                    found_any = True
-        return found_any
+        """Search for pattern occurrences in an entire file (matchs affichés par paquets)."""
+        return write_matches(iter_line_matches(self, filepath))
 
 def isitconcatenated(regEx):
-    specials = {'*', '+', '|', '.', '(', ')'}
+    specials = {'*', '+', '|', '.', '(', ')', '?', '[', '{', '\\', '^', '$'}
     for c in regEx:
         if c in specials:
             return False
@@ -1,7 +1,7 @@
 from typing import Dict, Set, Optional
-from Parser import RegExTree, parse, DOT, CONCAT, STAR, ALT, PLUS
+from Parser import RegExTree, parse, fold_tree, DOT, CONCAT, STAR, ALT, PLUS, QUEST, CLASS, BOL, EOL
+from charclass import Alphabet, ANY
 EPS = None     # epsilon
-ANY = DOT      # Any character
 
 class NFA:
     def __init__(self):
@@ -9,19 +9,23 @@ class NFA:
         self.end        = -1
         self.transitions : Dict[int, Dict[Optional[int], Set[int]]] = {}
         self.count_id = 0
+        self.finals : Set[int] = set()     # états acceptants ({end} pour Thompson)
+        self.epsilon_free = False          # True pour Glushkov : pas de ε-fermeture à calculer
+        self.alphabet = None               # intervalles larges des classes (charclass.Alphabet)
 
     def __str__(self):
         lines = []
         lines.append("==========    NFA     ==========")
         lines.append(f"start: {self.start}")
         lines.append(f"end: {self.end}")
+        lines.append(f"finals: {sorted(self.finals)}")
         lines.append("transitions:")
         for state, transitions in self.transitions.items():
             for code, next_states in transitions.items():
                 if code == EPS:
                     label = "ε"
-                elif code == ANY:
-                    label = "."
+                elif self.alphabet is not None and code in self.alphabet.wide:
+                    label = f"{chr(code)}-{chr(self.alphabet.wide[code])}"
                 else:
                     label = chr(code)
                 lines.append(f"  {state} -'{label}'-> {sorted(next_states)}")
@@ -48,15 +52,63 @@ class NFA:
     def add_epsilon(self, start: int, end: int):
         self.add_transition(start, EPS, end)
 
+# -------------- Symboles des feuilles --------------
+#
+# Une feuille donne une ou plusieurs transitions : une lettre un seul symbole,
+# une classe un symbole par intervalle élémentaire qu'elle couvre (cf.
+# charclass.py) ; '.' est la classe ANY, il n'y a pas de symbole joker dans
+# les automates (aucun code ne peut être pris pour '.') ; une ancre aucun (mot vide : les ancres
+# ne sont qu'aux bords des branches et les automates reconnaissent des mots entiers ; la
+# recherche ancrée dans une ligne est faite par matching.AnchoredSearcher autour des
+# automates des branches sans leurs ancres).
+
+def leaf_alphabet(tree: RegExTree):
+    """Intervalles élémentaires des feuilles de l'arbre, None si aucun n'a plus d'un code."""
+    leaves = []
+    has_class = False
+
+    def combine(node, subs):
+        nonlocal has_class
+        if node.root == CLASS:
+            has_class = True
+            leaves.append(node.ranges)
+        elif node.root == DOT:
+            has_class = True
+            leaves.append(ANY)
+        elif not node.subs and node.root <= 0x10FFFF:
+            leaves.append(((node.root, node.root),))
+    fold_tree(tree, combine)
+    if not has_class:
+        return None
+    alphabet = Alphabet(leaves)
+    return alphabet if alphabet.wide else None
+
+
+def leaf_symbols(node: RegExTree, alphabet) -> list:
+    if node.root in (BOL, EOL):
+        return []
+    if node.root == DOT:
+        return alphabet.symbols(ANY)          # ANY est large : alphabet n'est jamais None ici
+    if node.root != CLASS:
+        return [node.root]
+    if alphabet is None:                      # aucun intervalle large : un symbole par caractère
+        return [code for lo, hi in node.ranges for code in range(lo, hi + 1)]
+    return alphabet.symbols(node.ranges)
+
 def build_from_regex_tree(tree: RegExTree) -> NFA:
     nfa = NFA()
+    nfa.alphabet = leaf_alphabet(tree)
 
     def build_from_node(node: RegExTree):
-        # Cas 1 : une lettre simple
+        # Cas 1 : une lettre simple, un joker, une classe (une transition par intervalle) ou une ancre (ε)
         if not node.subs:
             s = nfa.next_id()
             t = nfa.next_id()
-            nfa.add_transition(s, node.root, t)
+            symbols = leaf_symbols(node, nfa.alphabet)
+            if not symbols:
+                nfa.add_epsilon(s, t)
+            for sym in symbols:
+                nfa.add_transition(s, sym, t)
             return s, t
 
         # Cas 2 : une concaténation
@@ -85,6 +137,15 @@ def build_from_regex_tree(tree: RegExTree) -> NFA:
             nfa.add_epsilon(t1, end)
             return start, end
 
+        # Cas 3 bis : R? = R | ε
+        if node.root == QUEST:
+            s1, t1 = build_from_node(node.subs[0])
+            start, end = nfa.next_id(), nfa.next_id()
+            nfa.add_epsilon(start, s1)
+            nfa.add_epsilon(start, end)
+            nfa.add_epsilon(t1, end)
+            return start, end
+
         # Cas 4 : une alternative
         if node.root == ALT:
             s1, t1 = build_from_node(node.subs[0])
@@ -98,16 +159,109 @@ def build_from_regex_tree(tree: RegExTree) -> NFA:
 
     s, t = build_from_node(tree)
     nfa.start, nfa.end = s, t
+    nfa.finals = {t}
+    return nfa
+
+# -------------- Automate de Glushkov (automate des positions) --------------
+#
+# Un état par occurrence de symbole (position 1..m) + l'état initial 0,
+# aucune transition ε. Pour chaque noeud on calcule :
+#   nullable : le noeud accepte le mot vide
+#   first    : positions qui peuvent commencer un mot
+#   last     : positions qui peuvent finir un mot
+# et globalement follow[p] : positions qui peuvent suivre p.
+# Transitions : 0 -sym(q)-> q pour q dans first(racine), p -sym(q)-> q pour q dans follow[p].
+# Finaux : last(racine), plus 0 si la racine est nullable.
+# Une classe est une seule position, dont les transitions entrantes portent
+# chacun de ses symboles (un par intervalle élémentaire) ; une ancre n'est pas
+# une position (mot vide).
+
+def build_glushkov(tree: RegExTree) -> NFA:
+    nfa = NFA()
+    nfa.start = nfa.next_id()            # état 0
+    nfa.epsilon_free = True
+    nfa.alphabet = leaf_alphabet(tree)
+    symbol: Dict[int, list] = {}         # position → symboles (codes)
+    follow: Dict[int, Set[int]] = {}
+
+    # parcours postfixe itératif (les arbres ALT peuvent être très profonds)
+    info = {}                            # id(noeud) → (nullable, first, last)
+    stack = [(tree, False)]
+    while stack:
+        node, done = stack.pop()
+        if not done and node.subs:
+            stack.append((node, True))
+            for sub in reversed(node.subs):
+                stack.append((sub, False))
+            continue
+
+        if not node.subs:
+            symbols = leaf_symbols(node, nfa.alphabet)
+            if not symbols:
+                info[id(node)] = (True, set(), set())
+                continue
+            p = nfa.next_id()
+            symbol[p] = symbols
+            follow[p] = set()
+            info[id(node)] = (False, {p}, {p})
+            continue
+
+        if node.root == CONCAT:
+            n1, f1, l1 = info.pop(id(node.subs[0]))
+            n2, f2, l2 = info.pop(id(node.subs[1]))
+            for p in l1:
+                follow[p] |= f2
+            first = f1 | f2 if n1 else f1
+            last = l1 | l2 if n2 else l2
+            info[id(node)] = (n1 and n2, first, last)
+        elif node.root == ALT:
+            n1, f1, l1 = info.pop(id(node.subs[0]))
+            n2, f2, l2 = info.pop(id(node.subs[1]))
+            f1 |= f2                     # les ensembles des fils ne servent plus : union en place
+            l1 |= l2
+            info[id(node)] = (n1 or n2, f1, l1)
+        elif node.root in (STAR, PLUS):
+            n1, f1, l1 = info.pop(id(node.subs[0]))
+            for p in l1:
+                follow[p] |= f1
+            info[id(node)] = (True if node.root == STAR else n1, f1, l1)
+        elif node.root == QUEST:
+            n1, f1, l1 = info.pop(id(node.subs[0]))
+            info[id(node)] = (True, f1, l1)
+
+    nullable, first, last = info[id(tree)]
+    for q in first:
+        for sym in symbol[q]:
+            nfa.add_transition(nfa.start, sym, q)
+    for p, nexts in follow.items():
+        for q in nexts:
+            for sym in symbol[q]:
+                nfa.add_transition(p, sym, q)
+
+    nfa.finals = set(last)
+    if nullable:
+        nfa.finals.add(nfa.start)
     return nfa
 
-def tree_to_nfa(tree: RegExTree) -> NFA:
-    return build_from_regex_tree(tree)
+def tree_to_nfa(tree: RegExTree, method: str = "thompson") -> NFA:
+    if method == "glushkov":
+        return build_glushkov(tree)
+    if method == "thompson":
+        return build_from_regex_tree(tree)
+    raise ValueError(f"méthode de construction inconnue : {method!r} (thompson | glushkov)")
 
-def regex_to_nfa(regex: str) -> NFA:
+def regex_to_nfa(regex: str, method: str = "thompson") -> NFA:
+    """
+    method="thompson" : NFA de Thompson (transitions ε, un seul état final end)
+    method="glushkov" : automate des positions (sans ε, m + 1 états, plusieurs finaux)
+    """
     tree = parse(regex)
-    return build_from_regex_tree(tree)
+    return tree_to_nfa(tree, method)
 
 # --------- TESTS ----------
 if __name__ == "__main__":
     nfa = regex_to_nfa("(a|b)*c")
     print(nfa)
+    print(regex_to_nfa("(a|b)*c", method="glushkov"))
+    # classe : une transition par intervalle élémentaire ([a-f] g h i [j-m] n [o-z]), pas par lettre
+    print(regex_to_nfa("[a-z]+ing", method="glushkov"))
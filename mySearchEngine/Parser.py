@@ -1,23 +1,33 @@
 from typing import List
+from charclass import normalize, complement, MAX_CODE, SHORTHANDS, POSIX_CLASSES, ESCAPES
+# valeurs toutes > 0x10FFFF : aucun caractère (ni borne d'intervalle) ne peut être pris pour un opérateur
 CONCAT = 0xC04CA7
 STAR   = 0xE7011E
-PLUS   = 0xADD17
+PLUS   = 0xADD170
 ALT    = 0xA17E54
 PROT   = 0xBADDAD
-DOT    = 0xD07
 LPAR   = 0x16641664
 RPAR   = 0x51515151
+QUEST  = 0x9E5710
+# feuilles spéciales
+DOT    = 0xD07D07       # '.' : n'importe quel caractère (intervalle ANY dans les automates)
+CLASS  = 0xC1A55E       # classe de caractères, intervalles dans node.ranges
+BOL    = 0xB0111E       # '^' : début de ligne
+EOL    = 0xE0111E       # '$' : fin de ligne
 
 class RegExTree:
     root: int
     subs: List["RegExTree"]
 
-    def __init__(self, root: int, subs: List["RegExTree"] = None):
+    def __init__(self, root: int, subs: List["RegExTree"] = None, ranges: tuple = None):
         self.root = root
         self.subs = subs if subs is not None else []
+        self.ranges = ranges            # CLASS seulement : ((lo, hi), ...) triés, disjoints
 
     def __str__(self):
         # pour debug : affiche l'arbre en style textuel
+        if self.root == CLASS:
+            return class_to_string(self.ranges)
         if not self.subs:
             return root_to_string(self.root)
         return f"{root_to_string(self.root)}(" + ",".join(str(s) for s in self.subs) + ")"
@@ -28,134 +38,410 @@ def root_to_string(root: int) -> str:
     if root == STAR:   return "*"
     if root == PLUS:   return "+"
     if root == ALT:    return "|"
+    if root == QUEST:  return "?"
     if root == DOT:    return "."
+    if root == BOL:    return "^"
+    if root == EOL:    return "$"
     if root == PROT:   return "PROT"
     return chr(root)
 
-def char_to_root(c: str) -> int:
-    if c == ".": return DOT
-    if c == "*": return STAR
-    if c == "+": return PLUS
-    if c == "|": return ALT
-    if c == "(": return LPAR
-    if c == ")": return RPAR
-    return ord(c)
 
-def parse(regex: str) -> RegExTree:
-    token_list = [RegExTree(char_to_root(c), []) for c in regex]
-    return parse_tokens(token_list)
-
-def parse_tokens(token_list: List[RegExTree]) -> RegExTree:
-    while contain_par(token_list):
-        token_list = process_par(token_list)
-
-    while contain_star(token_list):
-        token_list = process_star(token_list)
-
-    while contain_plus(token_list):
-        token_list = process_plus(token_list)
-
-    while contain_cont(token_list):
-        token_list = process_cont(token_list)
-
-    while contain_alt(token_list):
-        token_list = process_alt(token_list)
-
-    if len(token_list) != 1:
-        return RegExTree(PROT, token_list)
-    return remove_prot(token_list[0])
-
-def remove_prot(token : RegExTree) -> RegExTree:
-    if not token.subs: return token
-    if token.root == PROT: return remove_prot(token.subs[0])
-    return RegExTree(token.root,[remove_prot(x) for x in token.subs])
-
-# -------------- Traitement des parenthèses --------------
-def contain_par(token_list: List[RegExTree]) -> bool:
-    return any(token.root == LPAR or token.root == RPAR for token in token_list)
-
-def process_par(token_list: List[RegExTree]) -> List[RegExTree]:
-    right_par = next(i for i, token in enumerate(token_list) if token.root == RPAR)
-    left_par = max(j for j in range(right_par) if token_list[j].root == LPAR)
-    sub = parse_tokens(token_list[left_par + 1: right_par])
-    return token_list[:left_par] + [RegExTree(PROT, [sub])] + token_list[right_par + 1:]
-
-# -------------- Traitement des concatenations --------------
-def contain_cont(token_list: List[RegExTree]) -> bool:
-    for i in range(len(token_list) - 1):
-        if token_list[i].root != ALT and token_list[i+1].root != ALT:
-            return True
-    return False
-
-
-def process_cont(token_list: List[RegExTree]) -> List[RegExTree]:
-    out = []
-    changed = False
-    i = 0
-    while i < len(token_list):
-        if i+1 < len(token_list) and token_list[i].root != ALT and token_list[i+1].root != ALT:
-            out.append(RegExTree(CONCAT, [token_list[i], token_list[i+1]]))
-            changed = True
-            i += 2
-        else:
-            out.append(token_list[i])
-            i += 1
-    return out if changed else token_list
-
-# -------------- Traitement des concatenations --------------
-def contain_star(token_list : List[RegExTree]) -> bool:
-    return any(token.root == STAR and not token.subs for token in token_list)
-
-def process_star(token_list : List[RegExTree]) -> List[RegExTree]:
-    out = []
-    found = False
-    for token in token_list:
-        if not found and token.root == STAR and not token.subs:
-            if not out: raise SyntaxError("Star without a previous token")
-            found = True
-            out[-1] = RegExTree(STAR, [out[-1]])
-        else:
-            out.append(token)
-    return out
-
-# -------------- Traitement des opérations PLUS -------------- ( à faire)
-def contain_plus(token_list : List[RegExTree]) -> bool:
-    return any(token.root == PLUS and not token.subs for token in token_list)
-
-def process_plus(token_list : List[RegExTree]) -> List[RegExTree]:
-    out = []
-    found = False
-    for token in token_list:
-        if not found and token.root == PLUS and not token.subs:
-            if not out: raise SyntaxError("PLUS without a previous token")
-            found = True
-            out[-1] = RegExTree(PLUS, [out[-1]])
+# caractères à échapper pour être relus comme littéraux, hors classe et dans une classe
+METACHARS = "()|*+?{[\\.^$"
+CLASS_METACHARS = "]\\^-["
+
+
+def escape_char(c: str, special: str = METACHARS) -> str:
+    return "\\" + c if c in special else c
+
+
+def class_to_string(ranges) -> str:
+    """Intervalles → "[...]" relisible par parse() (forme niée si plus courte)."""
+    negate = len(ranges) > 1 and ranges[0][0] == 0 and ranges[-1][1] == MAX_CODE
+    if negate:
+        ranges = complement(ranges)
+    items = []
+    for lo, hi in ranges:
+        items.append(escape_char(chr(lo), CLASS_METACHARS))
+        if hi > lo + 1:
+            items.append("-")
+        if hi > lo:
+            items.append(escape_char(chr(hi), CLASS_METACHARS))
+    return ("[^" if negate else "[") + "".join(items) + "]"
+
+class RegexSyntaxError(SyntaxError):
+    """Erreur de syntaxe dans une RegEx, avec la position (0-based) du caractère fautif."""
+
+    def __init__(self, message: str, pattern: str, position: int):
+        super().__init__(f"{message} at position {position}")
+        self.pattern = pattern
+        self.position = position
+        self.text = pattern
+        self.offset = position + 1
+
+
+# ========= Parseur (descente récursive, une seule passe) =========
+#
+#   alt    := concat ('|' concat)*        → ALT associatif à gauche
+#   concat := repeat*                     → CONCAT par paires (arbre équilibré), vide = mot vide
+#   repeat := atom ('*' | '+' | '?' | '{m}' | '{m,}' | '{,n}' | '{m,n}')*
+#   atom   := '(' alt ')' | '[' classe ']' | '.' | '\' caractère | '^' | '$' | caractère
+#   classe := '^'? (caractère | a-z | \d \w \s... | [:alpha:]...)+
+#
+# Chaque caractère n'est lu qu'une fois : temps linéaire en la longueur du motif.
+# Sans la syntaxe étendue, l'arbre a la même forme que celui de l'ancien parseur
+# (parse_legacy, conservé dans tests/bench_parser.py).
+# Une classe est une feuille CLASS (intervalles de codes, niée = complémentée) ;
+# R{m,n} est développé en m copies de R puis n - m copies de R? (R+ / R* si pas de borne).
+# '^' et '$' sont des feuilles BOL / EOL (largeur nulle), seulement en tête et en fin
+# d'une branche de premier niveau : "^a|b$" = (^a)|(b$), pas ^(a|b)$.
+
+SPECIAL = "()|*+?{[\\.^$"
+MAX_REPEAT = 255            # borne des répétitions {m,n} (RE_DUP_MAX de POSIX)
+
+
+def concat_pairs(factors: List[RegExTree]) -> RegExTree:
+    """Concatène par paires successives : [a,b,c,d,e] → ((ab)(cd))e (profondeur log n)."""
+    while len(factors) > 1:
+        paired = [RegExTree(CONCAT, [factors[i], factors[i + 1]])
+                  for i in range(0, len(factors) - 1, 2)]
+        if len(factors) % 2:
+            paired.append(factors[-1])
+        factors = paired
+    return factors[0]
+
+
+def alt_tree(branches: List[RegExTree]) -> RegExTree:
+    """Alternative des branches, associative à gauche : [a,b,c] → (a|b)|c."""
+    tree = branches[0]
+    for branch in branches[1:]:
+        tree = RegExTree(ALT, [tree, branch])
+    return tree
+
+
+def class_leaf(ranges) -> RegExTree:
+    """Feuille d'une classe ; une classe d'un seul caractère est ce caractère."""
+    if len(ranges) == 1 and ranges[0][0] == ranges[0][1]:
+        return RegExTree(ranges[0][0])
+    return RegExTree(CLASS, ranges=ranges)
+
+
+def repeat_tree(tree: RegExTree, m: int, n: int = None) -> RegExTree:
+    """R{m,n} → R…R R?…R? ; sans borne (n = None) → R…R R+ (ou R* si m = 0)."""
+    copies = [tree] + [copy_tree(tree) for _ in range(max(m, 1 if n is None else n) - 1)]
+    if n is None:
+        last = RegExTree(STAR if m == 0 else PLUS, [copies.pop()])
+        return concat_pairs(copies[:max(m - 1, 0)] + [last])
+    return concat_pairs(copies[:m] + [RegExTree(QUEST, [sub]) for sub in copies[m:n]])
+
+
+def is_digits(text: str) -> bool:
+    return text != "" and all("0" <= c <= "9" for c in text)
+
+
+class _RegexParser:
+    def __init__(self, regex: str):
+        self.regex = regex
+        self.pos = 0
+        self.n = len(regex)
+        self.depth = 0              # nombre de groupes ouverts
+        self.branch_start = True    # rien d'autre que '^' lu depuis le début de la branche
+
+    def error(self, message: str, position: int = None):
+        raise RegexSyntaxError(message, self.regex, self.pos if position is None else position)
+
+    def peek(self):
+        return self.regex[self.pos] if self.pos < self.n else None
+
+    def parse(self) -> RegExTree:
+        if self.n == 0:
+            self.error("Empty regex")
+        tree = self.parse_alt()
+        if self.pos < self.n:           # seul cas possible : ')' en trop
+            self.error("Unmatched ')'")
+        return tree
+
+    def parse_alt(self) -> RegExTree:
+        open_pos = self.pos - 1
+        branches = [self.parse_concat()]
+        while self.peek() == "|":
+            self.pos += 1
+            branches.append(self.parse_concat())
+        factors = [b for b in branches if b is not None]
+        if len(factors) == len(branches):
+            return alt_tree(factors)
+        # branche vide (ex: "a|", "(|b)") : mot vide. Dans un groupe, R|ε = R? ;
+        # au premier niveau, la branche vide est '^' (zéro caractère, vraie sur
+        # toute ligne) pour garder les autres branches et leurs ancres telles quelles.
+        if self.depth:
+            if not factors:
+                self.error("Empty parentheses", open_pos)
+            return RegExTree(QUEST, [alt_tree(factors)])
+        return alt_tree([b if b is not None else RegExTree(BOL) for b in branches])
+
+    def parse_concat(self):
+        """Facteurs d'une branche concaténés, None si la branche est vide."""
+        factors = []
+        while self.pos < self.n and self.regex[self.pos] not in "|)":
+            self.branch_start = all(f.root == BOL for f in factors)
+            factor = self.parse_repeat()
+            if factor.root in (BOL, EOL) and factors and factors[-1].root == factor.root:
+                continue                # "^^a" = "^a"
+            factors.append(factor)
+        return concat_pairs(factors) if factors else None
+
+    def parse_repeat(self) -> RegExTree:
+        atom = self.parse_atom()
+        if atom.root == BOL and self.peek() is not None and self.peek() in "*+?{":
+            self.error("Repetition of the anchor '^'")
+        while True:
+            c = self.peek()
+            if c == "*":
+                atom = RegExTree(STAR, [atom])
+            elif c == "+":
+                atom = RegExTree(PLUS, [atom])
+            elif c == "?":
+                atom = RegExTree(QUEST, [atom])
+            elif c == "{":
+                atom = self.parse_bounds(atom)
+                continue
+            else:
+                return atom
+            self.pos += 1
+
+    def parse_bounds(self, atom: RegExTree) -> RegExTree:
+        open_pos = self.pos
+        close = self.regex.find("}", self.pos, self.n)
+        if close < 0:
+            self.error("Unmatched '{'")
+        spec = self.regex[self.pos + 1:close]
+        low, comma, high = spec.partition(",")
+        if comma:
+            valid = (low or high) and all(s == "" or is_digits(s) for s in (low, high))
         else:
-            out.append(token)
-    return out
-
-
-# -------------- Traitement des alternatives --------------
-def contain_alt(token_list : List[RegExTree]) -> bool:
-    return any(token.root == ALT and not token.subs for token in token_list)
-
-def process_alt(token_list: List[RegExTree]) -> List[RegExTree]:
-    out = []
-    found = False
-    left = None
-    for token in token_list:
-        if not found and token.root == ALT and not token.subs:
-            if not out:
-                raise SyntaxError("Alt without a previous token")
-            found = True
-            left = out.pop()
-        elif found:
-            out.append(RegExTree(ALT, [left, token]))
-            found = False
-            left = None
+            valid = is_digits(low)
+        if not valid:
+            self.error(f"Invalid repetition '{{{spec}}}'")
+        m = int(low) if low else 0
+        n = (int(high) if high else None) if comma else m
+        if max(m, n or 0) > MAX_REPEAT:
+            self.error(f"Repetition count above {MAX_REPEAT}")
+        if n is not None and n < m:
+            self.error(f"Invalid repetition '{{{spec}}}' (min > max)")
+        if n == 0:
+            self.error(f"Repetition '{{{spec}}}' only matches the empty string")
+        self.pos = close + 1
+        return repeat_tree(atom, m, n)
+
+    def parse_atom(self) -> RegExTree:
+        c = self.regex[self.pos]
+        if c == "(":
+            open_pos = self.pos
+            self.pos += 1
+            self.depth += 1
+            sub = self.parse_alt()
+            if self.peek() != ")":
+                self.error("Unmatched '('", open_pos)
+            self.depth -= 1
+            self.pos += 1
+            return sub
+        if c == "[":
+            return class_leaf(self.parse_class())
+        if c == "\\":
+            item = self.parse_escape()
+            return class_leaf(item) if isinstance(item, tuple) else RegExTree(item)
+        if c == "*":
+            self.error("Star without a previous token")
+        if c == "+":
+            self.error("PLUS without a previous token")
+        if c == "?":
+            self.error("Quest without a previous token")
+        if c == "{":
+            self.error("Repetition without a previous token")
+        if c == "^" or c == "$":
+            return self.parse_anchor(c)
+        self.pos += 1
+        return RegExTree(DOT if c == "." else ord(c))
+
+    def parse_anchor(self, c: str) -> RegExTree:
+        """'^' en tête d'une branche de premier niveau, '$' en fin (cf. anchor_branches)."""
+        after = self.regex[self.pos + 1] if self.pos + 1 < self.n else None
+        if c == "^" and (self.depth or not self.branch_start):
+            self.error("Anchor '^' is only supported at the start of a top-level branch")
+        if c == "$" and (self.depth or after not in (None, "|", "$")):
+            self.error("Anchor '$' is only supported at the end of a top-level branch")
+        self.pos += 1
+        return RegExTree(BOL if c == "^" else EOL)
+
+    def parse_escape(self):
+        """'\\' + caractère : code du caractère, ou intervalles pour \\d \\w \\s \\D \\W \\S."""
+        if self.pos + 1 >= self.n:
+            self.error("Trailing backslash")
+        c = self.regex[self.pos + 1]
+        if c in SHORTHANDS:
+            self.pos += 2
+            return SHORTHANDS[c]
+        if c.isascii() and c.isalnum() and c not in ESCAPES:
+            self.error(f"Unknown escape '\\{c}'")
+        self.pos += 2
+        return ord(ESCAPES.get(c, c))
+
+    def parse_class(self) -> tuple:
+        """'[' ... ']' → intervalles normalisés ; ']' en premier est littéral."""
+        open_pos = self.pos
+        self.pos += 1
+        negate = self.peek() == "^"
+        if negate:
+            self.pos += 1
+        items = []
+        first = True
+        while True:
+            c = self.peek()
+            if c is None:
+                self.error("Unmatched '['", open_pos)
+            if c == "]" and not first:
+                self.pos += 1
+                break
+            first = False
+            if self.regex.startswith("[:", self.pos):
+                close = self.regex.find(":]", self.pos + 2, self.n)
+                if close >= 0:
+                    name = self.regex[self.pos + 2:close]
+                    if name not in POSIX_CLASSES:
+                        self.error(f"Unknown class '[:{name}:]'")
+                    items.extend(POSIX_CLASSES[name])
+                    self.pos = close + 2
+                    continue
+            start = self.pos
+            lo = self.class_item()
+            if self.peek() == "-" and self.pos + 1 < self.n and self.regex[self.pos + 1] != "]":
+                self.pos += 1
+                hi = self.class_item()
+                if isinstance(lo, tuple) or isinstance(hi, tuple) or hi < lo:
+                    self.error(f"Invalid class range '{self.regex[start:self.pos]}'", start)
+                items.append((lo, hi))
+            elif isinstance(lo, tuple):
+                items.extend(lo)
+            else:
+                items.append((lo, lo))
+        ranges = normalize(items)
+        if negate:
+            ranges = complement(ranges)
+        if not ranges:
+            self.error("Empty class", open_pos)
+        return ranges
+
+    def class_item(self):
+        if self.regex[self.pos] == "\\":
+            return self.parse_escape()
+        self.pos += 1
+        return ord(self.regex[self.pos - 1])
+
+
+def parse(regex: str) -> RegExTree:
+    """RegEx → arbre syntaxique. Lève RegexSyntaxError (sous-classe de SyntaxError)."""
+    return _RegexParser(regex).parse()
+
+
+# ========= Transformations d'arbres =========
+# Parcours postfixes itératifs : les arbres ALT des longues alternances sont très profonds.
+
+def fold_tree(tree: RegExTree, combine):
+    """combine(noeud, résultats des fils) appliqué des feuilles vers la racine."""
+    done = {}
+    stack = [(tree, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if node.subs and not expanded:
+            stack.append((node, True))
+            for sub in reversed(node.subs):
+                stack.append((sub, False))
+            continue
+        done[id(node)] = combine(node, [done.pop(id(sub)) for sub in node.subs])
+    return done[id(tree)]
+
+
+def copy_tree(tree: RegExTree) -> RegExTree:
+    """Copie profonde (fold_tree repère les noeuds par id : un sous-arbre ne doit pas être partagé)."""
+    return fold_tree(tree, lambda node, subs: RegExTree(node.root, subs, node.ranges))
+
+
+def concat_factors(tree: RegExTree) -> List[RegExTree]:
+    """Facteurs d'une concaténation, de gauche à droite (quelle que soit la forme de l'arbre)."""
+    factors = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if node.root == CONCAT:
+            stack.extend(reversed(node.subs))
         else:
-            out.append(token)
-    return out
+            factors.append(node)
+    return factors
+
+
+def anchor_branches(tree: RegExTree):
+    """
+    Branches de premier niveau (a_gauche|...) → [(ancrée au début, coeur, ancrée à la fin)] ;
+    coeur = arbre sans ancres, None pour une branche réduite à ses ancres ("^", "$", "^$").
+    """
+    branches = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if node.root == ALT:
+            stack.extend(reversed(node.subs))
+            continue
+        factors = concat_factors(node)
+        at_start = factors[0].root == BOL
+        at_end = factors[-1].root == EOL
+        core = factors[int(at_start):len(factors) - int(at_end)]
+        branches.append((at_start, concat_pairs(core) if core else None, at_end))
+    return branches
+
+
+def has_anchors(tree: RegExTree) -> bool:
+    return any(at_start or at_end for at_start, _, at_end in anchor_branches(tree))
+
+
+def reverse_tree(tree: RegExTree) -> RegExTree:
+    """Arbre du langage miroir : les concaténations sont inversées, '^' et '$' échangés."""
+    swap = {BOL: EOL, EOL: BOL}
+
+    def combine(node, subs):
+        if node.root == CONCAT:
+            subs = subs[::-1]
+        return RegExTree(swap.get(node.root, node.root), subs, node.ranges)
+    return fold_tree(tree, combine)
+
+
+def to_regex(tree: RegExTree) -> str:
+    """
+    Arbre → RegEx textuelle équivalente, relisible par parse().
+    Parenthèses seulement là où la priorité l'exige : une alternance de n mots
+    reste "(a|b|...)" et non n groupes imbriqués, que le parseur (récursif)
+    ne pourrait pas relire au-delà de la limite de récursion.
+    """
+    ALT_P, CONCAT_P, REPEAT_P, ATOM_P = 0, 1, 2, 3      # priorité du résultat
+
+    def group(sub, prec):
+        text, p = sub
+        return text if p >= prec else f"({text})"
+
+    def combine(node, subs):
+        if not node.subs:
+            if node.root == CLASS:
+                return class_to_string(node.ranges), ATOM_P
+            if node.root in (DOT, BOL, EOL):
+                return root_to_string(node.root), ATOM_P
+            return escape_char(chr(node.root)), ATOM_P
+        if node.root == CONCAT:
+            return group(subs[0], CONCAT_P) + group(subs[1], CONCAT_P), CONCAT_P
+        if node.root == ALT:
+            return f"{subs[0][0]}|{subs[1][0]}", ALT_P
+        return group(subs[0], ATOM_P) + root_to_string(node.root), REPEAT_P     # "(a*)*", pas "a**"
+
+    return fold_tree(tree, combine)[0]
+
 
 # --------- TESTS ----------
 if __name__ == "__main__":
@@ -187,13 +473,48 @@ if __name__ == "__main__":
 
         # (5) Plus
         "ba+",
-        "(ba)+"
+        "(ba)+",
+
+        # (6) Syntaxe étendue : classes, ?, {m,n}, ancres, échappements
+        "[a-z]+ing",
+        "[^0-9]x",
+        "colou?r",
+        "a{2,3}",
+        "(ab){2,}",
+        "^The",
+        "end$",
+        "^a|b$",
+        "^",
+        "$",
+        "a|",
+        "(a|)b",
+        "^^a$$",
+        "a\\.b\\d",
+        "[[:upper:]][]a-]",
+    ]
+
+    tests += [
+        # (7) Erreurs de syntaxe (position du caractère fautif)
+        "(ab",
+        "ab)",
+        "*a",
+        "a()b",
+        "[a-",
+        "[z-a]",
+        "a{3,2}",
+        "a^b",
+        "(^a)",
+        "a$b",
+        "^*a",
+        "ab\\",
     ]
 
     for r in tests:
         print("REGEX:", r)
         try:
-            print("TREE :", parse(r))
-        except Exception as e:
+            tree = parse(r)
+            print("TREE :", tree)
+            print("TEXT :", to_regex(tree))
+        except SyntaxError as e:
             print("ERROR:", e)
         print("-" * 40)
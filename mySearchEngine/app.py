@@ -4,11 +4,20 @@ import requests
 
 from fastapi.middleware.cors import CORSMiddleware
 from DFA import DFA
+from compiled_dfa import CompiledDFA
 import math
 
 import json
 import os
-from search_in_index import search_in_index
+from search_in_index import search_in_index, normalize
+from search_regex_in_index import match_vocabulary
+from automaton_cache import PlanCache
+from ranking import top_k_conjunctive, top_k_disjunctive
+from build_static_scores import file_fingerprint
+from similar_books import load_tfidf, DEFAULT_QUERY_TERMS
+from ngram_index import load_or_build_trigram_index
+from spelling import correct_query
+from profiling import StageTimer, profile_dump_path, run_with_cprofile
 
 
 
@@ -26,6 +35,16 @@ VOCAB_PATH = os.path.join(LIB_DIR, "vocab.json")
 META_PATH  = os.path.join(LIB_DIR, "metadata.json")
 GRAPH_PATH = os.path.join(LIB_DIR, "graph.json")
 CENTRALITY_PATH = os.path.join(LIB_DIR, "centrality.json")
+STATIC_PATH = os.path.join(LIB_DIR, "static.json")
+TFIDF_PATH = os.path.join(LIB_DIR, "tfidf.npz")
+TRIGRAMS_PATH = os.path.join(LIB_DIR, "trigrams.json")
+
+# ----- Profiling -----
+
+# profile=full écrit un dump cProfile sur disque : désactivé par défaut,
+# à activer explicitement (DAAR_PROFILE_FULL=1) sur une machine de debug.
+PROFILE_FULL_ENABLED = os.environ.get("DAAR_PROFILE_FULL", "0") == "1"
+PROFILE_DIR = os.environ.get("DAAR_PROFILE_DIR", os.path.join(BASE_DIR, "profiles"))
 
 # ----- Load JSON Files -----
 
@@ -39,6 +58,30 @@ metadata = load_json(META_PATH)
 graph = load_json(GRAPH_PATH)
 centrality = load_json(CENTRALITY_PATH)
 
+# Scores statiques (optionnel, généré par build_static_scores.py)
+static_data = load_json(STATIC_PATH) if os.path.exists(STATIC_PATH) else None
+# postings triés par score statique (arrêt anticipé du top-k) seulement si index.json
+# n'a pas été réécrit depuis (build_index*.py le réécrit dans l'ordre d'insertion)
+static_presorted = (
+    static_data is not None
+    and static_data.get("postings_order") == "static_desc"
+    and static_data.get("index_fingerprint") == file_fingerprint(INDEX_PATH)
+)
+
+# Vecteurs TF-IDF (optionnel, générés par build_tfidf.py)
+tfidf = load_tfidf(TFIDF_PATH) if os.path.exists(TFIDF_PATH) else None
+
+# Index de trigrammes du vocabulaire (généré par build_index2.py, sinon reconstruit ici)
+ngram = load_or_build_trigram_index(index, TRIGRAMS_PATH)
+
+# Cache des automates compilés + mots matchés (cf. /diagnostics)
+PLAN_CACHE_SIZE = int(os.environ.get("DAAR_PLAN_CACHE_SIZE", "256"))
+RESULT_CACHE_SIZE = int(os.environ.get("DAAR_RESULT_CACHE_SIZE", "128"))
+# Au-delà de DFA_MAX_STATES états, la RegEx passe en DFA paresseux (cache de LAZY_DFA_STATES états)
+DFA_MAX_STATES = int(os.environ.get("DAAR_DFA_MAX_STATES", "2000"))
+LAZY_DFA_STATES = int(os.environ.get("DAAR_LAZY_DFA_STATES", "2000"))
+plan_cache = PlanCache(PLAN_CACHE_SIZE, RESULT_CACHE_SIZE, DFA_MAX_STATES, LAZY_DFA_STATES)
+
 # ----- FastAPI app -----
 
 app = FastAPI(title="DAAR Search Engine API")
@@ -54,19 +97,8 @@ app.add_middleware(
 # ----- Search helpers -----
 
 def dfa_match(dfa, text: str) -> bool:
-    state = dfa.start
-    for ch in text:
-        code = ord(ch)
-
-        if state not in dfa.transitions:
-            return False
-
-        if code not in dfa.transitions[state]:
-            return False
-
-        state = dfa.transitions[state][code]
-
-    return state in dfa.final_states
+    # DFA compilé : table dense NumPy + classes de caractères (joker sans sentinelle)
+    return CompiledDFA.of(dfa).match(text)
 
 
 def tokenize_query(q):
@@ -87,30 +119,58 @@ def search_normal(query):
     return ranked
 
 
-def search_regex_engine(pattern):
-    from NFA import regex_to_nfa
-    from DFA import nfa_to_dfa, minimize_dfa_hopcroft
+def regex_matching_words(pattern, timer=None):
+    if timer is None:
+        timer = StageTimer()
+
+    # 1) DFA minimal (cache LRU par RegEx), ou bit-parallèle / DFA paresseux si la déterminisation explose
+    plan = plan_cache.compile(pattern, timer)
+    timer.set("automaton", plan.kind)
+    timer.set("nfa_states", plan.nfa_states)
+    if plan.kind == "dfa":
+        timer.set("dfa_states_before_min", plan.dfa_states_before_min)
+        timer.set("dfa_states_after_min", plan.dfa_states_after_min)
+        timer.set("dfa_classes", plan.compiled.n_classes)
+
+    # 2) Trouver les mots de l'index qui matchent la regex
+    #    (seuls les candidats du filtre de trigrammes passent dans le DFA ;
+    #     résultat partagé entre RegEx de même DFA minimal canonique)
+    stats = {}
 
-    # 1) Construire DFA minimal
-    nfa = regex_to_nfa(pattern)
-    dfa = minimize_dfa_hopcroft(nfa_to_dfa(nfa))
+    def compute(plan):
+        return match_vocabulary(plan.pattern, plan.compiled, index, ngram, dfa_match, stats)
 
-    # 2) Trouver tous les mots de l'index qui matchent la regex
-    matching_words = []
-    for word in index.keys():
-        if dfa_match(dfa, word):      
-            matching_words.append(word)
+    with timer.stage("vocabulary_scan"):
+        matching_words = plan_cache.matching_words(plan, compute, timer)
+    for key, value in stats.items():
+        timer.set(key, value)
+    if plan.kind == "lazy":
+        for key, value in plan.compiled.stats().items():
+            timer.set(f"lazy_dfa_{key}", value)
+    timer.set("vocabulary_size", len(index))
+    return matching_words
+
+
+def search_regex_engine(pattern, timer=None):
+    if timer is None:
+        timer = StageTimer()
+
+    matching_words = regex_matching_words(pattern, timer)
 
     # 3) Récupérer les documents correspondants
     doc_scores = {}
 
-    for w in matching_words:
-        postings = index[w]          # {doc_id : tf }
-        for doc_id, tf in postings.items():
-            doc_scores[doc_id] = doc_scores.get(doc_id, 0) + tf
+    with timer.stage("postings_merge"):
+        for w in matching_words:
+            postings = index[w]          # {doc_id : tf }
+            timer.count("postings_merged", len(postings))
+            for doc_id, tf in postings.items():
+                doc_scores[doc_id] = doc_scores.get(doc_id, 0) + tf
 
     # 4) Tri par score décroissant
-    ranked_docs = sorted(doc_scores.items(), key=lambda x: x[1], reverse=True)
+    with timer.stage("ranking"):
+        ranked_docs = sorted(doc_scores.items(), key=lambda x: x[1], reverse=True)
+    timer.set("docs_matched", len(ranked_docs))
 
     return ranked_docs
 
@@ -131,6 +191,45 @@ def suggest_neighbors(doc_id, k=10):
     neigh_sorted = sorted(neigh, key=score, reverse=True)
     return neigh_sorted[:k]
 
+
+def require_static_scores():
+    if static_data is None:
+        raise HTTPException(
+            status_code=503,
+            detail="static.json absent : lancer build_static_scores.py pour le mode rank=hybrid"
+        )
+    return (
+        static_data["scores"],
+        static_data["max_tf"],
+        static_presorted,
+    )
+
+
+def search_hybrid(query, w_text, w_static, k=20):
+    """Recherche simple (ET) classée par score texte + score statique."""
+    scores, max_tf, presorted = require_static_scores()
+    postings = []
+    for t in normalize(query):
+        posting = index.get(t)
+        if not posting:
+            return []
+        postings.append((t, posting))
+    return top_k_conjunctive(postings, scores, max_tf, k, w_text, w_static, presorted)
+
+
+def search_regex_hybrid(pattern, w_text, w_static, timer=None, k=20):
+    """Recherche RegEx (OU des mots qui matchent) classée par score texte + score statique."""
+    scores, max_tf, presorted = require_static_scores()
+    if timer is None:
+        timer = StageTimer()
+    words = regex_matching_words(pattern, timer)
+    stats = {}
+    with timer.stage("hybrid_top_k"):
+        ranked = top_k_disjunctive([(w, index[w]) for w in words], scores, max_tf,
+                                   k, w_text, w_static, presorted, stats)
+    timer.set("docs_scored", stats.get("docs_scored", 0))
+    return ranked
+
 # ----- API Routes -----
 
 @app.get("/")
@@ -166,9 +265,35 @@ def get_cover(doc_id: int):
 def api_search(
     q: str,
     page: int = Query(1, ge=1),
-    page_size: int = Query(18, ge=1, le=60)
+    page_size: int = Query(18, ge=1, le=60),
+    rank: str = Query("text", pattern="^(text|hybrid)$"),
+    w_text: float = Query(1.0, ge=0),
+    w_static: float = Query(0.5, ge=0),
+    k: int = Query(20, ge=1, le=1000),
+    autocorrect: bool = False,
 ):
-    docs = search_in_index(q)  # renvoie une liste de doc_ids (max 20)
+    """
+    rank=text   → classement historique (somme des tf)
+    rank=hybrid → w_text * score texte + w_static * score statique (centralité + downloads),
+                  top-k (k résultats, paginés par page / page_size)
+    Si aucun résultat : champ did_you_mean (correction par trigrammes),
+    et avec autocorrect=true la requête corrigée est exécutée directement.
+    """
+    def run(query):
+        if rank == "hybrid":
+            ranked = search_hybrid(query, w_text, w_static, k)
+            return [doc_id for doc_id, _ in ranked], dict(ranked)
+        return search_in_index(query), {}  # liste de doc_ids (max 20)
+
+    docs, scores = run(q)
+
+    did_you_mean = None
+    corrected_query = None
+    if not docs:
+        did_you_mean, _ = correct_query(q, index, ngram, normalize)
+        if did_you_mean and autocorrect:
+            corrected_query = did_you_mean
+            docs, scores = run(corrected_query)
 
     total = len(docs)
 
@@ -180,12 +305,15 @@ def api_search(
     results = []
     for doc_id in slice_docs:
         meta = metadata.get(str(doc_id), {})
-        results.append({
+        result = {
             "doc_id": doc_id,
             "title": meta.get("title", f"Doc {doc_id}"),
             "author": meta.get("author", "Unknown"),
             "cover_image": f"/cover/{doc_id}" if meta.get("cover_url") else None
-        })
+        }
+        if doc_id in scores:
+            result["score"] = scores[doc_id]
+        results.append(result)
 
     return {
         "query": q,
@@ -195,6 +323,9 @@ def api_search(
         "total_pages": max(1, math.ceil(total / page_size)),
         "results": results,
         "is_regex": False,
+        "rank": rank,
+        "did_you_mean": did_you_mean,
+        "corrected_query": corrected_query,
     }
 
 
@@ -203,9 +334,41 @@ def api_search(
 def api_search_regex(
     pattern: str,
     page: int = Query(1, ge=1),
-    page_size: int = Query(18, ge=1, le=60)
+    page_size: int = Query(18, ge=1, le=60),
+    profile: str = Query("0", pattern="^(0|1|full)$"),
+    rank: str = Query("text", pattern="^(text|hybrid)$"),
+    w_text: float = Query(1.0, ge=0),
+    w_static: float = Query(0.5, ge=0),
+    k: int = Query(20, ge=1, le=1000),
 ):
-    ranked = search_regex_engine(pattern)[:20]  # top 20
+    """
+    k            → nombre de résultats classés (top-k), paginés par page / page_size
+    profile=1    → ajoute une section "profile" (temps par étape + compteurs)
+    profile=full → idem + dump cProfile dans PROFILE_DIR (si DAAR_PROFILE_FULL=1)
+    """
+    if profile == "full" and not PROFILE_FULL_ENABLED:
+        raise HTTPException(
+            status_code=403,
+            detail="profile=full désactivé (lancer le serveur avec DAAR_PROFILE_FULL=1)"
+        )
+
+    timer = StageTimer()
+
+    def run():
+        if rank == "hybrid":
+            return search_regex_hybrid(pattern, w_text, w_static, timer, k)
+        return search_regex_engine(pattern, timer)
+
+    dump_path = None
+    try:
+        if profile == "full":
+            dump_path = profile_dump_path(PROFILE_DIR, pattern)
+            ranked = run_with_cprofile(run, dump_path)
+        else:
+            ranked = run()
+    except SyntaxError as e:          # RegexSyntaxError (Parser.py) : position du caractère fautif
+        raise HTTPException(status_code=400, detail=f"RegEx invalide : {e}")
+    ranked = ranked[:k]  # top k
     total = len(ranked)
 
     # Pagination réelle
@@ -224,7 +387,7 @@ def api_search_regex(
             "cover_image": f"/cover/{doc_id}" if meta.get("cover_url") else None,
         })
 
-    return {
+    response = {
         "query": pattern,
         "page": page,
         "page_size": page_size,
@@ -232,6 +395,26 @@ def api_search_regex(
         "total_pages": max(1, math.ceil(total / page_size)),
         "results": results,
         "is_regex": True,
+        "rank": rank,
+    }
+    if profile != "0":
+        response["profile"] = timer.to_dict()
+        if dump_path:
+            # nom du fichier dans DAAR_PROFILE_DIR seulement : pas de chemin du serveur dans la réponse
+            response["profile"]["cprofile_dump"] = os.path.relpath(dump_path, PROFILE_DIR)
+    return response
+
+
+@app.get("/diagnostics")
+def api_diagnostics():
+    """État interne : taille des données chargées, taux de hit et mémoire des caches."""
+    return {
+        "index_terms": len(index),
+        "documents": len(metadata),
+        "trigrams": len(ngram.trigrams),
+        "static_scores": static_data is not None,
+        "tfidf": tfidf is not None,
+        "plan_cache": plan_cache.stats(),
     }
 
 
@@ -255,3 +438,32 @@ def api_suggest(doc_id: str, k: int = 10):
         }
         for d in neigh
     ]
+
+
+@app.get("/similar/{doc_id}")
+def api_similar(
+    doc_id: str,
+    k: int = Query(10, ge=1, le=100),
+    top_terms: int = Query(DEFAULT_QUERY_TERMS, ge=0),
+):
+    """
+    "Plus comme celui-ci" : k livres les plus proches au sens du cosinus
+    entre vecteurs TF-IDF. top_terms limite la requête aux termes les plus
+    lourds du livre (0 = tous les termes).
+    """
+    if tfidf is None:
+        raise HTTPException(503, "tfidf.npz absent : lancer build_tfidf.py")
+    neigh = tfidf.similar(doc_id, k, top_terms)
+    if neigh is None:
+        raise HTTPException(404, "Document non trouvé")
+    return [
+        {
+            "doc_id": d,
+            "title": metadata.get(d, {}).get("title"),
+            "author": metadata.get(d, {}).get("author"),
+            "downloads": metadata.get(d, {}).get("downloads"),
+            "cover_url": metadata.get(d, {}).get("cover_url"),
+            "similarity": sim,
+        }
+        for d, sim in neigh
+    ]
@@ -0,0 +1,208 @@
+import sys
+import threading
+from collections import OrderedDict
+
+from NFA import regex_to_nfa
+from DFA import DFATooLarge, nfa_to_dfa, minimize_dfa_hopcroft, dfa_states
+from compiled_dfa import CompiledDFA
+from dfa_store import StoredDFA, lookup, remember
+from lazy_dfa import LazyDFA
+from bitparallel import BitParallelMatcher, count_positions, MAX_POSITIONS
+from profiling import StageTimer
+
+# ========= Cache des automates compilés (plans) =========
+#
+# Niveau 1 : RegEx (chaîne)            → plan compilé (DFA minimal + forme canonique)
+# Niveau 2 : forme canonique du DFA    → mots du vocabulaire qui matchent
+#
+# Deux RegEx équivalentes ("(a|b)*" et "(b|a)*") ont le même DFA minimal à
+# renumérotation près : la forme canonique (CompiledDFA.canonical_key) les
+# fait partager le niveau 2.
+# Sous le niveau 1, le cache disque (dfa_store.py) évite de recompiler les
+# RegEx déjà vues par un autre processus ou avant un redémarrage.
+
+
+def approx_size(obj) -> int:
+    """
+    Taille mémoire approximative (octets) d'une structure Python imbriquée.
+    Parcours itératif (pile explicite) : pas de limite de récursion quelle que
+    soit la profondeur ; chaque conteneur est copié avant d'être parcouru, car un
+    DFA paresseux peut grossir pendant la mesure (autre requête, autre thread).
+    """
+    seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            for k, v in list(obj.items()):
+                stack.append(k)
+                stack.append(v)
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(list(obj))
+        elif hasattr(obj, "__dict__"):
+            stack.append(vars(obj))
+        elif hasattr(obj, "__slots__"):
+            stack.extend(getattr(obj, s) for s in obj.__slots__ if hasattr(obj, s))
+    return size
+
+
+class LRUCache:
+    """
+    LRU borné, partagé par les threads du serveur (FastAPI exécute les routes
+    synchrones dans un pool de threads) : get / put / clear / stats sous un verrou,
+    sinon un get peut lire une clé évincée entre le test et la lecture (KeyError)
+    et les compteurs perdent des incréments.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.max_entries:
+                self.data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+    def stats(self):
+        with self.lock:
+            entries = list(self.data.items())
+            hits, misses, evictions = self.hits, self.misses, self.evictions
+        lookups = hits + misses
+        return {
+            "entries": len(entries),
+            "max_entries": self.max_entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "evictions": evictions,
+            "approx_bytes": approx_size(entries),       # mesuré hors du verrou
+        }
+
+
+class CompiledPlan:
+    __slots__ = ("pattern", "kind", "dfa", "compiled", "key", "nfa_states",
+                 "dfa_states_before_min", "dfa_states_after_min")
+
+    def __init__(self, pattern, dfa, compiled, key, nfa_states, before, after):
+        self.pattern = pattern
+        if isinstance(compiled, LazyDFA):
+            self.kind = "lazy"
+        elif isinstance(compiled, BitParallelMatcher):
+            self.kind = "bitparallel"
+        else:
+            self.kind = "dfa"
+        self.dfa = dfa                  # None si lu sur disque ou si la déterminisation a explosé
+        self.compiled = compiled        # CompiledDFA, LazyDFA ou BitParallelMatcher
+        self.key = key
+        self.nfa_states = nfa_states
+        self.dfa_states_before_min = before
+        self.dfa_states_after_min = after
+
+
+def compile_plan(pattern: str, timer: StageTimer = None,
+                 max_dfa_states: int = 2000, lazy_states: int = 2000,
+                 nfa_method: str = "glushkov") -> CompiledPlan:
+    """
+    NFA de Glushkov par défaut (sans ε : pas de fermeture dans la déterminisation).
+    Si la déterminisation dépasse max_dfa_states états, on s'arrête et le plan
+    utilise le moteur bit-parallèle (RegEx d'au plus 64 symboles) ou un DFA
+    paresseux (mémoire bornée par lazy_states) : pas de forme canonique dans
+    ce cas, la clé du cache de résultats est la RegEx elle-même.
+    """
+    if timer is None:
+        timer = StageTimer()
+    with timer.stage("dfa_store_load"):
+        stored = lookup(pattern, nfa_method, max_dfa_states)
+    timer.set("dfa_store", "hit" if stored is not None else "miss")
+
+    dfa = None
+    if stored is None:
+        with timer.stage("regex_to_nfa"):
+            nfa = regex_to_nfa(pattern, method=nfa_method)
+        with timer.stage("nfa_to_dfa"):
+            try:
+                dfa_raw = nfa_to_dfa(nfa, max_states=max_dfa_states)
+            except DFATooLarge:
+                dfa_raw = None
+        if dfa_raw is None:
+            if count_positions(pattern) <= MAX_POSITIONS:
+                fallback = BitParallelMatcher(pattern)
+            else:
+                fallback = LazyDFA(nfa, max_states=lazy_states)
+            return CompiledPlan(pattern, None, fallback, ("nodfa", pattern), nfa.count_id, None, None)
+        with timer.stage("minimize"):
+            dfa = minimize_dfa_hopcroft(dfa_raw)
+        with timer.stage("compile_table"):
+            compiled = CompiledDFA.of(dfa)
+        stored = StoredDFA(compiled, nfa.count_id, len(dfa_states(dfa_raw)), len(dfa_states(dfa)), False)
+        with timer.stage("dfa_store_save"):
+            remember(pattern, nfa_method, stored)
+
+    with timer.stage("canonicalize"):
+        key = stored.compiled.canonical_key()
+    return CompiledPlan(pattern, dfa, stored.compiled, key, stored.nfa_states,
+                        stored.raw_states, stored.min_states)
+
+
+class PlanCache:
+    def __init__(self, max_patterns: int = 256, max_results: int = 128,
+                 max_dfa_states: int = 2000, lazy_states: int = 2000):
+        self.plans = LRUCache(max_patterns)      # RegEx → CompiledPlan
+        self.results = LRUCache(max_results)     # clé canonique → tuple de mots
+        self.max_dfa_states = max_dfa_states
+        self.lazy_states = lazy_states
+
+    def compile(self, pattern: str, timer: StageTimer = None) -> CompiledPlan:
+        plan = self.plans.get(pattern)
+        if timer is not None:
+            timer.set("plan_cache", "hit" if plan is not None else "miss")
+        if plan is None:
+            plan = compile_plan(pattern, timer, self.max_dfa_states, self.lazy_states)
+            self.plans.put(pattern, plan)
+        return plan
+
+    def matching_words(self, plan: CompiledPlan, compute, timer: StageTimer = None):
+        """Mots qui matchent le plan ; compute(plan) n'est appelé qu'en cas d'absence du cache."""
+        words = self.results.get(plan.key)
+        if timer is not None:
+            timer.set("result_cache", "hit" if words is not None else "miss")
+        if words is None:
+            words = tuple(compute(plan))
+            self.results.put(plan.key, words)
+        return words
+
+    def clear(self):
+        self.plans.clear()
+        self.results.clear()
+
+    def stats(self):
+        return {
+            "plans": self.plans.stats(),
+            "results": self.results.stats(),
+        }
@@ -0,0 +1,205 @@
+from Parser import parse, fold_tree, has_anchors, BOL, EOL
+from NFA import build_glushkov
+from AhoCorasick import literal_alternatives
+from charclass import range_lookup
+
+from match_output import iter_line_matches, write_matches
+
+# ========= Moteur bit-parallèle (Shift-And étendu aux automates de Glushkov) =========
+#
+# Automate de Glushkov : état 0 (initial) + une position par symbole de la RegEx.
+# Propriété clé : toutes les transitions qui entrent dans la position q portent
+# le même symbole sym(q). Un ensemble d'états actifs D (bit q = position q)
+# avance donc d'un caractère c par :
+#     D' = Follow(D) & B[c]
+#   B[c]      : masque des positions étiquetées c
+#   Follow(D) : union des follow(p) pour p dans D
+# Pour une concaténation simple, Follow(D) = D << 1 : c'est exactement Shift-And.
+# Une position de classe (ou '.') est dans B[s] pour chacun de ses symboles s (un par
+# intervalle élémentaire, cf. charclass.py) ; mask_of(code) trouve l'intervalle.
+# Follow(D) se calcule par tranches de CHUNK bits (tables précalculées) et
+# est mémorisé par valeur de D (peu de valeurs distinctes en pratique).
+
+CHUNK = 8
+MAX_POSITIONS = 64          # "mot machine" : au-delà, le dispatcher choisit le DFA
+MEMO_MAX = 4096             # taille max du cache Follow(D)
+
+
+class BitParallelMatcher:
+    """
+    Même interface d'exécution que CompiledDFA / LazyDFA : start, step(état, ch),
+    is_final(état), match(mot). Un état est l'entier D ; 0 = état mort.
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        nfa = build_glushkov(parse(pattern))
+        self.positions = nfa.count_id - 1
+        self.start = 1 << nfa.start
+
+        # masques par symbole ('.' est développé en intervalles comme une classe)
+        follow = [0] * nfa.count_id
+        masks = {}
+        for p, trans in nfa.transitions.items():
+            for sym, dests in trans.items():
+                for q in dests:
+                    follow[p] |= 1 << q
+                    masks[sym] = masks.get(sym, 0) | (1 << q)
+        self.masks = masks
+        self.mask_of = range_lookup(self.masks, nfa.alphabet, 0)   # mask_of(code)
+
+        self.accept = 0
+        for q in nfa.finals:
+            self.accept |= 1 << q
+
+        # tables Follow par tranches : tables[k][v] = Follow des bits v de la tranche k
+        self.tables = []
+        for k in range(0, nfa.count_id, CHUNK):
+            table = [0] * (1 << CHUNK)
+            for v in range(1, 1 << CHUNK):
+                low = (v & -v).bit_length() - 1
+                p = k + low
+                table[v] = table[v & (v - 1)] | (follow[p] if p < nfa.count_id else 0)
+            self.tables.append(table)
+        self._memo = {}
+
+    def __str__(self):
+        return f"BitParallelMatcher({self.pattern!r}, {self.positions} positions)"
+
+    # ----- transitions -----
+
+    def follow(self, bits: int) -> int:
+        out = self._memo.get(bits)
+        if out is not None:
+            return out
+        out = 0
+        d = bits
+        mask = (1 << CHUNK) - 1
+        for table in self.tables:
+            if d & mask:
+                out |= table[d & mask]
+            d >>= CHUNK
+            if not d:
+                break
+        if len(self._memo) >= MEMO_MAX:
+            self._memo.clear()
+        self._memo[bits] = out
+        return out
+
+    def step(self, state: int, ch: str) -> int:
+        return self.follow(state) & self.mask_of(ord(ch))
+
+    def is_final(self, state: int) -> bool:
+        return bool(state & self.accept)
+
+    # ----- mot entier (vocabulaire) -----
+
+    def match(self, word: str) -> bool:
+        mask_of, follow, memo = self.mask_of, self.follow, self._memo
+        d = self.start
+        for ch in word:
+            f = memo.get(d)
+            if f is None:
+                f = follow(d)
+            d = f & mask_of(ord(ch))
+            if not d:
+                return False
+        return bool(d & self.accept)
+
+    # ----- recherche dans une ligne (egrep) -----
+
+    def first_end(self, line: str, pos: int = 0) -> int:
+        """
+        Recherche non ancrée : l'état initial reste actif à chaque caractère.
+        Renvoie la fin (exclue) du premier match qui se termine, ou -1.
+        """
+        if self.accept & self.start:
+            return pos                          # la RegEx accepte le mot vide
+        mask_of, follow, start, accept = self.mask_of, self.follow, self.start, self.accept
+        d = 0
+        for i in range(pos, len(line)):
+            d = follow(d | start) & mask_of(ord(line[i]))
+            if d & accept:
+                return i + 1
+        return -1
+
+    def line_matches(self, line: str) -> bool:
+        """La ligne contient-elle un match (éventuellement vide) ?"""
+        return self.first_end(line) >= 0
+
+    def longest_from(self, line: str, start: int) -> int:
+        """Fin (exclue) du plus long match ancré en start, ou -1."""
+        d = self.start
+        end = start if d & self.accept else -1
+        for i in range(start, len(line)):
+            d = self.step(d, line[i])
+            if not d:
+                break
+            if d & self.accept:
+                end = i + 1
+        return end
+
+    def finditer(self, line: str):
+        """
+        Matchs (début, fin) sans chevauchement, sémantique egrep "leftmost-longest".
+        Les lignes sans match ne coûtent qu'un passage ; pour les autres, on cherche
+        le début le plus à gauche parmi les positions <= fin du premier match.
+        """
+        pos = 0
+        while pos <= len(line):
+            end = self.first_end(line, pos)
+            if end < 0:
+                return
+            for start in range(pos, end + 1):
+                longest = self.longest_from(line, start)
+                if longest >= 0:
+                    break
+            yield start, longest
+            pos = longest + 1 if longest == start else longest
+
+    def search_in_file(self, filepath: str) -> bool:
+        """Même affichage que KMP.search_in_file / matching.match_dfa_in_file."""
+        return write_matches(iter_line_matches(self, filepath))
+
+
+# ========= Choix du moteur selon la RegEx =========
+
+def count_positions(pattern: str) -> int:
+    """
+    Nombre de positions de Glushkov = nombre de feuilles (lettres, '.', classes)
+    de l'arbre, ancres exclues ; R{m,n} compte n fois les positions de R.
+    """
+    def combine(node, subs):
+        return sum(subs) if node.subs else int(node.root not in (BOL, EOL))
+    return fold_tree(parse(pattern), combine)
+
+
+def choose_engine(pattern: str) -> str:
+    """
+      "anchored"    : une branche au moins avec '^' ou '$' → matching.AnchoredSearcher
+      "kmp"         : littéral pur (une seule chaîne, ex: "Sargon", "a\\.b")
+      "aho"         : langage fini de littéraux (ex: "king|queen|prince|duke", "gr[ae]y") → Aho–Corasick
+      "bitparallel" : au plus MAX_POSITIONS positions (tient dans un mot machine)
+      "dfa"         : sinon (DFA minimal, ou DFA paresseux s'il explose)
+    """
+    if has_anchors(parse(pattern)):
+        return "anchored"
+    words = literal_alternatives(pattern)
+    if words is not None:
+        return "kmp" if len(words) == 1 else "aho"
+    if count_positions(pattern) <= MAX_POSITIONS:
+        return "bitparallel"
+    return "dfa"
+
+
+if __name__ == "__main__":
+    m = BitParallelMatcher("S(a|g|r)+on")
+    print(m)
+    for w in ["Sargon", "Son", "Saon", "Sgrrrraon", "Sargonx"]:
+        print(f"  {w!r:12} → {m.match(w)}")
+    print(list(m.finditer("le roi Sargon et Saon, puis Sgon")))
+    m = BitParallelMatcher("[A-Z][a-z]+on")
+    print(m, list(m.finditer("le roi Sargon et Saon, puis Sgon")))
+    for p in ["Sargon", "king|queen|prince|duke", "gr[ae]y", "king(dom|ly)+", "^The", "[a-z]+ing",
+              "(" + "|".join(f"mot{i}" for i in range(30)) + ")*"]:
+        print(f"{p[:30]!r:32} → {choose_engine(p)}")
@@ -8,6 +8,8 @@ from nltk.stem import PorterStemmer, WordNetLemmatizer
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from ngram_index import build_trigram_index, save_trigram_index
+
 # ---------- NLTK stopwords ----------
 try:
     stop_words = set(stopwords.words("english"))
@@ -237,6 +239,8 @@ def main():
     with open(os.path.join(LIB_DIR, "vocab.json"), "w") as f:
         json.dump(vocab, f)
 
+    save_trigram_index(build_trigram_index(index.keys()), os.path.join(LIB_DIR, "trigrams.json"))
+
     print("Terminé pour le livre 10 !")
 
 
@@ -10,6 +10,8 @@ from nltk.corpus import stopwords
 from nltk.stem import PorterStemmer, WordNetLemmatizer
 from tqdm import tqdm
 
+from ngram_index import build_trigram_index, save_trigram_index
+
 # =========================
 # Config logging
 # =========================
@@ -21,6 +23,7 @@ os.makedirs(LIB_DIR, exist_ok=True)
 INDEX_PATH = os.path.join(LIB_DIR, "index.json")
 VOCAB_PATH = os.path.join(LIB_DIR, "vocab.json")
 PROGRESS_PATH = os.path.join(LIB_DIR, "progress.json")
+TRIGRAMS_PATH = os.path.join(LIB_DIR, "trigrams.json")
 LOG_PATH = os.path.join(LIB_DIR, "build_index.log")
 
 logging.basicConfig(
@@ -228,6 +231,12 @@ def save_state(index, vocab, next_book_id, count_docs):
         )
 
 
+def save_trigrams(index):
+    """Index de trigrammes du vocabulaire (correction orthographique)."""
+    logging.info(f"Construction de l'index de trigrammes ({len(index)} mots)...")
+    save_trigram_index(build_trigram_index(index.keys()), TRIGRAMS_PATH)
+
+
 def main():
     index, vocab, book_id, count_docs = load_state()
 
@@ -263,7 +272,8 @@ def main():
     pbar.close()
     # sauvegarde finale
     save_state(index, vocab, book_id, count_docs)
-    print("Index et vocab.json créés !")
+    save_trigrams(index)
+    print("Index, vocab.json et trigrams.json créés !")
     print(f"Total livres valides : {count_docs}")
 
 
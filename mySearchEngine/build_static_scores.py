@@ -0,0 +1,122 @@
+import os
+import json
+import math
+import argparse
+
+# ---------- Chemins ----------
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LIB_DIR = os.path.join(BASE_DIR, "library")
+INDEX_PATH = os.path.join(LIB_DIR, "index.json")
+CENTRALITY_PATH = os.path.join(LIB_DIR, "centrality.json")
+METADATA_PATH = os.path.join(LIB_DIR, "metadata.json")
+STATIC_PATH = os.path.join(LIB_DIR, "static.json")
+
+
+def load_json(path, required=True):
+    if not os.path.exists(path):
+        if required:
+            raise FileNotFoundError(f"Fichier introuvable : {path}")
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def file_fingerprint(path):
+    """Taille + date de modification : change dès que le fichier est réécrit (build_index*.py)."""
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def compute_static_scores(doc_ids, centrality, metadata, w_centrality=0.5, w_downloads=0.5):
+    """
+    Score statique (indépendant de la requête) de chaque document, dans [0, 1] :
+      static(d) = w_c * closeness(d) + w_dl * log(1 + dl(d)) / log(1 + max_dl)
+
+    closeness vient de centrality.py (déjà normalisée, max = 1),
+    dl = nombre de téléchargements (metadata.json).
+    """
+    downloads = {d: (metadata.get(d, {}).get("downloads") or 0) for d in doc_ids}
+    max_dl = max(downloads.values(), default=0)
+    log_max = math.log1p(max_dl) if max_dl > 0 else 1.0
+
+    total_w = (w_centrality + w_downloads) or 1.0
+    scores = {}
+    for d in doc_ids:
+        c = centrality.get(d, 0.0) or 0.0
+        dl = math.log1p(downloads[d]) / log_max
+        scores[d] = (w_centrality * c + w_downloads * dl) / total_w
+    return scores
+
+
+def reorder_postings(index, scores):
+    """
+    Réordonne chaque posting {doc_id: tf} par score statique décroissant
+    (puis doc_id croissant). L'ordre des clés est conservé par json,
+    ce qui permet l'arrêt anticipé du top-k au moment de la requête.
+    """
+    def key(d):
+        return (-scores.get(d, 0.0), int(d))
+
+    return {
+        w: {d: posting[d] for d in sorted(posting, key=key)}
+        for w, posting in index.items()
+    }
+
+
+def compute_max_tf(index):
+    """max_tf[w] = plus grande fréquence de w dans un document (borne du score texte)."""
+    return {w: max(int(tf) for tf in posting.values()) for w, posting in index.items() if posting}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Calculer les scores statiques (centralité + downloads) et réordonner les postings."
+    )
+    parser.add_argument("--w-centrality", type=float, default=0.5,
+                        help="Poids de la centralité dans le score statique (par défaut: 0.5).")
+    parser.add_argument("--w-downloads", type=float, default=0.5,
+                        help="Poids de log(downloads) dans le score statique (par défaut: 0.5).")
+    args = parser.parse_args()
+
+    print("Chargement de l'index, de la centralité et des métadonnées...")
+    index = load_json(INDEX_PATH)
+    centrality = load_json(CENTRALITY_PATH, required=False)
+    metadata = load_json(METADATA_PATH, required=False)
+
+    doc_ids = set()
+    for posting in index.values():
+        doc_ids.update(posting.keys())
+    print(f"{len(index)} mots, {len(doc_ids)} documents.")
+
+    print("Calcul des scores statiques...")
+    scores = compute_static_scores(doc_ids, centrality, metadata,
+                                   args.w_centrality, args.w_downloads)
+
+    print("Réordonnancement des postings par score statique...")
+    index = reorder_postings(index, scores)
+    max_tf = compute_max_tf(index)
+
+    print(f"Sauvegarde de {INDEX_PATH} ...")
+    with open(INDEX_PATH, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+
+    print(f"Sauvegarde de {STATIC_PATH} ...")
+    with open(STATIC_PATH, "w", encoding="utf-8") as f:
+        json.dump({
+            "postings_order": "static_desc",
+            "index_fingerprint": file_fingerprint(INDEX_PATH),     # ordre valable pour CET index.json
+            "weights": {"centrality": args.w_centrality, "downloads": args.w_downloads},
+            "scores": scores,
+            "max_tf": max_tf,
+        }, f)
+
+    print("Top 10 des documents (score statique) :")
+    for d, s in sorted(scores.items(), key=lambda x: x[1], reverse=True)[:10]:
+        print(f"  Doc {d} | static = {s:.4f}")
+
+    print("Terminé !")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import os
+import json
+import argparse
+import numpy as np
+
+# ---------- Chemins ----------
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LIB_DIR = os.path.join(BASE_DIR, "library")
+INDEX_PATH = os.path.join(LIB_DIR, "index.json")
+TFIDF_PATH = os.path.join(LIB_DIR, "tfidf.npz")
+
+
+def load_index():
+    if not os.path.exists(INDEX_PATH):
+        raise FileNotFoundError(f"index.json introuvable : {INDEX_PATH}")
+    with open(INDEX_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def index_to_coo(index):
+    """
+    Aplatit l'index {mot: {doc_id: tf}} en trois tableaux (doc, terme, tf).
+    Les documents sont numérotés par doc_id croissant, les termes par ordre alphabétique.
+    """
+    doc_ids = sorted({d for posting in index.values() for d in posting}, key=int)
+    row_of = {d: i for i, d in enumerate(doc_ids)}
+    terms = sorted(index.keys())
+
+    nnz = sum(len(index[t]) for t in terms)
+    rows = np.empty(nnz, dtype=np.int32)
+    cols = np.empty(nnz, dtype=np.int32)
+    tfs = np.empty(nnz, dtype=np.float32)
+
+    pos = 0
+    for col, t in enumerate(terms):
+        posting = index[t]
+        n = len(posting)
+        rows[pos:pos + n] = [row_of[d] for d in posting]
+        cols[pos:pos + n] = col
+        tfs[pos:pos + n] = [int(tf) for tf in posting.values()]
+        pos += n
+
+    return np.array(doc_ids, dtype=np.int64), rows, cols, tfs
+
+
+def build_tfidf_csr(doc_ids, rows, cols, tfs, top_terms=None):
+    """
+    Matrice documents × termes au format CSR (indptr / indices / data) :
+      w(d, t) = (1 + log tf) * log(N / df(t)),  puis normalisation L2 par ligne.
+    Si top_terms est donné, on ne garde que les top_terms termes les plus
+    lourds de chaque document (avant normalisation).
+    """
+    n_docs = len(doc_ids)
+    df = np.bincount(cols)
+    idf = np.log(n_docs / np.maximum(df, 1)).astype(np.float32)
+    weights = (1.0 + np.log(tfs)) * idf[cols]
+
+    # tri par (document, poids décroissant) : les lignes deviennent contiguës
+    order = np.lexsort((-weights, rows))
+    rows, cols, weights = rows[order], cols[order], weights[order]
+
+    counts = np.bincount(rows, minlength=n_docs)
+    indptr = np.zeros(n_docs + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+
+    keep = weights > 0
+    if top_terms:
+        rank_in_row = np.arange(len(rows)) - indptr[rows]
+        keep &= rank_in_row < top_terms
+    rows, cols, weights = rows[keep], cols[keep], weights[keep]
+
+    counts = np.bincount(rows, minlength=n_docs)
+    indptr = np.zeros(n_docs + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+
+    # indices de colonnes croissants dans chaque ligne (format CSR canonique)
+    order = np.lexsort((cols, rows))
+    cols, weights = cols[order], weights[order]
+
+    norms = np.sqrt(np.bincount(rows, weights=weights.astype(np.float64) ** 2, minlength=n_docs))
+    norms[norms == 0] = 1.0
+    data = (weights / norms[rows]).astype(np.float32)
+
+    return indptr, cols.astype(np.int32), data
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Construire les vecteurs TF-IDF (CSR NumPy) des documents pour /similar."
+    )
+    parser.add_argument(
+        "--top-terms",
+        type=int,
+        default=None,
+        help="Ne garder que les N termes les plus lourds par document (par défaut: tous)."
+    )
+    args = parser.parse_args()
+
+    print("Chargement de l'index inversé...")
+    index = load_index()
+    print(f"Index chargé avec {len(index)} mots.")
+
+    print("Aplatissement des postings...")
+    doc_ids, rows, cols, tfs = index_to_coo(index)
+
+    print("Calcul des poids TF-IDF et normalisation L2...")
+    indptr, indices, data = build_tfidf_csr(doc_ids, rows, cols, tfs, args.top_terms)
+    print(f"{len(doc_ids)} documents, {len(indices)} poids non nuls.")
+
+    print(f"Sauvegarde dans {TFIDF_PATH} ...")
+    os.makedirs(LIB_DIR, exist_ok=True)
+    np.savez(
+        TFIDF_PATH,
+        indptr=indptr,
+        indices=indices,
+        data=data,
+        doc_ids=doc_ids,
+        n_terms=np.int64(len(index)),
+    )
+
+    print("Terminé !")
+
+
+if __name__ == "__main__":
+    main()
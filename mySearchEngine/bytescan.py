@@ -0,0 +1,208 @@
+import mmap
+
+import numpy as np
+
+from Parser import parse
+from regex_analysis import required_literal, required_literals, accepts_empty
+from AhoCorasick import AhoCorasick, literal_alternatives
+from match_output import MatchRecord, write_matches
+
+# ========= Parcours d'un fichier en octets (mmap) avec préfiltre littéral =========
+#
+# - le fichier est mappé en mémoire (mmap), jamais lu ligne à ligne ;
+# - un facteur obligatoire de la RegEx (regex_analysis.required_literal) est
+#   cherché avec bytes.find (vitesse memchr) : seules les lignes qui le
+#   contiennent sont décodées et passées à l'automate ;
+# - les numéros de ligne viennent d'un index des '\n' (une passe NumPy) ;
+# - sans facteur obligatoire (ex: ".*"), ou si le facteur est présent dans la
+#   plupart des lignes d'un échantillon (ex: "the"), le préfiltre ne ferait que
+#   coûter : le fichier est décodé d'un bloc et toutes les lignes passent par l'automate.
+# - si le facteur obligatoire est trop court (ex: "" pour "king|queen|prince|duke"),
+#   on prend un ensemble de facteurs dont tout match contient au moins un
+#   (regex_analysis.required_literals), tous cherchés en une passe par Aho–Corasick.
+#
+# L'automate est n'importe quel objet qui a finditer(ligne) → (début, fin)
+# (matching.DFASearcher, bitparallel.BitParallelMatcher, KMP, BMH, AhoCorasick).
+# Les matchs sortent en MatchRecord (match_output.py), sans formatage.
+#
+# Une ligne matche si elle contient un match, même vide : "x?" matche toute ligne.
+# L'appartenance d'une ligne est décidée par line_matches(ligne) de l'automate
+# (un seul passage, pas de calcul des matchs) ; une ligne qui ne matche que le mot
+# vide sort en un MatchRecord vide (début = fin = 0), affiché sauf avec -o.
+
+
+DENSE_SAMPLE = 1 << 16      # octets examinés pour estimer la fréquence du littéral
+DENSE_RATIO = 0.5           # au-delà d'une occurrence pour 2 lignes : pas de préfiltre
+MIN_LITERAL = 3             # en dessous, un ensemble de facteurs plus longs est préféré
+
+
+def newline_index(buf, start: int = 0, end: int = None) -> np.ndarray:
+    """Positions (croissantes, absolues) des '\\n' de buf[start:end]."""
+    if end is None:
+        end = len(buf)
+    view = np.frombuffer(buf, dtype=np.uint8, count=end - start, offset=start)
+    return np.flatnonzero(view == 0x0A) + start
+
+
+class ByteScanner:
+    def __init__(self, pattern: str, matcher, literal: str = None, literals=None):
+        """
+        literal : facteur obligatoire (bytes.find) ; literals : ensemble de facteurs
+        (Aho–Corasick). Sans l'un ni l'autre, ils sont déduits de la RegEx.
+        """
+        self.pattern = pattern
+        self.matcher = matcher
+        # KMP, BMH, Aho–Corasick : pas de line_matches, et jamais de match vide
+        self.line_matches = getattr(matcher, "line_matches", None) or (
+            lambda line: any(e > s for s, e in matcher.finditer(line)))
+        tree = parse(pattern)
+        self.nullable = accepts_empty(tree)
+        if literal is None and literals is None:
+            literal = required_literal(tree)
+            factors = required_literals(tree)
+            if len(literal) < MIN_LITERAL and factors and min(map(len, factors)) > len(literal):
+                literals = factors
+        self.literal = b"" if literals else (literal or "").encode("utf-8")
+        self.aho = AhoCorasick(literals) if literals else None
+        # préfiltre exact (littéral pur, alternative de littéraux) : une ligne
+        # candidate est une ligne avec match, count() n'a pas besoin de l'automate
+        words = literal_alternatives(pattern)
+        if self.aho is not None:
+            self.exact = self.aho.words == words
+        else:
+            self.exact = bool(self.literal) and words is not None and [self.literal.decode("utf-8")] == words
+
+    def __str__(self):
+        if self.aho is not None:
+            return f"ByteScanner({self.pattern!r}, literals={self.aho.words!r})"
+        return f"ByteScanner({self.pattern!r}, literal={self.literal!r})"
+
+    def literal_is_dense(self, buf, start: int, end: int) -> bool:
+        sample = buf[start:min(end, start + DENSE_SAMPLE)]
+        lines = sample.count(b"\n") + 1
+        if self.aho is not None:
+            hit_lines = np.searchsorted(newline_index(sample), self.aho.ends(sample) - 1)
+            return len(np.unique(hit_lines)) >= DENSE_RATIO * lines
+        return sample.count(self.literal) >= DENSE_RATIO * lines
+
+    def _line_bounds(self, newlines, i: int, start: int, end: int):
+        line_start = int(newlines[i - 1]) + 1 if i else start
+        line_end = int(newlines[i]) if i < len(newlines) else end
+        return i + 1, line_start, line_end
+
+    def _candidate_lines(self, buf, newlines, start: int, end: int):
+        """(numéro de ligne, début, fin) des lignes qui contiennent le littéral, dans l'ordre."""
+        if self.aho is not None:
+            # une seule passe pour tous les facteurs, puis une ligne par fin d'occurrence
+            for i in np.unique(np.searchsorted(newlines, self.aho.ends(buf, start, end) - 1)):
+                yield self._line_bounds(newlines, int(i), start, end)
+            return
+        pos = start
+        find = buf.find
+        while True:
+            hit = find(self.literal, pos, end)
+            if hit < 0:
+                return
+            line_no, line_start, line_end = self._line_bounds(newlines, int(np.searchsorted(newlines, hit)), start, end)
+            yield line_no, line_start, line_end
+            pos = line_end + 1              # la ligne entière est traitée : ligne suivante
+
+    def _all_lines(self, buf, start: int, end: int):
+        """Sans littéral : toute la plage est décodée et découpée en une fois (en C)."""
+        text = buf[start:end].decode("utf-8", errors="ignore")
+        if not text:                        # plage vide : aucune ligne (pas une ligne vide)
+            return
+        if text.endswith("\n"):
+            text = text[:-1]
+        for line_no, line in enumerate(text.split("\n"), start=1):
+            yield line_no, line.rstrip("\r")
+
+    def lines(self, buf, start: int = 0, end: int = None):
+        """(numéro de ligne, ligne) des lignes de buf[start:end] qui peuvent matcher."""
+        if end is None:
+            end = len(buf)
+        if (not self.literal and self.aho is None) or self.literal_is_dense(buf, start, end):
+            yield from self._all_lines(buf, start, end)
+            return
+        newlines = newline_index(buf, start, end)
+        for line_no, line_start, line_end in self._candidate_lines(buf, newlines, start, end):
+            if line_end > line_start and buf[line_end - 1] == 0x0D:     # fin de ligne "\r\n"
+                line_end -= 1
+            yield line_no, buf[line_start:line_end].decode("utf-8", errors="ignore")
+
+    def scan(self, buf, start: int = 0, end: int = None):
+        """
+        MatchRecord (numéro de ligne, ligne, début, fin) de buf[start:end] (bytes ou mmap).
+        La plage commence en début de ligne ; les lignes sont numérotées à partir
+        de 1 au début de la plage (cf. parallel_scan.py pour les morceaux d'un fichier).
+        """
+        finditer = self.matcher.finditer
+        nullable, line_matches = self.nullable, self.line_matches
+        for line_no, line in self.lines(buf, start, end):
+            found = False
+            for s, e in finditer(line):
+                if e > s:
+                    found = True
+                    yield MatchRecord(line_no, line, s, e)
+            if not found and nullable and line_matches(line):
+                yield MatchRecord(line_no, line, 0, 0)      # seulement le mot vide
+
+    def count(self, buf, start: int = 0, end: int = None, max_lines: int = None) -> int:
+        """
+        Nombre de lignes avec match de buf[start:end] (au plus max_lines), sans
+        formater les matchs (egrep -c / -q / -l). Avec un préfiltre exact, les
+        lignes ne sont même pas décodées.
+        """
+        if end is None:
+            end = len(buf)
+        if self.exact and self.aho is None:
+            n = 0
+            pos = start
+            find = buf.find
+            while max_lines is None or n < max_lines:
+                hit = find(self.literal, pos, end)
+                if hit < 0:
+                    break
+                n += 1
+                nl = find(b"\n", hit + len(self.literal), end)
+                if nl < 0:
+                    break
+                pos = nl + 1                # une seule fois par ligne
+            return n
+        if self.exact:
+            hits = self.aho.ends(buf, start, end)
+            n = len(np.unique(np.searchsorted(newline_index(buf, start, end), hits - 1)))
+            return n if max_lines is None else min(n, max_lines)
+        n = 0
+        line_matches = self.line_matches
+        for _, line in self.lines(buf, start, end):
+            if max_lines is not None and n >= max_lines:
+                break
+            if line_matches(line):
+                n += 1
+        return n
+
+    def iter_file(self, filepath: str):
+        """MatchRecord de chaque match du fichier (mappé en mémoire)."""
+        with open(filepath, "rb") as f:
+            try:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:                  # fichier vide : rien à mapper
+                return
+            with buf:
+                yield from self.scan(buf)
+
+    def search_in_file(self, filepath: str) -> bool:
+        """Même affichage que KMP.search_in_file / matching.match_dfa_in_file."""
+        return write_matches(self.iter_file(filepath))
+
+
+if __name__ == "__main__":
+    from matching import DFASearcher
+
+    text = b"Le roi Sargon\r\nrien ici\nSaon et Sgrron\nsans fin de ligne Sargon"
+    for pattern in ["S(a|g|r)+on", ".*on", "Sargon"]:
+        scanner = ByteScanner(pattern, DFASearcher(pattern))
+        print(scanner)
+        for line_no, line, start, end in scanner.scan(text):
+            print(f"  ligne {line_no}, colonne {start+1} : {line[start:end]!r}")
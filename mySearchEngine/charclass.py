@@ -0,0 +1,203 @@
+from bisect import bisect_left, bisect_right
+
+# ========= Classes de caractères : intervalles de codes =========
+#
+# Une classe ([a-z], [^"], \d...) est un tuple trié d'intervalles (lo, hi)
+# disjoints, bornes comprises, dans [0, MAX_CODE]. Une classe niée est
+# complémentée dès l'analyse syntaxique : il n'y a qu'une sorte de classe.
+#
+# Dans les automates, une classe ne donne pas une transition par caractère :
+# les bornes de toutes les feuilles de la RegEx découpent les codes en
+# intervalles élémentaires (deux codes d'un même intervalle sont indiscernables
+# pour la RegEx), et une feuille a une transition par intervalle élémentaire
+# qu'elle couvre. Un intervalle d'un seul code est le code lui-même (les
+# RegEx sans classe gardent exactement leurs symboles) ; un intervalle plus
+# large est représenté par son premier code, et Alphabet.canon ramène tout
+# code de l'intervalle à ce représentant. Pour "[a-z]+ing" : 7 intervalles
+# ([a-f] g h i [j-m] n [o-z]) au lieu de 26 transitions par position.
+
+MAX_CODE = 0x10FFFF
+
+
+def normalize(ranges) -> tuple:
+    """Intervalles quelconques → tuple trié d'intervalles disjoints et non contigus."""
+    out = []
+    for lo, hi in sorted(ranges):
+        if out and lo <= out[-1][1] + 1:
+            if hi > out[-1][1]:
+                out[-1] = (out[-1][0], hi)
+        else:
+            out.append((lo, hi))
+    return tuple(out)
+
+
+def complement(ranges) -> tuple:
+    """Complément dans [0, MAX_CODE] d'intervalles normalisés."""
+    out = []
+    lo = 0
+    for a, b in ranges:
+        if a > lo:
+            out.append((lo, a - 1))
+        lo = b + 1
+    if lo <= MAX_CODE:
+        out.append((lo, MAX_CODE))
+    return tuple(out)
+
+
+def width(ranges) -> int:
+    return sum(hi - lo + 1 for lo, hi in ranges)
+
+
+def chars(ranges):
+    """Caractères de la classe (à réserver aux petites classes, cf. width)."""
+    return [chr(code) for lo, hi in ranges for code in range(lo, hi + 1)]
+
+
+ANY = ((0, MAX_CODE),)          # '.' : une classe comme les autres dans les automates
+
+# classes prédéfinies (ASCII, comme grep en locale C)
+DIGIT = ((0x30, 0x39),)
+WORD = ((0x30, 0x39), (0x41, 0x5A), (0x5F, 0x5F), (0x61, 0x7A))
+SPACE = ((0x09, 0x0D), (0x20, 0x20))
+
+SHORTHANDS = {                  # \d \w \s et leurs négations \D \W \S
+    "d": DIGIT, "w": WORD, "s": SPACE,
+    "D": complement(DIGIT), "W": complement(WORD), "S": complement(SPACE),
+}
+
+POSIX_CLASSES = {               # [[:alpha:]] ...
+    "alpha": ((0x41, 0x5A), (0x61, 0x7A)),
+    "digit": DIGIT,
+    "alnum": ((0x30, 0x39), (0x41, 0x5A), (0x61, 0x7A)),
+    "upper": ((0x41, 0x5A),),
+    "lower": ((0x61, 0x7A),),
+    "space": SPACE,
+    "blank": ((0x09, 0x09), (0x20, 0x20)),
+    "punct": ((0x21, 0x2F), (0x3A, 0x40), (0x5B, 0x60), (0x7B, 0x7E)),
+    "xdigit": ((0x30, 0x39), (0x41, 0x46), (0x61, 0x66)),
+    "cntrl": ((0x00, 0x1F), (0x7F, 0x7F)),
+    "print": ((0x20, 0x7E),),
+    "graph": ((0x21, 0x7E),),
+}
+
+ESCAPES = {"t": "\t", "n": "\n", "r": "\r", "f": "\f", "v": "\v"}
+
+
+# ========= Intervalles élémentaires =========
+
+class Alphabet:
+    """
+    Intervalles élémentaires de plus d'un code d'une RegEx : wide[lo] = hi.
+    Les symboles des automates sont des codes ; canon(code) donne le symbole
+    qui porte les transitions de code (lo si code est dans [lo, hi], code sinon).
+    """
+
+    def __init__(self, leaf_ranges=()):
+        bounds = set()
+        for ranges in leaf_ranges:
+            for lo, hi in ranges:
+                bounds.add(lo)
+                bounds.add(hi + 1)
+        self.bounds = sorted(bounds)
+        wide = {}
+        for ranges in leaf_ranges:
+            for lo, hi in self._pieces(ranges):
+                if hi > lo:
+                    wide[lo] = hi
+        self._set_wide(wide)
+
+    @classmethod
+    def from_wide(cls, wide):
+        """Alphabet réduit aux intervalles larges (forme compilée, cache disque)."""
+        obj = cls.__new__(cls)
+        obj.bounds = []
+        obj._set_wide(wide)
+        return obj
+
+    def _set_wide(self, wide):
+        self.wide = dict(sorted(wide.items()))
+        self._los = list(self.wide)
+        self._his = list(self.wide.values())
+
+    def _pieces(self, ranges):
+        bounds = self.bounds
+        for lo, hi in ranges:
+            i = bisect_left(bounds, lo)
+            while i + 1 < len(bounds) and bounds[i] <= hi:
+                yield bounds[i], bounds[i + 1] - 1
+                i += 1
+
+    def symbols(self, ranges) -> list:
+        """Un symbole (premier code) par intervalle élémentaire couvert par ranges."""
+        return [lo for lo, _ in self._pieces(ranges)]
+
+    def canon(self, code: int) -> int:
+        i = bisect_right(self._los, code) - 1
+        if i >= 0 and code <= self._his[i]:
+            return self._los[i]
+        return code
+
+    def __str__(self):
+        return "Alphabet(" + ", ".join(f"{chr(lo)!r}-{chr(hi)!r}" for lo, hi in self.wide.items()) + ")"
+
+
+DENSE_CODES = 0x100         # codes développés un par un dans les tables de range_lookup (Latin-1)
+
+
+class _RangeTable(dict):
+    """Codes < DENSE_CODES tous présents ; au-delà, intervalles larges (bisect) puis défaut."""
+
+    def __missing__(self, code):
+        i = bisect_right(self.los, code) - 1
+        if i >= 0 and code <= self.his[i]:
+            return self.values[i]
+        return self.default
+
+
+def range_lookup(table: dict, alphabet, default=None):
+    """
+    Fonction code → table[code], étendue aux intervalles larges (un code de
+    [lo, hi] reçoit table[lo]), default pour les autres codes. Tous les codes
+    < DENSE_CODES sont copiés dans le dict : un texte ASCII/Latin-1 ne fait que
+    des accès dict[code] en C, jamais d'appel Python ; bisect seulement au-delà.
+    """
+    dense = _RangeTable(table)
+    dense.los, dense.his, dense.values = [], [], []
+    dense.default = default
+    wide = alphabet.wide.items() if alphabet is not None else ()
+    for lo, hi in wide:
+        if lo not in table:
+            continue
+        for code in range(lo, min(hi, DENSE_CODES - 1) + 1):
+            dense[code] = table[lo]
+        if hi >= DENSE_CODES:
+            dense.los.append(max(lo, DENSE_CODES))
+            dense.his.append(hi)
+            dense.values.append(table[lo])
+    for code in range(DENSE_CODES):
+        dense.setdefault(code, default)
+    return dense.__getitem__
+
+
+class _CanonTable(dict):
+    def __missing__(self, code):
+        return self.alphabet.canon(code)
+
+
+def canon_lookup(alphabet):
+    """Alphabet.canon avec une table dense sur Latin-1 (identité si alphabet est None)."""
+    if alphabet is None:
+        return lambda code: code
+    canon = _CanonTable((code, alphabet.canon(code)) for code in range(DENSE_CODES))
+    canon.alphabet = alphabet
+    return canon.__getitem__
+
+
+# --------- TESTS ----------
+if __name__ == "__main__":
+    lower = ((ord("a"), ord("z")),)
+    print("[^a-z] :", complement(lower)[:2], "...")
+    alphabet = Alphabet([lower, ((ord("i"), ord("i")),), ((ord("n"), ord("n")),), ((ord("g"), ord("g")),)])
+    print(alphabet)
+    print("symboles de [a-z] :", [chr(s) for s in alphabet.symbols(lower)])
+    print("canon :", {c: chr(alphabet.canon(ord(c))) for c in "akgz0"})
@@ -0,0 +1,285 @@
+import numpy as np
+
+from DFA import DFA, dfa_states
+from charclass import Alphabet, range_lookup, MAX_CODE
+
+# ========= DFA compilé (table dense + classes de caractères) =========
+#
+# - alphabet compressé en classes d'équivalence : deux symboles dont les
+#   colonnes de transitions sont identiques partagent la même classe ;
+# - classe 0 = colonne morte : codes sans symbole, et symboles qui ne mènent
+#   nulle part. Le joker '.' n'est pas un symbole (NFA.leaf_symbols le
+#   développe en intervalles), aucun code ne peut donc être pris pour '.' ;
+# - état 0 = état mort explicite (absorbant), les vrais états sont 1..n ;
+# - table[état, classe] = état suivant (tableau NumPy dense) ;
+# - un symbole qui représente un intervalle élémentaire d'une classe
+#   (charclass.py) donne sa classe à tout l'intervalle : ranges[lo] = hi,
+#   class_of(code) : accès direct sous 0x100, bisect sur les intervalles au-delà.
+
+DEAD = 0
+
+
+class CompiledDFA:
+    def __init__(self, dfa: DFA):
+        states = sorted(dfa_states(dfa) - {None})
+        sid = {s: i + 1 for i, s in enumerate(states)}
+        n = len(states) + 1
+
+        symbols = sorted({sym for trans in dfa.transitions.values() for sym in trans})
+
+        def column(sym):
+            col = [DEAD] * n
+            for s, trans in dfa.transitions.items():
+                dest = trans.get(sym)
+                if dest is not None:
+                    col[sid[s]] = sid[dest]
+            return tuple(col)
+
+        # classes d'équivalence : colonnes identiques → même classe
+        other = (DEAD,) * n
+        class_of_column = {other: 0}
+        columns = [other]
+        class_map = {}
+        for sym in symbols:
+            col = column(sym)
+            if col not in class_of_column:
+                class_of_column[col] = len(columns)
+                columns.append(col)
+            cls = class_of_column[col]
+            if cls != 0:
+                class_map[sym] = cls
+
+        table = np.array(columns, dtype=np.int32).T.copy()          # états × classes
+        accept = np.zeros(n, dtype=bool)
+        for s in dfa.final_states:
+            if s in sid:
+                accept[sid[s]] = True
+        alphabet = dfa.alphabet
+        ranges = {lo: hi for lo, hi in alphabet.wide.items() if lo in class_map} if alphabet else {}
+        self._setup(table, accept, sid.get(dfa.start, DEAD), class_map, ranges)
+
+    def _setup(self, table, accept, start, class_map, ranges=None):
+        self.class_map = class_map
+        self.ranges = ranges or {}                  # symbole → fin de son intervalle (classes)
+        self.alphabet = Alphabet.from_wide(self.ranges) if self.ranges else None
+        self.class_of = range_lookup(class_map, self.alphabet, 0)   # class_of(code)
+        self.n_states, self.n_classes = table.shape
+        self.table = table
+        self.accept = accept
+        self.start = start
+
+        # version listes Python pour la simulation caractère par caractère
+        self.rows = self.table.tolist()
+        self.finals = {i for i in range(self.n_states) if self.accept[i]}
+
+        # tables triées pour convertir des codes en classes de façon vectorisée
+        self._codes = np.array(sorted(self.class_map), dtype=np.int64)
+        self._classes = np.array([self.class_map[c] for c in sorted(self.class_map)], dtype=np.int32)
+        self._range_los = np.array(list(self.ranges), dtype=np.int64)
+        self._range_his = np.array(list(self.ranges.values()), dtype=np.int64)
+        self._range_classes = np.array([self.class_map[lo] for lo in self.ranges], dtype=np.int32)
+        self._byte_classes = None
+
+    def byte_classes(self):
+        """
+        Table de 256 octets code → classe pour bytes.translate (textes ASCII/latin-1),
+        ou None si plus de 256 classes. line.encode("latin-1").translate(table)
+        donne les classes de toute la ligne en un appel C.
+        """
+        if self._byte_classes is None and self.n_classes <= 256:
+            self._byte_classes = bytes(self.class_of(code) for code in range(256))
+        return self._byte_classes
+
+    @classmethod
+    def from_arrays(cls, table, accept, start: int, class_map, ranges=None):
+        """Reconstruit la forme compilée à partir de ses tableaux (cf. dfa_store.py)."""
+        obj = cls.__new__(cls)
+        obj._setup(table, accept, start, class_map, ranges)
+        return obj
+
+    @staticmethod
+    def of(dfa):
+        """
+        Version compilée d'un DFA (mise en cache sur l'objet). Un automate déjà
+        exécutable (CompiledDFA, LazyDFA) est renvoyé tel quel.
+        """
+        if not isinstance(dfa, DFA):
+            return dfa
+        compiled = getattr(dfa, "_compiled", None)
+        if compiled is None:
+            compiled = CompiledDFA(dfa)
+            dfa._compiled = compiled
+        return compiled
+
+    def __str__(self):
+        return (f"CompiledDFA: {self.n_states - 1} états (+ mort), "
+                f"{self.n_classes} classes, start={self.start}, finals={sorted(self.finals)}")
+
+    def to_dfa(self) -> DFA:
+        """
+        DFA équivalent (états 1..n-1, état mort 0 seulement s'il est nécessaire) :
+        une transition par symbole qui ne mène pas à l'état mort.
+        """
+        dfa = DFA()
+        dfa.start = self.start
+        dfa.final_states = set(self.finals)
+        dfa.alphabet = self.alphabet
+        for s in range(1, self.n_states):
+            row = self.rows[s]
+            for sym, cls in self.class_map.items():
+                if row[cls] != DEAD:
+                    dfa.add_transition(s, sym, row[cls])
+        return dfa
+
+    def canonical_key(self):
+        """
+        Forme canonique (cf. automaton_cache) : classes de symboles triées,
+        états renumérotés en largeur depuis l'état initial, mort = -1.
+        Deux DFA minimaux du même langage ont la même clé.
+        Un symbole est l'intervalle (lo, hi) qu'il représente.
+        """
+        members = {}
+        for sym, cls in self.class_map.items():
+            members.setdefault(cls, []).append((sym, self.ranges.get(sym, sym)))
+        order_cls = [0] + sorted(members, key=lambda c: min(members[c]))
+        labels = tuple(tuple(sorted(members.get(c, ()))) for c in order_cls)
+
+        order = {DEAD: -1}
+        if self.start != DEAD:
+            order[self.start] = 0
+        queue = [self.start] if self.start != DEAD else []
+        rows = []
+        for state in queue:                       # la file grandit pendant le parcours
+            row = []
+            for c in order_cls:
+                dest = self.rows[state][c]
+                if dest not in order:
+                    order[dest] = len(order) - 1
+                    queue.append(dest)
+                row.append(order[dest])
+            rows.append((state in self.finals, tuple(row)))
+        return labels, tuple(rows)
+
+    def start_loops_on_any(self) -> bool:
+        """
+        L'état initial boucle sur "tout autre caractère" (RegEx du type ".*x") ?
+        MAX_CODE n'est cité par aucune RegEx réelle : sa classe est celle des
+        caractères que la RegEx ne distingue pas (classe 0 sans '.').
+        """
+        return self.start != DEAD and self.rows[self.start][self.class_of(MAX_CODE)] == self.start
+
+    # ----- simulation scalaire -----
+
+    def step(self, state: int, ch: str) -> int:
+        return self.rows[state][self.class_of(ord(ch))]
+
+    def is_final(self, state: int) -> bool:
+        return state in self.finals
+
+    def match(self, word: str) -> bool:
+        rows, class_of = self.rows, self.class_of
+        state = self.start
+        for ch in word:
+            state = rows[state][class_of(ord(ch))]
+            if state == DEAD:
+                return False
+        return state in self.finals
+
+    # ----- simulation par lots -----
+
+    def classes_of(self, codes: np.ndarray) -> np.ndarray:
+        """Codes Unicode (tableau quelconque) → classes."""
+        if len(self._codes) == 0:
+            return np.zeros(codes.shape, dtype=np.int32)
+        idx = np.searchsorted(self._codes, codes)
+        idx = np.minimum(idx, len(self._codes) - 1)
+        classes = np.where(self._codes[idx] == codes, self._classes[idx], 0).astype(np.int32)
+        if len(self._range_los):
+            # codes à l'intérieur d'un intervalle : classe de son premier code
+            idx = np.searchsorted(self._range_los, codes, side="right") - 1
+            inside = (idx >= 0) & (codes <= self._range_his[np.maximum(idx, 0)])
+            classes = np.where(inside, self._range_classes[np.maximum(idx, 0)], classes)
+        return classes
+
+    def match_codes(self, codes: np.ndarray) -> np.ndarray:
+        """
+        codes : matrice (n_mots × L) de codes Unicode, tous les mots de longueur L.
+        On avance les n états en parallèle, une colonne à la fois.
+        """
+        classes = self.classes_of(codes)
+        state = np.full(codes.shape[0], self.start, dtype=np.int32)
+        for j in range(codes.shape[1]):
+            state = self.table[state, classes[:, j]]
+            if not state.any():
+                break
+        return self.accept[state]
+
+    def match_batch(self, matrix: "VocabularyMatrix"):
+        """Ids (dans matrix.terms) des mots acceptés."""
+        matched = []
+        for length, (ids, codes) in matrix.buckets.items():
+            if length == 0:
+                if self.accept[self.start]:
+                    matched.append(ids)
+                continue
+            matched.append(ids[self.match_codes(codes)])
+        if not matched:
+            return np.zeros(0, dtype=np.int64)
+        return np.sort(np.concatenate(matched))
+
+
+class VocabularyMatrix:
+    """
+    Vocabulaire empaqueté pour la simulation par lots : les mots sont groupés
+    par longueur L, chaque groupe est une matrice (n × L) de codes Unicode
+    (pas de padding à gérer, tous les mots d'un groupe finissent ensemble).
+    """
+
+    _last = None
+
+    def __init__(self, terms):
+        self.terms = terms
+        by_len = {}
+        for tid, term in enumerate(terms):
+            by_len.setdefault(len(term), []).append(tid)
+
+        self.buckets = {}
+        for length, ids in sorted(by_len.items()):
+            codes = np.zeros((len(ids), length), dtype=np.int64)
+            for row, tid in enumerate(ids):
+                codes[row] = [ord(c) for c in terms[tid]]
+            self.buckets[length] = (np.array(ids, dtype=np.int64), codes)
+
+    @classmethod
+    def for_terms(cls, terms):
+        """Une seule matrice par vocabulaire (construite au premier appel)."""
+        if cls._last is None or cls._last.terms is not terms:
+            cls._last = cls(terms)
+        return cls._last
+
+
+if __name__ == "__main__":
+    from NFA import regex_to_nfa
+    from DFA import nfa_to_dfa, minimize_dfa_hopcroft
+
+    # ".*ing" : 'i', 'n', 'g' ont chacun leur classe, les intervalles entre eux en partagent une
+    dfa = minimize_dfa_hopcroft(nfa_to_dfa(regex_to_nfa(".*ing")))
+    cdfa = CompiledDFA.of(dfa)
+    print(cdfa)
+    print(cdfa.table)
+
+    words = ["king", "sing", "ing", "kin", "ring", "inga", "ഇing"]
+    print({w: cdfa.match(w) for w in words})
+
+    matrix = VocabularyMatrix(sorted(words))
+    print("batch :", [matrix.terms[i] for i in cdfa.match_batch(matrix)])
+
+    # "[a-z]+ing" : les lettres de [a-z] hors i, n, g partagent une classe (intervalles [a-f] [j-m] [o-z])
+    cdfa = CompiledDFA.of(minimize_dfa_hopcroft(nfa_to_dfa(regex_to_nfa("[a-z]+ing", method="glushkov"))))
+    print(cdfa, cdfa.ranges)
+    print({w: cdfa.match(w) for w in words}, "batch :", [matrix.terms[i] for i in cdfa.match_batch(matrix)])
+
+    # 'ഇ' (U+0D07, l'ancienne valeur de DOT) n'est qu'un caractère, pas '.', même comme borne de classe
+    for pattern in ["ഇ", "\\ഇ", "[ഇa]", "[ഇ-ഐ]"]:
+        cdfa = CompiledDFA.of(minimize_dfa_hopcroft(nfa_to_dfa(regex_to_nfa(pattern))))
+        print(f"{pattern!r:10}", {w: cdfa.match(w) for w in ["ഇ", "ഐ", "a", "x"]})
@@ -0,0 +1,178 @@
+import hashlib
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from NFA import regex_to_nfa
+from DFA import nfa_to_dfa, minimize_dfa_hopcroft, dfa_states
+from compiled_dfa import CompiledDFA
+
+# ========= Cache disque des DFA minimaux compilés =========
+#
+# Un fichier par (RegEx, méthode NFA, version du compilateur), nommé par le
+# SHA-256 de ces trois valeurs : deux processus qui compilent la même RegEx
+# partagent le même fichier, et un changement du compilateur invalide tout.
+#
+# Format (little-endian) :
+#   en-tête   : magic "DAARDFA\0", version du format, n_states, n_classes,
+#               start, n_symbols, nfa_states, raw_states, min_states
+#   class map : n_symbols codes (uint32, triés), n_symbols classes (int32), puis
+#               n_symbols fins d'intervalle (uint32, = le code pour un caractère seul)
+#   accept    : n_states octets (0/1), complété à un multiple de 4
+#   table     : n_states × n_classes transitions (int32, ligne par ligne)
+# Les tableaux sont lus directement dans le fichier mappé (mmap), sans copie.
+
+MAGIC = b"DAARDFA\0"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<8s8I")
+
+# à incrémenter dès que Parser / NFA / DFA / compiled_dfa changent le DFA produit
+COMPILER_VERSION = "glushkov-bitset-hopcroft-classes-ranges-nodot-1"
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("DAAR_DFA_CACHE_DIR", os.path.join(BASE_DIR, "dfa_cache"))
+# DAAR_DFA_CACHE=0 : toujours recompiler, ne rien écrire
+ENABLED = os.environ.get("DAAR_DFA_CACHE", "1") != "0"
+
+
+class StoredDFA:
+    """DFA minimal compilé + tailles des étapes de compilation (pour les profils)."""
+    __slots__ = ("compiled", "nfa_states", "raw_states", "min_states", "from_cache")
+
+    def __init__(self, compiled, nfa_states, raw_states, min_states, from_cache):
+        self.compiled = compiled
+        self.nfa_states = nfa_states
+        self.raw_states = raw_states
+        self.min_states = min_states
+        self.from_cache = from_cache
+
+
+def cache_path(pattern: str, method: str, cache_dir: str = None) -> str:
+    key = "\0".join((COMPILER_VERSION, method, pattern)).encode("utf-8", "surrogatepass")
+    digest = hashlib.sha256(key).hexdigest()
+    return os.path.join(cache_dir or CACHE_DIR, digest[:2], digest + ".dfa")
+
+
+# ---------- écriture ----------
+
+def save(path: str, stored: StoredDFA):
+    cdfa = stored.compiled
+    codes = sorted(cdfa.class_map)
+    accept = np.asarray(cdfa.accept, dtype=np.uint8).tobytes()
+    accept += b"\0" * (-len(accept) % 4)
+    parts = [
+        HEADER.pack(MAGIC, FORMAT_VERSION, cdfa.n_states, cdfa.n_classes, cdfa.start,
+                    len(codes), stored.nfa_states, stored.raw_states, stored.min_states),
+        np.array(codes, dtype="<u4").tobytes(),
+        np.array([cdfa.class_map[c] for c in codes], dtype="<i4").tobytes(),
+        np.array([cdfa.ranges.get(c, c) for c in codes], dtype="<u4").tobytes(),
+        accept,
+        np.ascontiguousarray(cdfa.table, dtype="<i4").tobytes(),
+    ]
+    # écriture atomique : un lecteur concurrent voit l'ancien fichier ou le nouveau, jamais un morceau
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        for part in parts:
+            f.write(part)
+    os.replace(tmp, path)
+
+
+# ---------- lecture ----------
+
+def load(path: str):
+    """StoredDFA lu par mmap, ou None si le fichier est absent, tronqué ou d'un autre format."""
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):                   # absent, ou fichier vide
+        return None
+    if len(mm) < HEADER.size:
+        return None
+    magic, version, n_states, n_classes, start, n_symbols, nfa_states, raw_states, min_states = \
+        HEADER.unpack_from(mm, 0)
+    accept_size = n_states + (-n_states % 4)
+    expected = HEADER.size + 12 * n_symbols + accept_size + 4 * n_states * n_classes
+    if magic != MAGIC or version != FORMAT_VERSION or len(mm) != expected:
+        return None
+
+    offset = HEADER.size
+    codes = np.frombuffer(mm, dtype="<u4", count=n_symbols, offset=offset)
+    offset += 4 * n_symbols
+    classes = np.frombuffer(mm, dtype="<i4", count=n_symbols, offset=offset)
+    offset += 4 * n_symbols
+    range_ends = np.frombuffer(mm, dtype="<u4", count=n_symbols, offset=offset)
+    offset += 4 * n_symbols
+    accept = np.frombuffer(mm, dtype=np.uint8, count=n_states, offset=offset).astype(bool)
+    offset += accept_size
+    table = np.frombuffer(mm, dtype="<i4", count=n_states * n_classes, offset=offset)
+    table = table.reshape(n_states, n_classes)
+
+    class_map = dict(zip(codes.tolist(), classes.tolist()))
+    ranges = {lo: hi for lo, hi in zip(codes.tolist(), range_ends.tolist()) if hi != lo}
+    compiled = CompiledDFA.from_arrays(table, accept, start, class_map, ranges)
+    return StoredDFA(compiled, nfa_states, raw_states, min_states, True)
+
+
+# ---------- point d'entrée ----------
+
+def compile_min_dfa(pattern: str, method: str = "thompson", max_states: int = None) -> StoredDFA:
+    """RegEx → NFA → DFA → DFA minimal → forme compilée (sans passer par le cache)."""
+    nfa = regex_to_nfa(pattern, method=method)
+    dfa = nfa_to_dfa(nfa, max_states=max_states)        # peut lever DFATooLarge
+    min_dfa = minimize_dfa_hopcroft(dfa)
+    compiled = CompiledDFA.of(min_dfa)
+    return StoredDFA(compiled, nfa.count_id, len(dfa_states(dfa)), len(dfa_states(min_dfa)), False)
+
+
+def lookup(pattern: str, method: str = "thompson", max_states: int = None,
+           cache_dir: str = None):
+    """
+    DFA du cache disque, ou None (absent, cache désactivé, ou enregistré avec
+    plus de max_states états avant minimisation : il aurait dû exploser).
+    """
+    if not ENABLED:
+        return None
+    stored = load(cache_path(pattern, method, cache_dir))
+    if stored is not None and max_states is not None and stored.raw_states > max_states:
+        return None
+    return stored
+
+
+def remember(pattern: str, method: str, stored: StoredDFA, cache_dir: str = None):
+    if not ENABLED:
+        return
+    try:
+        save(cache_path(pattern, method, cache_dir), stored)
+    except OSError:
+        pass                                        # cache en lecture seule : on recompilera
+
+
+def load_or_compile(pattern: str, method: str = "thompson", max_states: int = None,
+                    cache_dir: str = None) -> StoredDFA:
+    """DFA minimal compilé de la RegEx : cache disque, sinon compilation + enregistrement."""
+    stored = lookup(pattern, method, max_states, cache_dir)
+    if stored is None:
+        stored = compile_min_dfa(pattern, method, max_states)
+        remember(pattern, method, stored, cache_dir)
+    return stored
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    pattern = "(" + "|".join(f"mot{i:03d}" for i in range(300)) + ")"
+    with tempfile.TemporaryDirectory() as tmp:
+        for attempt in ("compilation", "cache disque"):
+            t0 = time.perf_counter()
+            stored = load_or_compile(pattern, "glushkov", cache_dir=tmp)
+            elapsed = (time.perf_counter() - t0) * 1000
+            print(f"{attempt:12} : {elapsed:8.2f} ms  from_cache={stored.from_cache}  {stored.compiled}")
+        print("mot042 →", stored.compiled.match("mot042"), "| mot42 →", stored.compiled.match("mot42"))
+        # classes : les intervalles des symboles sont relus avec le DFA
+        load_or_compile("[a-z]+[0-9]{2}", "glushkov", cache_dir=tmp)
+        stored = load(cache_path("[a-z]+[0-9]{2}", "glushkov", tmp))
+        print(stored.compiled, stored.compiled.ranges, "| mot42 →", stored.compiled.match("mot42"))
@@ -1,18 +1,17 @@
 from graphviz import Digraph
 
-from Parser import DOT, parse
+from Parser import parse
 from NFA import regex_to_nfa, EPS
 from DFA import nfa_to_dfa, minimize_dfa_hopcroft, DFA
+from dfa_store import load_or_compile, cache_path
 
 def label_from_nfa_symbol(sym_key: int | None) -> str:
     if sym_key is EPS:
         return "ε"
-    if sym_key == DOT:
-        return "."
     return chr(sym_key)
 
 def label_from_dfa_symbol(sym_key: int) -> str:
-    return "." if sym_key == DOT else chr(sym_key)
+    return chr(sym_key)
 
 def draw_nfa(nfa, filename: str = "nfa"):
     dot = Digraph(format="png")
@@ -20,14 +19,14 @@ def draw_nfa(nfa, filename: str = "nfa"):
     dot.attr("node", shape="circle")
     dot.node("_start", label="", shape="point")  # flèche d'init
 
-    nodes = {nfa.start, nfa.end}
+    nodes = {nfa.start} | nfa.finals
     for s, outs in nfa.transitions.items():
         nodes.add(s)
         for dests in outs.values():
             nodes.update(dests)
 
     for s in sorted(nodes):
-        shape = "doublecircle" if s == nfa.end else "circle"
+        shape = "doublecircle" if s in nfa.finals else "circle"
         dot.node(str(s), shape=shape)
 
     dot.edge("_start", str(nfa.start))
@@ -83,8 +82,11 @@ if __name__ == "__main__":
     print(dfa_before)
     draw_dfa(dfa_before, "dfa_before", title="DFA avant minimisation")
 
-    # 3) Minimisation du DFA (Hopcroft)
-    dfa_after = minimize_dfa_hopcroft(dfa_before)
+    # 3) Minimisation du DFA (Hopcroft), ou DFA minimal déjà dans le cache disque
+    stored = load_or_compile(regex)
+    dfa_after = stored.compiled.to_dfa()
+    if stored.from_cache:
+        print(f"[cache] DFA minimal lu dans {cache_path(regex, 'thompson')}")
     print("===== DFA APRÈS MINIMISATION =====")
     print(dfa_after)
     draw_dfa(dfa_after, "dfa_after", title="DFA après minimisation")
@@ -1,22 +1,51 @@
+import os
 import sys
+import stat
 import time
+import argparse
 import subprocess
 from KMP import *
 from DFA import *
 from matching import *
 from NFA import *
 from Parser import *
+from bitparallel import BitParallelMatcher, choose_engine
+from AhoCorasick import AhoCorasick, literal_alternatives
+from bytescan import ByteScanner
+from match_output import MatchWriter
+from parallel_scan import build_scanner, parallel_count, parallel_search, search_tree, stream_count, stream_search
+from BMH import literal_matcher, choose_literal_engine
 
 
-def egrep(regEx, file):
+def egrep(regEx, file, bench=False):
     """
-    Version Python de egrep :
-    - Si l'expression est une concaténation simple => utilise KMP
+    Version Python de egrep (moteur choisi par choose_engine) :
+    - Si l'expression est une concaténation simple => KMP, ou BMH si le motif est
+      assez long et varié pour sauter des caractères (choose_literal_engine)
+    - Si c'est une alternative de littéraux => Aho–Corasick (tous les mots en une passe)
+    - Si une branche est ancrée ('^', '$') => automates lancés depuis le bord de la ligne (AnchoredSearcher)
+    - Si elle a au plus 64 symboles => simulation bit-parallèle de l'automate de Glushkov
     - Sinon => test via les automates (NFA/DFA)
+
+    Le fichier est parcouru en octets (mmap) : seules les lignes qui contiennent
+    un facteur obligatoire de la RegEx passent dans le moteur (cf. bytescan.py).
+
+    bench=True : la RegEx passe aussi par le DFA non minimisé, pour comparer les
+    temps (egrep.py --bench) ; sinon le fichier n'est parcouru qu'une fois.
     """
-    if isitconcatenated(regEx):
-        kmp = KMP(regEx)
-        return kmp.search_in_file(file)
+    engine = choose_engine(regEx)
+    if engine == "kmp":
+        literal = literal_alternatives(regEx)[0]
+        return ByteScanner(regEx, literal_matcher(literal), literal=literal).search_in_file(file)
+    elif engine == "aho":
+        words = literal_alternatives(regEx)
+        return ByteScanner(regEx, AhoCorasick(words), literals=words).search_in_file(file)
+    elif engine == "anchored":
+        return ByteScanner(regEx, AnchoredSearcher(regEx)).search_in_file(file)
+    elif engine == "bitparallel":
+        return ByteScanner(regEx, BitParallelMatcher(regEx)).search_in_file(file)
+    elif not bench:
+        return match_dfa_in_file(DFASearcher(regEx), file)
     else:
         # Test avec minimisation
         print("\n--- Test avec minimisation du DFA ---")
@@ -63,19 +92,19 @@ def test_real_egrep(regEx, file):
     return bool(proc.stdout.strip()), elapsed
 
 
-def run_python_egrep(regEx, filepath):
+def run_python_egrep(regEx, filepath, bench=False):
     """
-    Lance la version Python seule et mesure les temps avec/sans minimisation.
+    Lance la version Python seule et mesure son temps (avec/sans minimisation si bench).
     """
     start_time = time.perf_counter()
-    result = egrep(regEx, filepath)
+    result = egrep(regEx, filepath, bench)
     elapsed_total = time.perf_counter() - start_time
 
     print("\n--- Résultats egrep (Python) ---")
     if isinstance(result, tuple):
         found, time_min, time_no_min = result
     else:
-        # Cas KMP
+        # Cas KMP / Aho–Corasick / bit-parallèle, ou DFA sans --bench
         found = result
         time_min = time_no_min = None
 
@@ -92,44 +121,27 @@ def run_python_egrep(regEx, filepath):
         print(f"→ Sans minimisation : {time_no_min:.6f} s")
         print("===============================")
     else:
-        print(f"\nTemps d'exécution (KMP) : {elapsed_total:.6f} secondes")
+        engine = choose_engine(regEx)
+        if engine == "kmp":
+            engine = choose_literal_engine(literal_alternatives(regEx)[0])
+        engine = {"kmp": "KMP", "bmh": "BMH", "aho": "Aho–Corasick", "anchored": "ancré",
+                  "dfa": "DFA minimal"}.get(engine, "bit-parallèle")
+        print(f"\nTemps d'exécution ({engine}) : {elapsed_total:.6f} secondes")
 
     return found, (time_min, time_no_min)
 
 
-if __name__ == "__main__":
+def legacy_main(option, regEx, filepath):
     """
-    Utilisation :
-      python3 egrep.py <option> <RegEx> <file>
-
-    <option> :
-      1 → lancer seulement egrep Python
-      2 → lancer egrep Python + grep -E (comparaison)
-
-    Exemples :
-      python3 egrep.py 1 "S(a|g|r)+on" 56667-0.txt
-      python3 egrep.py 2 "Sargon" 56667-0.txt
+    Ancienne interface : python3 egrep.py <1|2> <RegEx> <file>.
+    L'option 2 est celle de --bench (avec/sans minimisation, puis grep -E).
     """
-    if len(sys.argv) != 4:
-        print("Usage: python3 egrep.py <option> <RegEx> <file>")
-        print("  <option> : 1 = egrep Python seul, 2 = comparaison avec grep -E")
-        sys.exit(1)
-
-    try:
-        option = int(sys.argv[1])
-    except ValueError:
-        print("Erreur : l'option doit être 1 ou 2.")
-        sys.exit(1)
-
-    regEx = sys.argv[2]
-    filepath = sys.argv[3]
-
     try:
         if option == 1:
             run_python_egrep(regEx, filepath)
 
         elif option == 2:
-            found, (time_min, time_no_min) = run_python_egrep(regEx, filepath)
+            found, (time_min, time_no_min) = run_python_egrep(regEx, filepath, bench=True)
             print("\n===============================")
             print("Comparaison avec grep -E :")
             _, time_sys = test_real_egrep(regEx, filepath)
@@ -139,11 +151,222 @@ if __name__ == "__main__":
                 print(f"→ Temps egrep (Python) sans minimisation : {time_no_min:.6f} s")
             print(f"→ Temps grep -E (système) : {time_sys:.6f} s\n")
 
-        else:
-            print("Erreur : option invalide. Choisis 1 ou 2.")
-            sys.exit(1)
-
     except FileNotFoundError:
         print(f"Erreur : fichier '{filepath}' introuvable.")
     except Exception as e:
         print(f"Erreur : {e}")
+
+
+def main(argv=None):
+    """
+    Utilisation :
+      python3 egrep.py [-j N] [-l | -c | -o] [-q] [-m N] <RegEx> <file>
+      python3 egrep.py -r [-j N] [-l | -c | -o] [-q] [-m N] <RegEx> <dir>
+      cat *.txt | python3 egrep.py [-l | -c | -o] [-q] [-m N] <RegEx> [-]
+      python3 egrep.py --bench <RegEx> <file>      (temps avec/sans minimisation, grep -E)
+      python3 egrep.py <1|2> <RegEx> <file>        (ancienne interface)
+
+    Code de sortie comme grep : 0 si au moins une ligne matche, 1 sinon, 2 en cas d'erreur.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) == 3 and argv[0] in ("1", "2"):
+        legacy_main(int(argv[0]), argv[1], argv[2])
+        return 0
+
+    parser = argparse.ArgumentParser(
+        description="Clone de egrep : affiche les matchs de la RegEx dans le fichier."
+    )
+    parser.add_argument(
+        "pattern",
+        help="RegEx : lettres, '.', '*', '+', '?', '|', parenthèses, classes [a-z] [^0-9] [[:alpha:]], "
+             "{m,n}, '^' / '$' aux bords, échappements \\. \\d \\w \\s"
+    )
+    parser.add_argument(
+        "file",
+        nargs="?",
+        default=None,
+        help="Fichier texte à parcourir (répertoire avec -r) ; '-' ou absent : entrée standard "
+             "(répertoire courant avec -r)"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=None,
+        help="Nombre de processus (morceaux du fichier, ou fichiers avec -r) ; "
+             "0 = un par coeur. Par défaut 1, ou un par coeur avec -r."
+    )
+    parser.add_argument(
+        "-r", "--recursive",
+        action="store_true",
+        help="Parcourt tous les fichiers du répertoire (et de ses sous-répertoires)."
+    )
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument(
+        "-l", "--files-with-matches",
+        action="store_true",
+        help="Affiche seulement le nom des fichiers qui contiennent un match."
+    )
+    output.add_argument(
+        "-c", "--count",
+        action="store_true",
+        help="Affiche le nombre de lignes avec match de chaque fichier."
+    )
+    output.add_argument(
+        "-o", "--only-matching",
+        action="store_true",
+        help="Affiche seulement le texte de chaque match, un par ligne."
+    )
+    parser.add_argument(
+        "-q", "--quiet",
+        action="store_true",
+        help="N'affiche rien, s'arrête au premier match (code de sortie seulement)."
+    )
+    parser.add_argument(
+        "-m", "--max-count",
+        type=int,
+        default=None,
+        help="S'arrête après N lignes avec match (par fichier avec -r)."
+    )
+    parser.add_argument(
+        "--bench",
+        action="store_true",
+        help="Mesure les temps : DFA avec et sans minimisation, puis grep -E (deux passages)."
+    )
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        # le fichier est parcouru plusieurs fois : pas de flux ni de répertoire
+        if args.recursive or args.file is None or is_stream(args.file):
+            parser.error("--bench demande un fichier ordinaire (pas d'entrée standard, de tube ni de -r)")
+        legacy_main(2, args.pattern, args.file)
+        return 0
+
+    try:
+        scanner = build_scanner(args.pattern)
+    except SyntaxError as e:
+        print(f"Erreur : RegEx invalide : {e}", file=sys.stderr)
+        return 2
+
+    max_lines = 1 if args.quiet or args.files_with_matches else args.max_count
+    if args.recursive:
+        jobs = 0 if args.jobs is None else args.jobs
+        if args.file is None:
+            args.file = "."
+        return search_directory(scanner, args, jobs, max_lines)
+    if args.file is None:
+        args.file = "-"
+    if is_stream(args.file):
+        return search_stream(scanner, args, max_lines)
+
+    try:
+        if args.count or args.files_with_matches or args.quiet:
+            # aucun match formaté : on ne compte que les lignes
+            count = parallel_count(scanner, args.file, args.jobs or 1, max_lines)
+            if args.quiet:
+                pass
+            elif args.count:
+                print(count)
+            elif count:
+                print(args.file)
+            return 0 if count else 1
+
+        found = False
+        with MatchWriter(only_matching=args.only_matching) as writer:
+            for record in parallel_search(scanner, args.file, args.jobs or 1, max_lines):
+                found = True
+                writer.write(record)
+    except FileNotFoundError:
+        print(f"Erreur : fichier '{args.file}' introuvable.", file=sys.stderr)
+        return 2
+    return 0 if found else 1
+
+
+def is_stream(path):
+    """Entrée à lire par morceaux : '-' (entrée standard), tube nommé, périphérique."""
+    if path == "-":
+        return True
+    try:
+        mode = os.stat(path).st_mode
+    except OSError:
+        return False                            # l'erreur sera signalée à l'ouverture
+    return stat.S_ISFIFO(mode) or stat.S_ISCHR(mode)
+
+
+def search_stream(scanner, args, max_lines):
+    """egrep sur un flux : lu par morceaux en mémoire bornée, dans ce processus (-j sans effet)."""
+    name = "(entrée standard)" if args.file == "-" else args.file
+    try:
+        stream = sys.stdin.buffer if args.file == "-" else open(args.file, "rb")
+    except OSError as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 2
+    try:
+        if args.count or args.files_with_matches or args.quiet:
+            count = stream_count(scanner, stream, max_lines)
+            if args.quiet:
+                pass
+            elif args.count:
+                print(count)
+            elif count:
+                print(name)
+            return 0 if count else 1
+
+        found = False
+        with MatchWriter(only_matching=args.only_matching) as writer:
+            for record in stream_search(scanner, stream, max_lines):
+                found = True
+                writer.write(record)
+        return 0 if found else 1
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+
+
+def search_directory(scanner, args, jobs, max_lines):
+    """egrep -r : un fichier par tâche, chaque fichier affiché dès qu'il est fini."""
+    if not os.path.exists(args.file):
+        print(f"Erreur : répertoire '{args.file}' introuvable.", file=sys.stderr)
+        return 2
+    found = False
+    error = False
+    count_only = args.count or args.files_with_matches or args.quiet
+    results = search_tree(scanner, args.file, jobs, max_lines, count_only=count_only)
+    writer = MatchWriter(only_matching=args.only_matching)
+    try:
+        for path, matches, message in results:
+            if message is not None:
+                writer.flush()                      # l'erreur après les fichiers déjà affichés
+                print(f"Erreur : {message}", file=sys.stderr)
+                error = True
+                continue
+            if matches:
+                found = True
+            if args.quiet:
+                if found:
+                    break
+            elif args.count:
+                writer.write_text(f"{path}:{matches}")
+            elif args.files_with_matches:
+                if matches:
+                    writer.write_text(path)
+            else:
+                for record in matches:
+                    writer.write(record, filename=path)
+    finally:
+        writer.flush()
+        results.close()
+    if found and args.quiet:
+        return 0
+    if error:
+        return 2
+    return 0 if found else 1
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except BrokenPipeError:
+        # sortie fermée avant la fin (ex: egrep ... | head) : on s'arrête comme grep,
+        # sans trace ; stdout redirigé vers /dev/null pour le flush de sortie
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
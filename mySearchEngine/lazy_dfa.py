@@ -0,0 +1,180 @@
+from typing import Dict, FrozenSet
+
+from NFA import NFA, EPS, regex_to_nfa
+from charclass import canon_lookup
+
+# ========= DFA paresseux (construction à la volée, style RE2) =========
+#
+# Au lieu de déterminiser tout le NFA d'avance (explosion exponentielle pour
+# "(a|b)*a(a|b)(a|b)(a|b)(a|b)(a|b)(a|b)"), on ne crée un état du DFA (= un
+# ensemble d'états du NFA) que lorsque l'entrée y arrive :
+#   - les états créés sont gardés dans un cache borné (max_states) ;
+#   - cache plein → on le vide entièrement (flush) et on continue ;
+#   - si les flush s'enchaînent sans avoir servi (cache qui "thrashe"),
+#     on abandonne le cache et on simule directement le NFA (Pike VM).
+# Mémoire bornée par max_states, coût par caractère borné par la taille du NFA.
+
+OTHER = -1                  # clé de transition pour "tout caractère hors alphabet"
+MIN_STEPS_PER_STATE = 10    # un flush est "rentable" s'il a servi au moins 10 pas par état
+MAX_BAD_FLUSHES = 3         # nb de flush non rentables avant de passer en Pike VM
+
+
+# ---------- Simulation du NFA (Pike VM) ----------
+
+class PikeVM:
+    """
+    Simulation par ensembles d'états du NFA de Thompson : tous les "threads"
+    avancent ensemble d'un caractère. Pas de capture ici (on ne veut que
+    savoir si le mot est accepté), donc l'ordre des threads n'importe pas.
+    """
+
+    def __init__(self, nfa: NFA):
+        self.nfa = nfa
+        self.alphabet = {sym for trans in nfa.transitions.values()
+                         for sym in trans if sym is not EPS}
+        # classes et '.' : un code est ramené au symbole de son intervalle (cf. charclass.py)
+        self.symbol = canon_lookup(nfa.alphabet)
+        self.closures: Dict[int, FrozenSet[int]] = {}
+        self.start = self.closure_of({nfa.start})
+
+    def _closure(self, state: int) -> FrozenSet[int]:
+        cached = self.closures.get(state)
+        if cached is not None:
+            return cached
+        seen = {state}
+        stack = [state]
+        while stack:
+            s = stack.pop()
+            for t in self.nfa.transitions.get(s, {}).get(EPS, ()):
+                if t not in seen:
+                    seen.add(t)
+                    stack.append(t)
+        cached = frozenset(seen)
+        self.closures[state] = cached
+        return cached
+
+    def closure_of(self, states) -> FrozenSet[int]:
+        out = set()
+        for s in states:
+            out |= self._closure(s)
+        return frozenset(out)
+
+    def step_set(self, states: FrozenSet[int], code: int) -> FrozenSet[int]:
+        """Ensemble (ε-fermé) atteint depuis states en lisant le symbole code (cf. symbol)."""
+        out = set()
+        transitions = self.nfa.transitions
+        for s in states:
+            trans = transitions.get(s)
+            if not trans:
+                continue
+            for t in trans.get(code, ()):
+                out |= self._closure(t)
+        return frozenset(out)
+
+    def is_final(self, states) -> bool:
+        return not self.nfa.finals.isdisjoint(states)
+
+    def match(self, word: str) -> bool:
+        states = self.start
+        symbol = self.symbol
+        for ch in word:
+            states = self.step_set(states, symbol(ord(ch)))
+            if not states:
+                return False
+        return self.is_final(states)
+
+
+# ---------- DFA paresseux ----------
+
+class LazyState:
+    __slots__ = ("nfa_states", "final", "next")
+
+    def __init__(self, nfa_states: FrozenSet[int], final: bool):
+        self.nfa_states = nfa_states
+        self.final = final
+        self.next = {}          # code (ou OTHER) → LazyState | None (mort)
+
+
+class LazyDFA:
+    """
+    Même interface d'exécution que CompiledDFA : start, step(état, ch),
+    is_final(état), match(mot). L'état mort est None.
+    """
+
+    def __init__(self, nfa: NFA, max_states: int = 2000):
+        self.vm = PikeVM(nfa)
+        self.max_states = max_states
+        self.cache: Dict[FrozenSet[int], LazyState] = {}
+        self.flushes = 0
+        self.bad_flushes = 0
+        self.steps_since_flush = 0
+        self.thrashing = False
+        self.start = self._state(self.vm.start)
+
+    def _state(self, nfa_states: FrozenSet[int]):
+        if not nfa_states:
+            return None
+        state = self.cache.get(nfa_states)
+        if state is None:
+            state = LazyState(nfa_states, self.vm.is_final(nfa_states))
+            if not self.thrashing:
+                if len(self.cache) >= self.max_states:
+                    self._flush()
+                if not self.thrashing:
+                    self.cache[nfa_states] = state
+        return state
+
+    def _flush(self):
+        """Vide le cache ; les objets LazyState encore tenus par l'appelant restent valides."""
+        self.flushes += 1
+        if self.steps_since_flush < MIN_STEPS_PER_STATE * self.max_states:
+            self.bad_flushes += 1
+            if self.bad_flushes >= MAX_BAD_FLUSHES:
+                self.thrashing = True
+        for state in self.cache.values():
+            state.next.clear()
+        self.cache.clear()
+        self.steps_since_flush = 0
+        if not self.thrashing:
+            self.start.next.clear()
+            self.cache[self.start.nfa_states] = self.start
+
+    def step(self, state: LazyState, ch: str):
+        code = self.vm.symbol(ord(ch))
+        key = code if code in self.vm.alphabet else OTHER
+        self.steps_since_flush += 1
+        if key in state.next:
+            return state.next[key]
+        nxt = self._state(self.vm.step_set(state.nfa_states, code))
+        if not self.thrashing:
+            state.next[key] = nxt
+        return nxt
+
+    def is_final(self, state) -> bool:
+        return state is not None and state.final
+
+    def match(self, word: str) -> bool:
+        if self.thrashing:
+            return self.vm.match(word)
+        state = self.start
+        for ch in word:
+            state = self.step(state, ch)
+            if state is None:
+                return False
+        return state.final
+
+    def stats(self):
+        return {
+            "cached_states": len(self.cache),
+            "max_states": self.max_states,
+            "flushes": self.flushes,
+            "thrashing": self.thrashing,
+        }
+
+
+if __name__ == "__main__":
+    pattern = "(a|b)*a(a|b)(a|b)(a|b)(a|b)(a|b)(a|b)"
+    lazy = LazyDFA(regex_to_nfa(pattern), max_states=16)
+    for word in ["abbbbbb", "abbbbbbb", "bbbbbbbb", "aaaaaaa", "babababab"]:
+        print(f"{word!r:14} → {lazy.match(word)}")
+    print(lazy.stats())
@@ -0,0 +1,112 @@
+import sys
+from typing import NamedTuple
+
+from colorama import Fore, Style, init
+init(autoreset=True)
+
+# ========= Matchs : enregistrements et affichage groupé =========
+#
+# Les moteurs produisent des MatchRecord (générateurs) et ne formatent rien :
+# egrep -q / -c / -l n'ont jamais besoin du texte d'un match. Pour l'affichage,
+# MatchWriter formate les matchs et les écrit par paquets (un seul write pour
+# BATCH_SIZE caractères au lieu d'un print par match) ; la couleur n'est
+# ajoutée que si la sortie est un terminal (comme grep --color=auto).
+
+BATCH_SIZE = 1 << 16        # caractères accumulés avant un write
+
+
+class MatchRecord(NamedTuple):
+    line_no: int
+    line: str
+    start: int
+    end: int
+
+    @property
+    def column(self) -> int:
+        return self.start + 1
+
+    @property
+    def span(self):
+        return self.start, self.end
+
+    @property
+    def text(self) -> str:
+        return self.line[self.start:self.end]
+
+
+def format_match(record: MatchRecord, filename: str = None, color: bool = True,
+                 only_matching: bool = False) -> str:
+    line_no, line, start, end = record
+    if only_matching:                               # egrep -o : le texte du match seul
+        return f"{filename}:{line[start:end]}" if filename is not None else line[start:end]
+    shown = line[:start] + Fore.RED + line[start:end] + Style.RESET_ALL + line[end:] if color else line
+    where = f"{filename}: " if filename is not None else ""
+    return f"{where}Match found: line {line_no}, column {start+1}, text '{line[start:end]}', full line: {shown}"
+
+
+def print_match(line_no: int, line: str, start: int, end: int, filename: str = None):
+    print(format_match(MatchRecord(line_no, line, start, end), filename))
+
+
+class MatchWriter:
+    def __init__(self, out=None, only_matching: bool = False, color: bool = None):
+        self.out = out if out is not None else sys.stdout
+        self.only_matching = only_matching
+        self.color = self.out.isatty() if color is None else color
+        self.parts = []
+        self.size = 0
+
+    def write(self, record: MatchRecord, filename: str = None):
+        if self.only_matching and record.start == record.end:
+            return                                  # ligne qui ne matche que le mot vide : rien avec -o
+        self.write_text(format_match(record, filename, self.color, self.only_matching))
+
+    def write_text(self, text: str):
+        """Une ligne de sortie (sans '\\n'), écrite au prochain paquet."""
+        self.parts.append(text)
+        self.size += len(text) + 1
+        if self.size >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.parts:
+            self.out.write("\n".join(self.parts) + "\n")
+            self.parts = []
+            self.size = 0
+        self.out.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+
+def iter_line_matches(matcher, filepath: str):
+    """MatchRecord de chaque match, fichier lu ligne à ligne (sans préfiltre)."""
+    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.rstrip('\n')
+            for start, end in matcher.finditer(line):
+                yield MatchRecord(line_no, line, start, end)
+
+
+def write_matches(records, filename: str = None) -> bool:
+    """Affiche les matchs (par paquets) ; True s'il y en a au moins un."""
+    found = False
+    with MatchWriter() as writer:
+        for record in records:
+            found = True
+            writer.write(record, filename)
+    return found
+
+
+# --------- TESTS ----------
+if __name__ == "__main__":
+    record = MatchRecord(3, "le roi Sargon", 7, 13)
+    print(record, record.column, record.text)
+    print(format_match(record))
+    print(format_match(record, filename="livre.txt", only_matching=True))
+    with MatchWriter(color=False) as writer:
+        writer.write(record)
+        writer.write(record, filename="livre.txt")
@@ -1,46 +1,254 @@
 from DFA import *
 from NFA import NFA, EPS, regex_to_nfa
+from Parser import parse, reverse_tree, to_regex, anchor_branches, alt_tree
+from compiled_dfa import CompiledDFA, DEAD
+from dfa_store import load_or_compile
+from bytescan import ByteScanner
+from match_output import iter_line_matches, write_matches
+from bitparallel import BitParallelMatcher, count_positions, MAX_POSITIONS
 
-from colorama import Fore, Style, init
-init(autoreset=True)
+# ========= Recherche non ancrée en un seul passage =========
+#
+# Trois DFA minimaux (lus dans le cache disque s'ils ont déjà été compilés) :
+#   forward  : .*R       l'état initial boucle sur tout caractère, donc une ligne
+#                        est lue une seule fois ; s'il atteint un état final,
+#                        la ligne contient un match ;
+#   reverse  : .*rev(R)  lu de la fin de la ligne vers le début : il est final
+#                        en i si et seulement si un match commence en i ;
+#   anchored : R         depuis un début, le dernier état final donne la fin
+#                        du plus long match.
+# Les lignes sans match (la grande majorité) ne coûtent que le passage avant.
+# Sémantique egrep : match le plus à gauche, puis le plus long, sans chevauchement
+# (les matchs vides ne sont pas affichés).
 
-def match_dfa_in_file(dfa, filepath):
-    found = False
-    with open(filepath, 'r') as f:
-        line_no = 0
-        while True:
-            line = f.readline()
-            if not line:
+UNANCHORED_METHOD = "glushkov"
+
+
+def compile_min(pattern: str):
+    return load_or_compile(pattern, UNANCHORED_METHOD).compiled
+
+
+def compile_no_min(pattern: str):
+    return CompiledDFA(nfa_to_dfa(regex_to_nfa(pattern, method=UNANCHORED_METHOD)))
+
+
+class DFASearcher:
+    def __init__(self, pattern: str, compile=compile_min):
+        reverse = to_regex(reverse_tree(parse(pattern)))
+        self.pattern = pattern
+        self.forward = compile(f".*({pattern})")
+        self.reverse = compile(f".*({reverse})")
+        self.anchored = compile(pattern)
+
+    @staticmethod
+    def _classes(cdfa, line: str):
+        """Classes des caractères de la ligne (octets via bytes.translate si ASCII)."""
+        table = cdfa.byte_classes()
+        if table is not None and line.isascii():
+            return line.encode("ascii").translate(table)
+        class_of = cdfa.class_of
+        return [class_of(ord(ch)) for ch in line]
+
+    def line_matches(self, line: str) -> bool:
+        cdfa = self.forward
+        rows, finals = cdfa.rows, cdfa.finals
+        state = cdfa.start
+        if state in finals:
+            return True
+        for c in self._classes(cdfa, line):
+            state = rows[state][c]
+            if state in finals:
+                return True
+        return False
+
+    def starts(self, line: str):
+        """Débuts de match, croissants (un seul passage arrière)."""
+        cdfa = self.reverse
+        rows, finals = cdfa.rows, cdfa.finals
+        classes = self._classes(cdfa, line)
+        state = cdfa.start
+        found = [len(line)] if state in finals else []
+        for i in range(len(line) - 1, -1, -1):
+            state = rows[state][classes[i]]
+            if state in finals:
+                found.append(i)
+        found.reverse()
+        return found
+
+    def longest_from(self, line: str, start: int, classes=None) -> int:
+        """Fin (exclue) du plus long match qui commence en start, ou start."""
+        cdfa = self.anchored
+        rows, finals = cdfa.rows, cdfa.finals
+        if classes is None:
+            classes = self._classes(cdfa, line)
+        state = cdfa.start
+        end = start
+        for i in range(start, len(line)):
+            state = rows[state][classes[i]]
+            if state == DEAD:
                 break
-            line_no += 1
-            line = line.rstrip('\n')
-            for start in range(len(line)):
-                state = dfa.start
-                i = start
-                while i < len(line) and state in dfa.transitions and ord(line[i]) in dfa.transitions[state]:
-                    state = dfa.transitions[state][ord(line[i])]
-                    if state in dfa.final_states:
-                        found = True
-                        colored_line = (
-                            line[:start] +
-                            Fore.RED + line[start:i+1] + Style.RESET_ALL +
-                            line[i+1:]
-                        )
-                        print(f"Match found: line {line_no}, column {start+1}, text '{line[start:i+1]}', full line: {colored_line}")
-                    i += 1
+            if state in finals:
+                end = i + 1
+        return end
+
+    def finditer(self, line: str):
+        """Matchs (début, fin) non vides, sans chevauchement, les plus à gauche puis les plus longs."""
+        if not self.line_matches(line):
+            return
+        pos = 0
+        classes = self._classes(self.anchored, line)
+        for start in self.starts(line):
+            if start < pos:
+                continue
+            end = self.longest_from(line, start, classes)
+            if end > start:
+                yield start, end
+                pos = end
+
+
+# ========= Recherche ancrée ('^', '$') =========
+#
+# Les ancres ne sont qu'en tête et en fin des branches de premier niveau (cf.
+# Parser) : "^a|b$" = (^a)|(b$). Les branches sont groupées selon leurs ancres,
+# chaque groupe a l'automate de l'alternative de ses coeurs (bit-parallèle s'il
+# tient dans un mot machine, sinon DFA minimal) lancé depuis le bord de la ligne :
+#   ^R  : plus long préfixe de la ligne dans L(R)                  → (0, fin)
+#   R$  : préfixes de la ligne retournée dans L(rev(R)),
+#         donc débuts des matchs qui finissent la ligne            → (début, len)
+#   ^R$ : la ligne entière est dans L(R)                           → (0, len)
+#   R   : branches sans ancre, DFASearcher (débuts et plus longs matchs)
+# L'automate s'arrête dès qu'il meurt : le reste de la ligne n'est pas lu. Les
+# matchs de tous les groupes sont fusionnés avec la sémantique de DFASearcher.
+
+def anchored_automaton(pattern: str):
+    if count_positions(pattern) <= MAX_POSITIONS:
+        return BitParallelMatcher(pattern)
+    return compile_min(pattern)
+
+
+def longest_prefix(auto, text: str) -> int:
+    """Longueur du plus long préfixe de text accepté (start / step / is_final), -1 si aucun."""
+    state = auto.start
+    end = 0 if auto.is_final(state) else -1
+    for i, ch in enumerate(text):
+        state = auto.step(state, ch)
+        if not state:                           # état mort (0 pour CompiledDFA et BitParallelMatcher)
+            break
+        if auto.is_final(state):
+            end = i + 1
+    return end
+
+
+def suffix_starts(auto, line: str) -> list:
+    """Débuts i des suffixes line[i:] acceptés par l'automate du miroir, décroissants."""
+    state = auto.start
+    found = [len(line)] if auto.is_final(state) else []
+    for i in range(len(line) - 1, -1, -1):
+        state = auto.step(state, line[i])
+        if not state:
+            break
+        if auto.is_final(state):
+            found.append(i)
     return found
 
 
+class AnchorGroup:
+    """Branches de mêmes ancres : automate de l'alternative des coeurs (None si aucun), branche vide ?"""
+
+    def __init__(self, cores, reverse: bool = False):
+        trees = [core for core in cores if core is not None]
+        self.empty = len(trees) < len(cores)
+        self.auto = None
+        if trees:
+            tree = alt_tree(trees)
+            self.auto = anchored_automaton(to_regex(reverse_tree(tree) if reverse else tree))
+
+
+class AnchoredSearcher:
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        cores = {}
+        for at_start, core, at_end in anchor_branches(parse(pattern)):
+            cores.setdefault((at_start, at_end), []).append(core)
+        if list(cores) == [(False, False)]:
+            raise ValueError("AnchoredSearcher needs a regex with '^' or '$'")
+        self.prefix = AnchorGroup(cores[True, False]) if (True, False) in cores else None
+        self.suffix = AnchorGroup(cores[False, True], reverse=True) if (False, True) in cores else None
+        self.whole = AnchorGroup(cores[True, True]) if (True, True) in cores else None
+        self.inner = None
+        if (False, False) in cores:
+            self.inner = DFASearcher(to_regex(alt_tree(cores[False, False])))
+
+    def anchored_ends(self, line: str) -> dict:
+        """{début : plus longue fin} des matchs (éventuellement vides) des branches ancrées."""
+        n = len(line)
+        ends = {}
+        if self.suffix is not None:
+            group = self.suffix
+            starts = suffix_starts(group.auto, line) if group.auto is not None else []
+            for start in starts:
+                ends[start] = n
+            if group.empty:
+                ends[n] = n
+        if self.whole is not None:
+            group = self.whole
+            if (group.auto is not None and group.auto.match(line)) or (group.empty and not line):
+                ends[0] = n
+        if self.prefix is not None and ends.get(0) != n:
+            group = self.prefix
+            end = longest_prefix(group.auto, line) if group.auto is not None else -1
+            if group.empty:
+                end = max(end, 0)
+            if end >= 0:
+                ends[0] = max(ends.get(0, 0), end)
+        return ends
+
+    def line_matches(self, line: str) -> bool:
+        """La ligne contient-elle un match (éventuellement vide, ex: "^$" sur une ligne vide) ?"""
+        if self.anchored_ends(line):
+            return True
+        return self.inner is not None and self.inner.line_matches(line)
+
+    def finditer(self, line: str):
+        """Matchs (début, fin) non vides, sans chevauchement, les plus à gauche puis les plus longs."""
+        ends = self.anchored_ends(line)
+        inner = self.inner
+        inner_starts = set()
+        if inner is not None and inner.line_matches(line):
+            inner_starts.update(inner.starts(line))
+            classes = inner._classes(inner.anchored, line)
+        pos = 0
+        for start in sorted(inner_starts.union(ends)):
+            if start < pos:
+                continue
+            end = ends.get(start, start)
+            if start in inner_starts:
+                end = max(end, inner.longest_from(line, start, classes))
+            if end > start:
+                yield start, end
+                pos = end
+
+
+def iter_dfa_matches(searcher: DFASearcher, filepath):
+    """MatchRecord de chaque match du fichier, sans formatage (cf. match_output.py)."""
+    # fichier mappé en mémoire, seules les lignes qui contiennent le facteur
+    # obligatoire de la RegEx passent dans les DFA (cf. bytescan.py)
+    return ByteScanner(searcher.pattern, searcher).iter_file(filepath)
+
+
+def match_dfa_in_file(searcher: DFASearcher, filepath):
+    return write_matches(iter_dfa_matches(searcher, filepath))
+
+
+def scan_lines_in_file(searcher: DFASearcher, filepath):
+    """Même recherche, ligne à ligne sans préfiltre (référence pour tests/bench_bytescan.py)."""
+    return write_matches(iter_line_matches(searcher, filepath))
+
+
 def test_regex_on_file(pattern, filename):
-    nfa = regex_to_nfa(pattern)
-    # print(nfa)
-    # print("\n===== DFA AVANT MINIMISATION =====")
-    dfa = nfa_to_dfa(nfa)
-    #print(dfa)
-    min_dfa = minimize_dfa_hopcroft(dfa)
-    #print("\n===== DFA APRÈS MINIMISATION =====")
-    #print(min_dfa)
-    found = match_dfa_in_file(min_dfa, filename)
+    # RegEx -> NFA -> DFA -> DFA minimal (.*R, .*rev(R) et R), ou DFA minimaux
+    # déjà compilés par une exécution précédente (cache disque, cf. dfa_store.py)
+    found = match_dfa_in_file(DFASearcher(pattern), filename)
     if found:
         print(f"[translate:{pattern}] a été trouvé dans le fichier.")
     else:
@@ -48,11 +256,7 @@ def test_regex_on_file(pattern, filename):
     return found
 
 def test_regex_no_minimisation(pattern, filename):
-    nfa = regex_to_nfa(pattern)
-    # print(nfa)
-    dfa = nfa_to_dfa(nfa)
-    #print(dfa)
-    found = match_dfa_in_file(dfa, filename)
+    found = match_dfa_in_file(DFASearcher(pattern, compile=compile_no_min), filename)
     if found:
         print(f"[translate:{pattern}] a été trouvé dans le fichier.")
     else:
@@ -60,8 +264,6 @@ def test_regex_no_minimisation(pattern, filename):
     return found
 
 
-
-
 # --------- TESTS ----------
 if __name__ == "__main__":
     # Exemple d'utilisation :
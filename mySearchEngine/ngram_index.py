@@ -0,0 +1,67 @@
+import os
+import json
+from collections import defaultdict
+
+# ========= Index de trigrammes de caractères sur le vocabulaire =========
+#
+# Chaque terme de l'index reçoit un identifiant (rang dans l'ordre alphabétique)
+# et chaque trigramme pointe vers la liste triée des termes qui le contiennent.
+# Les mots sont encadrés par BOUNDARY ("$" n'apparaît jamais dans un token \w+),
+# ce qui donne aussi des trigrammes de début et de fin de mot :
+#   "king" → $ki, kin, ing, ng$
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LIB_DIR = os.path.join(BASE_DIR, "library")
+TRIGRAMS_PATH = os.path.join(LIB_DIR, "trigrams.json")
+
+BOUNDARY = "$"
+
+
+def word_trigrams(word: str):
+    padded = BOUNDARY + word + BOUNDARY
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NgramIndex:
+    def __init__(self, terms, trigrams):
+        self.terms = terms                  # id → terme (ordre alphabétique)
+        self.trigrams = trigrams            # trigramme → [ids triés]
+
+    def __len__(self):
+        return len(self.terms)
+
+    def postings(self, gram: str):
+        return self.trigrams.get(gram, ())
+
+
+def build_trigram_index(vocabulary) -> NgramIndex:
+    terms = sorted(vocabulary)
+    trigrams = defaultdict(list)
+    for tid, term in enumerate(terms):
+        for gram in word_trigrams(term):
+            trigrams[gram].append(tid)
+    return NgramIndex(terms, dict(trigrams))
+
+
+def save_trigram_index(ngram: NgramIndex, path: str = TRIGRAMS_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"terms": ngram.terms, "trigrams": ngram.trigrams}, f)
+
+
+def load_trigram_index(path: str = TRIGRAMS_PATH) -> NgramIndex:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return NgramIndex(data["terms"], data["trigrams"])
+
+
+def load_or_build_trigram_index(index, path: str = TRIGRAMS_PATH) -> NgramIndex:
+    """
+    Charge trigrams.json s'il correspond à l'index, sinon le reconstruit en mémoire.
+    Les ids sont des rangs dans le vocabulaire : il faut exactement les mêmes
+    termes (même taille ne suffit pas après une reconstruction de l'index).
+    """
+    if os.path.exists(path):
+        ngram = load_trigram_index(path)
+        if len(ngram) == len(index) and index.keys() == set(ngram.terms):
+            return ngram
+    return build_trigram_index(index.keys())
@@ -0,0 +1,307 @@
+import mmap
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from BMH import literal_matcher
+from AhoCorasick import AhoCorasick, literal_alternatives
+from bitparallel import BitParallelMatcher, choose_engine
+from matching import DFASearcher, AnchoredSearcher
+from bytescan import ByteScanner
+from match_output import MatchRecord
+
+# ========= egrep parallèle par morceaux de fichier =========
+#
+# - le fichier est découpé en morceaux qui commencent et finissent sur une fin
+#   de ligne (aucun match ne traverse deux morceaux) ;
+# - chaque processus reçoit le ByteScanner compilé une seule fois (initializer
+#   du ProcessPoolExecutor), puis ne reçoit plus que des plages d'octets ;
+# - un morceau renvoie ses matchs (lignes numérotées depuis son début) et son
+#   nombre de '\n' : les résultats sont fusionnés dans l'ordre du fichier ;
+# - max_lines (-m, ou 1 pour -q) arrête chaque morceau et l'ensemble dès que
+#   assez de lignes ont été trouvées, les morceaux restants sont annulés.
+
+CHUNKS_PER_JOB = 4              # plusieurs morceaux par processus : équilibrage et arrêt rapide
+MIN_CHUNK_SIZE = 1 << 20        # en dessous, découper coûte plus que ça ne rapporte
+FILES_PER_JOB = 4               # fichiers en cours par processus (egrep -r) : file d'attente bornée
+
+
+def build_scanner(pattern: str) -> ByteScanner:
+    """Moteur choisi par choose_engine, derrière le préfiltre littéral de bytescan.py."""
+    engine = choose_engine(pattern)
+    if engine == "kmp":
+        literal = literal_alternatives(pattern)[0]                  # échappements retirés
+        return ByteScanner(pattern, literal_matcher(literal), literal=literal)      # KMP ou BMH
+    if engine == "aho":
+        words = literal_alternatives(pattern)
+        return ByteScanner(pattern, AhoCorasick(words), literals=words)
+    if engine == "anchored":
+        return ByteScanner(pattern, AnchoredSearcher(pattern))
+    if engine == "bitparallel":
+        return ByteScanner(pattern, BitParallelMatcher(pattern))
+    return ByteScanner(pattern, DFASearcher(pattern))
+
+
+def split_chunks(buf, n_chunks: int):
+    """Plages [début, fin) de buf, alignées sur les fins de ligne."""
+    size = len(buf)
+    n_chunks = max(1, min(n_chunks, size // MIN_CHUNK_SIZE))
+    chunks = []
+    start = 0
+    for k in range(1, n_chunks):
+        target = size * k // n_chunks
+        if target <= start:
+            continue
+        nl = buf.find(b"\n", target - 1)
+        if nl < 0:
+            break
+        chunks.append((start, nl + 1))
+        start = nl + 1
+    if start < size:
+        chunks.append((start, size))
+    return chunks
+
+
+def scan_range(scanner: ByteScanner, buf, start: int, end: int, max_lines: int = None):
+    """(matchs, nombre de '\\n') de buf[start:end] ; au plus max_lines lignes avec match."""
+    matches = []
+    lines = 0
+    last = None
+    for line_no, line, s, e in scanner.scan(buf, start, end):
+        if line_no != last:
+            if max_lines is not None and lines >= max_lines:
+                break
+            lines += 1
+            last = line_no
+        matches.append((line_no, line, s, e))
+    view = np.frombuffer(buf, dtype=np.uint8, count=end - start, offset=start)
+    return matches, int(np.count_nonzero(view == 0x0A))
+
+
+# ---------- côté processus de travail ----------
+
+_worker_scanner = None
+
+
+def _init_worker(scanner: ByteScanner):
+    global _worker_scanner
+    _worker_scanner = scanner
+
+
+def _scan_chunk(path: str, start: int, end: int, max_lines: int = None):
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return scan_range(_worker_scanner, buf, start, end, max_lines)
+
+
+def _count_chunk(path: str, start: int, end: int, max_lines: int = None):
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return _worker_scanner.count(buf, start, end, max_lines)
+
+
+def _scan_file(path: str, max_lines: int = None, count_only: bool = False):
+    return scan_file(_worker_scanner, path, max_lines, count_only)
+
+
+# ---------- côté processus principal ----------
+
+def parallel_search(scanner: ByteScanner, path: str, jobs: int = 0, max_lines: int = None):
+    """
+    Matchs (numéro de ligne, ligne, début, fin) du fichier, dans l'ordre du fichier.
+    jobs=0 : un processus par coeur ; jobs=1 : tout dans le processus courant.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    with open(path, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:                          # fichier vide
+            return
+    with buf:
+        chunks = split_chunks(buf, jobs * CHUNKS_PER_JOB)
+        if jobs == 1 or len(chunks) == 1:
+            results = (scan_range(scanner, buf, start, end, max_lines) for start, end in chunks)
+            yield from _merge(results, max_lines)
+            return
+
+    executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(scanner,))
+    futures = [executor.submit(_scan_chunk, path, start, end, max_lines) for start, end in chunks]
+    try:
+        yield from _merge((future.result() for future in futures), max_lines)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parallel_count(scanner: ByteScanner, path: str, jobs: int = 0, max_lines: int = None) -> int:
+    """
+    Nombre de lignes avec match du fichier (au plus max_lines), sans formater
+    les matchs : egrep -c, et -q / -l avec max_lines=1.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    with open(path, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:                          # fichier vide
+            return 0
+    with buf:
+        chunks = split_chunks(buf, jobs * CHUNKS_PER_JOB)
+        if jobs == 1 or len(chunks) == 1:
+            return scanner.count(buf, 0, len(buf), max_lines)
+
+    executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(scanner,))
+    futures = [executor.submit(_count_chunk, path, start, end, max_lines) for start, end in chunks]
+    total = 0
+    try:
+        for future in futures:
+            total += future.result()
+            if max_lines is not None and total >= max_lines:
+                return max_lines
+        return total
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)      # au plus les morceaux déjà en cours
+
+
+def _merge(results, max_lines):
+    """Renumérote les lignes de chaque morceau et s'arrête après max_lines lignes avec match."""
+    offset = 0
+    lines = 0
+    for matches, newlines in results:
+        last = None
+        for line_no, line, s, e in matches:
+            if line_no != last:
+                if max_lines is not None and lines >= max_lines:
+                    return
+                lines += 1
+                last = line_no
+            yield MatchRecord(offset + line_no, line, s, e)
+        offset += newlines
+
+
+# ========= egrep récursif sur un répertoire =========
+#
+# - la RegEx est compilée une seule fois, chaque processus reçoit le ByteScanner
+#   par l'initializer (comme pour les morceaux) ;
+# - le répertoire est parcouru paresseusement (os.walk) : au plus
+#   FILES_PER_JOB * jobs fichiers sont soumis en même temps, le parcours avance
+#   au rythme des résultats (pas de liste des 1664 livres en attente) ;
+# - chaque fichier est une tâche (un livre fait moins de quelques Mo) ; les
+#   résultats sortent dès qu'un fichier est fini, pas dans l'ordre du parcours ;
+# - -c ne renvoie que le nombre de lignes, -l s'arrête au premier match :
+#   les lignes ne traversent pas le pipe entre processus quand elles ne servent pas.
+
+
+def iter_files(root: str):
+    """Fichiers réguliers sous root, dans l'ordre alphabétique de chaque répertoire."""
+    if not os.path.isdir(root):
+        yield root
+        return
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            if os.path.isfile(path):
+                yield path
+
+
+def scan_file(scanner: ByteScanner, path: str, max_lines: int = None, count_only: bool = False):
+    """
+    (chemin, matchs, erreur) pour un fichier entier ; avec count_only, matchs est
+    le nombre de lignes avec match. erreur est None ou le message d'une OSError.
+    """
+    try:
+        with open(path, "rb") as f:
+            try:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:                      # fichier vide
+                return path, 0 if count_only else [], None
+            with buf:
+                if count_only:
+                    return path, scanner.count(buf, 0, len(buf), max_lines), None
+                matches, _ = scan_range(scanner, buf, 0, len(buf), max_lines)
+    except OSError as e:
+        return path, 0 if count_only else [], str(e)
+    return path, matches, None
+
+
+def search_tree(scanner: ByteScanner, root: str, jobs: int = 0,
+                max_lines: int = None, count_only: bool = False):
+    """
+    Résultats scan_file pour chaque fichier sous root, dans l'ordre où ils finissent.
+    jobs=0 : un processus par coeur ; jobs=1 : tout dans le processus courant.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    files = iter_files(root)
+    if jobs == 1:
+        for path in files:
+            yield scan_file(scanner, path, max_lines, count_only)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(scanner,))
+    pending = set()
+    try:
+        for path in files:
+            pending.add(executor.submit(_scan_file, path, max_lines, count_only))
+            if len(pending) < FILES_PER_JOB * jobs:
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)      # au plus les fichiers déjà en cours
+
+
+# ========= egrep sur un flux (entrée standard, tube) =========
+#
+# Un tube ne se mappe pas en mémoire : il est lu par morceaux de STREAM_CHUNK
+# octets. La fin de chaque morceau, après son dernier '\n', est reportée au
+# début du suivant : un morceau ne contient que des lignes entières, donc
+# aucun match n'est coupé entre deux morceaux (les matchs ne traversent pas
+# les fins de ligne). La mémoire reste bornée par la taille d'un morceau
+# (plus la plus longue ligne), quelle que soit la taille de l'entrée, et la
+# lecture s'arrête dès que max_lines lignes ont été trouvées (-q, -l, -m).
+
+STREAM_CHUNK = 1 << 22          # octets lus à chaque appel à read (4 Mo)
+
+
+def read_line_chunks(stream, chunk_size: int = STREAM_CHUNK):
+    """Morceaux de stream (binaire) qui finissent sur un '\\n', sauf peut-être le dernier."""
+    carry = []                                  # fin de ligne en attente de son '\n'
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        cut = data.rfind(b"\n") + 1
+        if not cut:                             # ligne plus longue que le morceau
+            carry.append(data)
+            continue
+        if carry:
+            carry.append(data[:cut])
+            yield b"".join(carry)
+        else:
+            yield data[:cut]
+        carry = [data[cut:]] if cut < len(data) else []
+    if carry:
+        yield b"".join(carry)
+
+
+def stream_search(scanner: ByteScanner, stream, max_lines: int = None, chunk_size: int = STREAM_CHUNK):
+    """Matchs (MatchRecord) d'un flux, numérotés depuis son début, dans l'ordre."""
+    results = (scan_range(scanner, chunk, 0, len(chunk), max_lines)
+               for chunk in read_line_chunks(stream, chunk_size))
+    yield from _merge(results, max_lines)
+
+
+def stream_count(scanner: ByteScanner, stream, max_lines: int = None, chunk_size: int = STREAM_CHUNK) -> int:
+    """Nombre de lignes avec match d'un flux (au plus max_lines), comme parallel_count."""
+    total = 0
+    for chunk in read_line_chunks(stream, chunk_size):
+        remaining = None if max_lines is None else max_lines - total
+        total += scanner.count(chunk, 0, len(chunk), remaining)
+        if max_lines is not None and total >= max_lines:
+            break
+    return total
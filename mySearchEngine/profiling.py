@@ -0,0 +1,68 @@
+import os
+import re
+import time
+import cProfile
+from contextlib import contextmanager
+
+
+# ========= Chronométrage par étape =========
+
+class StageTimer:
+    """
+    Mesure le temps (ms) de chaque étape d'une requête et garde
+    quelques compteurs (nb d'états, mots parcourus, postings fusionnés...).
+    Utilisé par le mode profile=1 de /search_regex.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+        self._t0 = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name: str, value):
+        self.counters[name] = value
+
+    def to_dict(self):
+        total = (time.perf_counter() - self._t0) * 1000
+        return {
+            "total_ms": round(total, 3),
+            "stages_ms": {k: round(v, 3) for k, v in self.stages.items()},
+            "counters": dict(self.counters),
+        }
+
+
+# ========= Dump cProfile =========
+
+def profile_dump_path(profile_dir: str, label: str) -> str:
+    """Nom de fichier unique et lisible : <horodatage>_<label>.pstats"""
+    safe = re.sub(r"[^A-Za-z0-9_-]+", "_", label)[:40] or "query"
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    millis = int((time.time() % 1) * 1000)
+    return os.path.join(profile_dir, f"{stamp}-{millis:03d}_{safe}.pstats")
+
+
+def run_with_cprofile(fn, dump_path: str):
+    """
+    Exécute fn() sous cProfile et sauvegarde les stats (format pstats)
+    dans dump_path. Lecture : python3 -m pstats <fichier>
+    """
+    os.makedirs(os.path.dirname(dump_path), exist_ok=True)
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        return fn()
+    finally:
+        prof.disable()
+        prof.dump_stats(dump_path)
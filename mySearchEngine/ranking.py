@@ -0,0 +1,104 @@
+import heapq
+from itertools import groupby
+
+# ========= Classement hybride : score texte + score statique =========
+#
+#   score(d) = w_text * text(d) + w_static * static(d)
+#
+# text(d) est ramené dans [0, 1] grâce à max_tf (cf. build_static_scores.py),
+# static(d) est dans [0, 1]. Comme les postings sont triés par score statique
+# décroissant au build, la borne  w_text * 1 + w_static * static(d)  décroît
+# le long du parcours : dès qu'elle ne bat plus le k-ième score courant,
+# aucun document restant ne peut entrer dans le top-k → on s'arrête.
+
+
+def _static_order(posting, static_scores, presorted):
+    if presorted:
+        return iter(posting)
+    return iter(sorted(posting, key=lambda d: (-static_scores.get(d, 0.0), int(d))))
+
+
+def _push(heap, k, score, doc_id):
+    item = (score, -int(doc_id), doc_id)
+    if len(heap) < k:
+        heapq.heappush(heap, item)
+    elif item > heap[0]:
+        heapq.heapreplace(heap, item)
+
+
+def _ranked(heap):
+    return [(doc_id, round(score, 6)) for score, _, doc_id in sorted(heap, reverse=True)]
+
+
+def top_k_conjunctive(postings, static_scores, max_tf, k=20,
+                      w_text=1.0, w_static=0.5, presorted=True, stats=None):
+    """
+    Top-k hybride pour une requête ET (recherche simple).
+    postings : liste de (mot, {doc_id: tf}), tous les mots doivent être présents.
+    Renvoie [(doc_id, score)] trié par score décroissant.
+    """
+    if not postings or k <= 0:
+        return []
+
+    n_terms = len(postings)
+    # on parcourt la liste la plus courte, les autres servent de filtre
+    postings = sorted(postings, key=lambda p: len(p[1]))
+    _, driver = postings[0]
+
+    heap = []
+    scanned = 0
+    for doc_id in _static_order(driver, static_scores, presorted):
+        static = static_scores.get(doc_id, 0.0)
+        if len(heap) >= k and w_text + w_static * static <= heap[0][0]:
+            break
+        scanned += 1
+
+        text = 0.0
+        for word, posting in postings:
+            tf = posting.get(doc_id)
+            if tf is None:
+                break
+            text += int(tf) / max_tf.get(word, int(tf))
+        else:
+            _push(heap, k, w_text * text / n_terms + w_static * static, doc_id)
+
+    if stats is not None:
+        stats["docs_scored"] = scanned
+        stats["docs_total"] = len(driver)
+    return _ranked(heap)
+
+
+def top_k_disjunctive(postings, static_scores, max_tf, k=20,
+                      w_text=1.0, w_static=0.5, presorted=True, stats=None):
+    """
+    Top-k hybride pour une requête OU (mots qui matchent une RegEx).
+    text(d) = min(1, somme des tf(w, d) / max_tf(w)).
+    Les postings sont fusionnés (k-way merge) dans l'ordre statique global,
+    de sorte que toutes les entrées d'un même document sont consécutives.
+    """
+    if not postings or k <= 0:
+        return []
+
+    def entries(word, posting):
+        for doc_id in _static_order(posting, static_scores, presorted):
+            yield (-static_scores.get(doc_id, 0.0), int(doc_id)), doc_id, word, posting[doc_id]
+
+    merged = heapq.merge(*(entries(w, p) for w, p in postings), key=lambda e: e[0])
+
+    heap = []
+    scanned = 0
+    for (neg_static, _), group in groupby(merged, key=lambda e: e[0]):
+        static = -neg_static
+        if len(heap) >= k and w_text + w_static * static <= heap[0][0]:
+            break
+        scanned += 1
+
+        text = 0.0
+        doc_id = None
+        for _, doc_id, word, tf in group:
+            text += int(tf) / max_tf.get(word, int(tf))
+        _push(heap, k, w_text * min(1.0, text) + w_static * static, doc_id)
+
+    if stats is not None:
+        stats["docs_scored"] = scanned
+    return _ranked(heap)
@@ -0,0 +1,396 @@
+from Parser import RegExTree, CONCAT, STAR, PLUS, ALT, QUEST, DOT, CLASS, BOL, EOL, fold_tree
+from charclass import chars, width
+from ngram_index import BOUNDARY
+
+# ========= Trigrammes obligatoires d'une RegEx (style Google Code Search) =========
+#
+# Pour chaque noeud de l'arbre (Parser.parse) on calcule :
+#   emptyable : le noeud peut-il matcher le mot vide ?
+#   exact     : ensemble exact des chaînes matchées (None si inconnu / trop grand)
+#   prefix    : préfixes possibles de toute chaîne matchée (si exact inconnu)
+#   suffix    : suffixes possibles (si exact inconnu)
+#   match     : requête booléenne de trigrammes que toute chaîne matchée satisfait
+#
+# Une requête est : ALL (None, aucune contrainte), un trigramme (str),
+# ou ("and" | "or", frozenset de sous-requêtes).
+# Cf. Russ Cox, "Regular Expression Matching with a Trigram Index".
+
+ALL = None
+
+MAX_EXACT = 16     # taille max d'un ensemble exact
+MAX_SET = 32       # taille max des ensembles prefix / suffix
+
+
+def q_and(a, b):
+    if a is ALL:
+        return b
+    if b is ALL or a == b:
+        return a
+    subs = set()
+    for q in (a, b):
+        if isinstance(q, tuple) and q[0] == "and":
+            subs.update(q[1])
+        else:
+            subs.add(q)
+    return ("and", frozenset(subs))
+
+
+def q_or(a, b):
+    if a is ALL or b is ALL:
+        return ALL
+    if a == b:
+        return a
+    subs = set()
+    for q in (a, b):
+        if isinstance(q, tuple) and q[0] == "or":
+            subs.update(q[1])
+        else:
+            subs.add(q)
+    return ("or", frozenset(subs))
+
+
+def trigrams_query(strings):
+    """OU sur les chaînes de (ET des trigrammes de la chaîne). ALL si une chaîne a < 3 caractères."""
+    query = None
+    first = True
+    for s in strings:
+        if len(s) < 3:
+            return ALL
+        sub = ALL
+        for i in range(len(s) - 2):
+            sub = q_and(sub, s[i:i + 3])
+        query = sub if first else q_or(query, sub)
+        first = False
+    return ALL if first else query
+
+
+def cross(xs, ys):
+    return {x + y for x in xs for y in ys}
+
+
+class Info:
+    __slots__ = ("emptyable", "exact", "prefix", "suffix", "match")
+
+    def __init__(self, emptyable, exact=None, prefix=None, suffix=None, match=ALL):
+        self.emptyable = emptyable
+        self.exact = exact
+        self.prefix = prefix
+        self.suffix = suffix
+        self.match = match
+
+    def prefixes(self):
+        return self.exact if self.exact is not None else self.prefix
+
+    def suffixes(self):
+        return self.exact if self.exact is not None else self.suffix
+
+    def full_match(self):
+        """Toute l'information sous forme de requête (exact / prefix / suffix compris)."""
+        if self.exact is not None:
+            return q_and(self.match, trigrams_query(self.exact))
+        return q_and(q_and(self.match, trigrams_query(self.prefix)), trigrams_query(self.suffix))
+
+
+def _trim(strings, keep_end):
+    """Réduit un ensemble de préfixes/suffixes à au plus MAX_SET chaînes d'au plus 2 caractères."""
+    n = 2
+    while True:
+        out = {s[-n:] if keep_end and n else s[:n] for s in strings} if n else {""}
+        if len(out) <= MAX_SET or n == 0:
+            return out
+        n -= 1
+
+
+def simplify(info: Info) -> Info:
+    if info.exact is not None and len(info.exact) > MAX_EXACT:
+        exact = info.exact
+        info = Info(info.emptyable, None, exact, exact, q_and(info.match, trigrams_query(exact)))
+    if info.exact is None:
+        # les trigrammes internes passent dans match, on ne garde que
+        # les 2 caractères utiles pour les trigrammes à cheval sur une concaténation
+        info.match = q_and(q_and(info.match, trigrams_query(info.prefix)), trigrams_query(info.suffix))
+        info.prefix = _trim(info.prefix, keep_end=False)
+        info.suffix = _trim(info.suffix, keep_end=True)
+    return info
+
+
+def literal_info(s: str) -> Info:
+    return Info(s == "", {s})
+
+
+def any_char_info() -> Info:
+    return Info(False, None, {""}, {""})
+
+
+def unknown_info() -> Info:
+    return Info(True, None, {""}, {""})
+
+
+def concat_info(x: Info, y: Info) -> Info:
+    emptyable = x.emptyable and y.emptyable
+    match = q_and(x.match, y.match)
+
+    if x.exact is not None and y.exact is not None:
+        exact = cross(x.exact, y.exact)
+        if len(exact) <= MAX_EXACT:
+            return Info(emptyable, exact, match=match)
+
+    # trigrammes qui chevauchent la frontière x | y
+    # (2 caractères de chaque côté suffisent)
+    boundary = cross(_trim(x.suffixes(), keep_end=True), _trim(y.prefixes(), keep_end=False))
+    match = q_and(match, trigrams_query(boundary))
+
+    if x.exact is not None:
+        prefix = cross(x.exact, y.prefixes())
+    elif x.emptyable:
+        prefix = x.prefix | y.prefixes()
+    else:
+        prefix = x.prefix
+
+    if y.exact is not None:
+        suffix = cross(x.suffixes(), y.exact)
+    elif y.emptyable:
+        suffix = y.suffix | x.suffixes()
+    else:
+        suffix = y.suffix
+
+    return simplify(Info(emptyable, None, prefix, suffix, match))
+
+
+def alt_info(x: Info, y: Info) -> Info:
+    emptyable = x.emptyable or y.emptyable
+    if x.exact is not None and y.exact is not None:
+        return simplify(Info(emptyable, x.exact | y.exact, match=q_or(x.match, y.match)))
+    return simplify(Info(
+        emptyable, None,
+        x.prefixes() | y.prefixes(),
+        x.suffixes() | y.suffixes(),
+        q_or(x.full_match(), y.full_match()),
+    ))
+
+
+def class_info(ranges) -> Info:
+    """Petite classe : ensemble exact de ses caractères ; sinon un caractère quelconque."""
+    if width(ranges) <= MAX_EXACT:
+        return Info(False, set(chars(ranges)))
+    return any_char_info()
+
+
+def analyze(node: RegExTree) -> Info:
+    if not node.subs:
+        if node.root == DOT:
+            return any_char_info()
+        if node.root == CLASS:
+            return class_info(node.ranges)
+        if node.root in (BOL, EOL):       # ancre : mot vide (le mot entier est déjà ancré)
+            return literal_info("")
+        if node.root > 0x10FFFF:          # noeud spécial sans fils (PROT vide...)
+            return unknown_info()
+        return literal_info(chr(node.root))
+
+    if node.root == CONCAT:
+        return concat_info(analyze(node.subs[0]), analyze(node.subs[1]))
+    if node.root == ALT:
+        return alt_info(analyze(node.subs[0]), analyze(node.subs[1]))
+    if node.root == STAR:
+        return Info(True, None, {""}, {""})
+    if node.root == QUEST:
+        return alt_info(analyze(node.subs[0]), literal_info(""))
+    if node.root == PLUS:
+        sub = analyze(node.subs[0])
+        return simplify(Info(sub.emptyable, None, sub.prefixes(), sub.suffixes(), sub.full_match()))
+    return unknown_info()
+
+
+def trigram_query(tree: RegExTree, anchored: bool = True):
+    """
+    Requête de trigrammes que tout mot matché par tree doit satisfaire.
+    anchored=True : le mot entier doit matcher (recherche dans le vocabulaire),
+    on profite alors des trigrammes de bord ($ki, ng$) de l'index.
+    """
+    info = analyze(tree)
+    if anchored:
+        bound = literal_info(BOUNDARY)
+        info = concat_info(concat_info(bound, info), bound)
+    return info.full_match()
+
+
+# ========= Évaluation sur l'index de trigrammes =========
+
+def _estimate(query, ngram):
+    if isinstance(query, str):
+        return len(ngram.postings(query))
+    return 0
+
+
+def candidate_term_ids(query, ngram):
+    """
+    Ensemble des ids de termes qui satisfont la requête, ou None si la
+    requête n'apporte aucune contrainte (ALL) → parcours complet du vocabulaire.
+    """
+    if query is ALL:
+        return None
+    if isinstance(query, str):
+        return set(ngram.postings(query))
+
+    op, subs = query
+    if op == "and":
+        result = None
+        for sub in sorted(subs, key=lambda q: (not isinstance(q, str), _estimate(q, ngram))):
+            ids = candidate_term_ids(sub, ngram)
+            if ids is None:
+                continue
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result
+
+    result = set()
+    for sub in subs:
+        ids = candidate_term_ids(sub, ngram)
+        if ids is None:
+            return None
+        result |= ids
+    return result
+
+
+# ========= Facteur obligatoire (préfiltre des recherches dans un fichier) =========
+#
+# Chaîne que tout match doit contenir : on la cherche avec bytes.find (vitesse
+# memchr) et l'automate ne tourne que sur les lignes qui la contiennent.
+# Pour chaque noeud :
+#   exact   : ensemble exact des chaînes matchées (None si inconnu / trop grand)
+#   left    : préfixe commun à tous les matchs
+#   right   : suffixe commun à tous les matchs
+#   inner   : facteur commun à tous les matchs (le plus long trouvé)
+#   factors : ensemble de facteurs dont tout match contient au moins un
+#             (ex: {"king", "queen"} pour "(king|queen)s*"), cherchés en une
+#             passe par AhoCorasick.py quand inner est trop court ; None si aucun
+
+MAX_FACTORS = 64    # taille max d'un ensemble de facteurs
+
+
+def _better_factors(a, b):
+    """Ensemble le plus sélectif : facteur le plus court le plus long, puis le moins de facteurs."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    score_a = (min(map(len, a)), -len(a))
+    score_b = (min(map(len, b)), -len(b))
+    return a if score_a >= score_b else b
+
+
+class Must:
+    __slots__ = ("exact", "left", "right", "inner", "factors")
+
+    def __init__(self, exact, left, right, inner, factors=None):
+        self.exact = exact
+        self.left = left
+        self.right = right
+        self.inner = max((inner, left, right), key=len)
+        self.factors = _better_factors(factors, frozenset([self.inner]) if self.inner else None)
+
+
+NO_MUST = Must(None, "", "", "")
+EMPTY_MUST = Must(frozenset([""]), "", "", "")
+
+
+def _common_prefix(a: str, b: str) -> str:
+    n = 0
+    while n < len(a) and n < len(b) and a[n] == b[n]:
+        n += 1
+    return a[:n]
+
+
+def _common_suffix(a: str, b: str) -> str:
+    return _common_prefix(a[::-1], b[::-1])[::-1]
+
+
+def _common_factor(a: str, b: str) -> str:
+    """Plus long facteur commun (programmation dynamique, chaînes courtes)."""
+    best, best_end = 0, 0
+    prev = [0] * (len(b) + 1)
+    for i in range(1, len(a) + 1):
+        cur = [0] * (len(b) + 1)
+        for j in range(1, len(b) + 1):
+            if a[i - 1] == b[j - 1]:
+                cur[j] = prev[j - 1] + 1
+                if cur[j] > best:
+                    best, best_end = cur[j], i
+        prev = cur
+    return a[best_end - best:best_end]
+
+
+def _must_from_exact(exact) -> Must:
+    strings = sorted(exact, key=len)
+    left = right = inner = strings[0]
+    for s in strings[1:]:
+        left = _common_prefix(left, s)
+        right = _common_suffix(right, s)
+        inner = _common_factor(inner, s)
+    return Must(exact, left, right, inner, frozenset(exact))
+
+
+def _must_concat(x: Must, y: Must) -> Must:
+    if x.exact is not None and y.exact is not None and len(x.exact) * len(y.exact) <= MAX_EXACT:
+        return _must_from_exact(cross(x.exact, y.exact))
+    left = next(iter(x.exact)) + y.left if x.exact is not None and len(x.exact) == 1 else x.left
+    right = x.right + next(iter(y.exact)) if y.exact is not None and len(y.exact) == 1 else y.right
+    inner = max((x.inner, y.inner, x.right + y.left), key=len)
+    return Must(None, left, right, inner, _better_factors(x.factors, y.factors))
+
+
+def _must_alt(x: Must, y: Must) -> Must:
+    if x.exact is not None and y.exact is not None and len(x.exact | y.exact) <= MAX_EXACT:
+        return _must_from_exact(x.exact | y.exact)
+    factors = None
+    if x.factors is not None and y.factors is not None and len(x.factors | y.factors) <= MAX_FACTORS:
+        factors = x.factors | y.factors
+    return Must(None, _common_prefix(x.left, y.left), _common_suffix(x.right, y.right),
+                _common_factor(x.inner, y.inner), factors)
+
+
+def _must(tree: RegExTree) -> Must:
+    def combine(node, subs):
+        if not node.subs:
+            if node.root == CLASS and width(node.ranges) <= MAX_EXACT:
+                return _must_from_exact(set(chars(node.ranges)))
+            if node.root in (BOL, EOL):
+                return EMPTY_MUST               # ancre : mot vide, ne coupe pas les littéraux
+            if node.root == DOT or node.root > 0x10FFFF:
+                return NO_MUST
+            c = chr(node.root)
+            return Must({c}, c, c, c)
+        if node.root == CONCAT:
+            return _must_concat(subs[0], subs[1])
+        if node.root == ALT:
+            return _must_alt(subs[0], subs[1])
+        if node.root == PLUS:
+            return Must(None, subs[0].left, subs[0].right, subs[0].inner, subs[0].factors)
+        return NO_MUST                          # STAR, QUEST : peuvent matcher le mot vide
+    return fold_tree(tree, combine)
+
+
+def required_literal(tree: RegExTree) -> str:
+    """Plus long facteur trouvé que tout match de tree contient ("" si aucun)."""
+    return _must(tree).inner
+
+
+def required_literals(tree: RegExTree) -> list:
+    """Facteurs dont tout match de tree contient au moins un ([] si aucun ensemble utile)."""
+    factors = _must(tree).factors
+    return sorted(factors) if factors is not None else []
+
+
+def accepts_empty(tree: RegExTree) -> bool:
+    """tree peut-il matcher le mot vide (une ancre est le mot vide) ? Ex: "(b)*", "x?", "^$"."""
+    def combine(node, subs):
+        if node.root == CONCAT:
+            return subs[0] and subs[1]
+        if node.root == ALT:
+            return subs[0] or subs[1]
+        if node.root == PLUS:
+            return subs[0]
+        return node.root in (STAR, QUEST, BOL, EOL)
+    return fold_tree(tree, combine)
@@ -124,11 +124,23 @@ def pretty_print_results(results, vocab):
         print(f"{rank}. Doc {doc_id} | score={score} | vocab_size={vocab_size}")
 
 
+def print_did_you_mean(query):
+    """Si la requête ne donne rien : propose une correction (index de trigrammes)."""
+    from ngram_index import load_or_build_trigram_index
+    from spelling import correct_query
+
+    suggestion, _ = correct_query(query, index, load_or_build_trigram_index(index), normalize)
+    if suggestion:
+        print(f"Vouliez-vous dire : {suggestion} ?")
+
+
 def main():
     if len(sys.argv) > 1:
         query = " ".join(sys.argv[1:])
         results = search_query(query, index)
         pretty_print_results(results, vocab)
+        if not results:
+            print_did_you_mean(query)
     else:
         print("Mode interactif, tape 'quit' pour sortir.")
         while True:
@@ -137,6 +149,8 @@ def main():
                 break
             results = search_query(q, index)
             pretty_print_results(results, vocab)
+            if not results:
+                print_did_you_mean(q)
 
 
 if __name__ == "__main__":
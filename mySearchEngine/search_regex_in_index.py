@@ -1,11 +1,19 @@
 import os
 import json
 import sys
+from bisect import bisect_left
 from collections import defaultdict
 
 from NFA import regex_to_nfa          # ton code Aho–Ullman NFA :contentReference[oaicite:1]{index=1}
-from DFA import nfa_to_dfa, minimize_dfa_hopcroft, DFA  # ton code DFA + minimisation :contentReference[oaicite:2]{index=2}
-from Parser import DOT                # pour le symbole '.' (joker) :contentReference[oaicite:3]{index=3}
+from DFA import nfa_to_dfa, minimize_dfa_hopcroft, DFA, DFATooLarge  # ton code DFA + minimisation :contentReference[oaicite:2]{index=2}
+from Parser import parse              # arbre syntaxique de la RegEx (filtre de trigrammes)
+from ngram_index import load_or_build_trigram_index
+from regex_analysis import trigram_query, candidate_term_ids, required_literals
+from compiled_dfa import CompiledDFA, VocabularyMatrix
+from lazy_dfa import LazyDFA
+from bitparallel import BitParallelMatcher, choose_engine, count_positions, MAX_POSITIONS
+from AhoCorasick import AhoCorasick
+from dfa_store import load_or_compile
 
 # ========= Chemins =========
 
@@ -14,41 +22,180 @@ LIB_DIR = os.path.join(BASE_DIR, "library")
 INDEX_PATH = os.path.join(LIB_DIR, "index.json")
 VOCAB_PATH = os.path.join(LIB_DIR, "vocab.json")
 
+# ========= Limites des automates =========
+
+DFA_MAX_STATES = 2000       # au-delà : DFA paresseux au lieu de la déterminisation complète
+LAZY_DFA_STATES = 2000      # taille du cache d'états du DFA paresseux
+NFA_METHOD = "glushkov"     # automate des positions (sans ε) ; "thompson" possible
+
 
 # ========= Construction DFA à partir de la RegEx =========
 
 def build_dfa_from_regex(pattern: str) -> DFA:
     """
     Compile une RegEx en DFA minimal en utilisant TON pipeline Aho–Ullman :
-      RegEx -> NFA (Thompson) -> DFA (subset) -> DFA minimal (Hopcroft).
+      RegEx -> NFA (Glushkov, ou Thompson) -> DFA (subset) -> DFA minimal (Hopcroft).
     """
-    nfa = regex_to_nfa(pattern)
+    nfa = regex_to_nfa(pattern, method=NFA_METHOD)
     dfa = nfa_to_dfa(nfa)
     min_dfa = minimize_dfa_hopcroft(dfa)
     return min_dfa
 
 
+def build_matcher(pattern: str, max_dfa_states: int = DFA_MAX_STATES):
+    """
+    Automate exécutable pour la RegEx, choisi par choose_engine :
+      - RegEx courte (<= 64 symboles) : moteur bit-parallèle, rien à déterminiser ;
+      - sinon DFA minimal compilé si la déterminisation reste sous
+        max_dfa_states états (mis en cache sur disque entre deux exécutions),
+        sinon DFA paresseux (cache borné, repli Pike VM).
+    """
+    if choose_engine(pattern) == "kmp" or count_positions(pattern) <= MAX_POSITIONS:
+        return BitParallelMatcher(pattern)
+    try:
+        # DFA minimal lu dans le cache disque s'il a déjà été compilé (dfa_store.py)
+        return load_or_compile(pattern, NFA_METHOD, max_dfa_states).compiled
+    except DFATooLarge:
+        return LazyDFA(regex_to_nfa(pattern, method=NFA_METHOD), max_states=LAZY_DFA_STATES)
+
+
 # ========= Matching d'un MOT (clé de l'index) avec le DFA =========
 
-def dfa_match_word(dfa: DFA, word: str) -> bool:
+def dfa_match_word(dfa, word: str) -> bool:
     """
     Teste si le DFA accepte un mot COMPLET (token de l'index).
-    On suit les transitions du DFA caractère par caractère.
-    On gère aussi le joker '.' via DOT.
+    On passe par la forme compilée (table dense + classes de caractères) :
+    une transition = deux accès indexés, le joker '.' est la classe "autre".
+    """
+    return CompiledDFA.of(dfa).match(word)
+
+
+# ========= Parcours DFA × vocabulaire trié =========
+
+def dfa_step(dfa, state, ch: str):
+    """Une transition du DFA compilé (DEAD = état mort)."""
+    return CompiledDFA.of(dfa).step(state, ch)
+
+
+def _prefix_successor(prefix: str):
+    """Plus petite chaîne > tous les mots qui commencent par prefix (None si impossible)."""
+    last = ord(prefix[-1])
+    if last >= 0x10FFFF:
+        return None
+    return prefix[:-1] + chr(last + 1)
+
+
+def dfa_walk_vocabulary(dfa, terms, stats=None):
     """
-    state = dfa.start
-    for ch in word:
-        code = ord(ch)
-        trans = dfa.transitions.get(state, {})
-
-        if code in trans:            # transition exacte
-            state = trans[code]
-        elif DOT in trans:           # transition via joker '.'
-            state = trans[DOT]
+    Parcours en profondeur "à plat" du vocabulaire trié (vu comme un trie) :
+    stack[i] = état du DFA après les i premiers caractères du mot précédent.
+    Pour chaque mot on repart du plus long préfixe commun avec le précédent,
+    donc chaque préfixe partagé n'est simulé qu'une fois. Dès que le DFA meurt
+    sur un préfixe p, tous les mots qui commencent par p sont sautés (bisect).
+    dfa : DFA, CompiledDFA, LazyDFA ou BitParallelMatcher (état mort toujours "faux").
+    """
+    auto = CompiledDFA.of(dfa)
+    step, is_final = auto.step, auto.is_final
+    matched = []
+    stack = [auto.start]
+    prev = ""
+    steps = 0
+    visited = 0
+    i, n = 0, len(terms)
+
+    while i < n:
+        word = terms[i]
+        visited += 1
+
+        lcp = 0
+        limit = min(len(prev), len(word), len(stack) - 1)
+        while lcp < limit and word[lcp] == prev[lcp]:
+            lcp += 1
+        del stack[lcp + 1:]
+
+        state = stack[-1]
+        dead_at = -1
+        for j in range(lcp, len(word)):
+            state = step(state, word[j])
+            steps += 1
+            if not state:
+                dead_at = j
+                break
+            stack.append(state)
+
+        if dead_at < 0:
+            if is_final(state):
+                matched.append(word)
+            prev = word
+            i += 1
+            continue
+
+        # sous-arbre mort : on saute tous les mots de préfixe word[:dead_at + 1]
+        prev = word[:dead_at]
+        successor = _prefix_successor(word[:dead_at + 1])
+        i = n if successor is None else bisect_left(terms, successor, i + 1)
+
+    if stats is not None:
+        stats["words_visited"] = visited
+        stats["dfa_steps"] = steps
+    return matched
+
+
+# ========= Filtrage du vocabulaire par trigrammes =========
+
+def match_vocabulary(pattern: str, dfa, index: dict, ngram=None,
+                     matcher=None, stats=None):
+    """
+    Renvoie les mots de l'index acceptés par le DFA.
+    Si l'index de trigrammes est fourni, on extrait de la RegEx les trigrammes
+    que tout mot matché contient obligatoirement, et le DFA ne vérifie que
+    les termes candidats. Sans trigramme exploitable (ex: "(a|b)*"),
+    on parcourt tout le vocabulaire trié en avançant le DFA en même temps
+    (préfixes communs partagés, sous-arbres morts sautés).
+    Si la RegEx commence par un joker (ex: ".*ing"), aucun sous-arbre ne
+    meurt : si elle a des facteurs obligatoires (ex: ".*(ki|qu)ng"), les termes
+    qui contiennent l'un d'eux sont trouvés en une passe d'Aho–Corasick sur le
+    vocabulaire mis bout à bout, sinon on simule tout le vocabulaire par lots (NumPy).
+    """
+    if matcher is None:
+        matcher = dfa_match_word
+    cdfa = CompiledDFA.of(dfa)
+
+    tree = parse(pattern)
+    candidates = None
+    if ngram is not None:
+        candidates = candidate_term_ids(trigram_query(tree), ngram)
+
+    if candidates is not None:
+        prefilter = "trigram"
+        words = [ngram.terms[tid] for tid in sorted(candidates)]
+        matched = [w for w in words if matcher(cdfa, w)]
+        scanned = len(words)
+    else:
+        terms = ngram.terms if ngram is not None else sorted(index.keys())
+        # premier caractère quelconque accepté : le parcours du vocabulaire ne peut rien élaguer
+        wildcard_start = bool(cdfa.step(cdfa.start, "\0"))
+        factors = required_literals(tree) if wildcard_start else []
+        if factors:
+            prefilter = "aho_corasick"
+            words = [terms[tid] for tid in AhoCorasick(factors).terms_containing(terms)]
+            matched = [w for w in words if matcher(cdfa, w)]
+            scanned = len(words)
+        elif isinstance(cdfa, CompiledDFA) and cdfa.start_loops_on_any():
+            prefilter = "dfa_batch"
+            matrix = VocabularyMatrix.for_terms(terms)
+            matched = [terms[tid] for tid in cdfa.match_batch(matrix)]
+            scanned = len(terms)
         else:
-            return False
+            prefilter = "dfa_walk"
+            matched = dfa_walk_vocabulary(cdfa, terms, stats)
+            scanned = stats.get("words_visited", len(terms)) if stats is not None else len(terms)
 
-    return state in dfa.final_states
+    if stats is not None:
+        stats["prefilter"] = prefilter
+        stats["words_scanned"] = scanned
+        stats["words_matched"] = len(matched)
+    return matched
 
 
 # ========= Chargement de l'index =========
@@ -69,25 +216,28 @@ def load_index_and_vocab():
 
 # ========= Recherche RegEx sur l'INDEX =========
 
-def search_regex(pattern: str, index: dict, top_k: int = 20):
+def search_regex(pattern: str, index: dict, top_k: int = 20, ngram=None):
     """
     Recherche avancée avec RegEx :
-      1) Compile la RegEx en DFA (Aho–Ullman).
-      2) Teste la RegEx sur chaque mot de l'index (clé de index.json).
+      1) Compile la RegEx en DFA (Aho–Ullman), ou DFA paresseux si trop gros.
+      2) Teste la RegEx sur les mots de l'index (clés de index.json)
+         qui passent le filtre de trigrammes.
       3) Récupère tous les documents qui contiennent au moins un mot qui matche.
       4) Score du doc = somme des fréquences de tous les mots matchés.
     """
-    print(f"Compilation de la RegEx en DFA minimal : {pattern!r}")
-    dfa = build_dfa_from_regex(pattern)
-
-    matched_words = []
+    print(f"Compilation de la RegEx : {pattern!r}")
+    dfa = build_matcher(pattern)
+    if isinstance(dfa, BitParallelMatcher):
+        print(f"RegEx courte ({dfa.positions} symboles) : moteur bit-parallèle")
+    elif isinstance(dfa, LazyDFA):
+        print(f"DFA > {DFA_MAX_STATES} états : construction paresseuse (cache de {LAZY_DFA_STATES} états)")
+
+    matched_words = match_vocabulary(pattern, dfa, index, ngram)
     doc_scores = defaultdict(int)
 
-    for word, posting in index.items():
-        if dfa_match_word(dfa, word):
-            matched_words.append(word)
-            for doc_id, count in posting.items():
-                doc_scores[doc_id] += int(count)
+    for word in matched_words:
+        for doc_id, count in index[word].items():
+            doc_scores[doc_id] += int(count)
 
     if not doc_scores:
         print("Aucun mot de l'index ne matche cette RegEx.")
@@ -127,10 +277,11 @@ def pretty_print(pattern: str, results, matched_words, vocab):
 
 def main():
     index, vocab = load_index_and_vocab()
+    ngram = load_or_build_trigram_index(index)
 
     if len(sys.argv) > 1:
         pattern = " ".join(sys.argv[1:])
-        results, matched_words = search_regex(pattern, index)
+        results, matched_words = search_regex(pattern, index, ngram=ngram)
         pretty_print(pattern, results, matched_words, vocab)
     else:
         print("Mode interactif RegEx. Tape 'quit' pour sortir.")
@@ -146,7 +297,11 @@ def main():
                 print("Bye.")
                 break
 
-            results, matched_words = search_regex(pattern, index)
+            try:
+                results, matched_words = search_regex(pattern, index, ngram=ngram)
+            except SyntaxError as e:
+                print(f"RegEx invalide : {e}")
+                continue
             pretty_print(pattern, results, matched_words, vocab)
 
 
@@ -0,0 +1,127 @@
+import os
+import sys
+import json
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LIB_DIR = os.path.join(BASE_DIR, "library")
+
+TFIDF_PATH = os.path.join(LIB_DIR, "tfidf.npz")
+METADATA_PATH = os.path.join(LIB_DIR, "metadata.json")
+
+# Nombre de termes (les plus lourds) du document requête utilisés par défaut.
+# 0 = tous les termes.
+DEFAULT_QUERY_TERMS = 200
+
+
+class TfidfModel:
+    """
+    Vecteurs TF-IDF normalisés L2 (cf. build_tfidf.py), stockés en CSR :
+      ligne d → indices[indptr[d]:indptr[d+1]], data[indptr[d]:indptr[d+1]]
+    On garde aussi la transposée (CSC) pour parcourir, terme par terme,
+    les documents qui partagent un terme avec la requête.
+    """
+
+    def __init__(self, indptr, indices, data, doc_ids, n_terms):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.doc_ids = [str(d) for d in doc_ids]
+        self.row_of = {d: i for i, d in enumerate(self.doc_ids)}
+        self.n_docs = len(self.doc_ids)
+
+        rows = np.repeat(np.arange(self.n_docs, dtype=np.int32), np.diff(indptr))
+        order = np.argsort(indices, kind="stable")
+        self.col_rows = rows[order]
+        self.col_data = data[order]
+        self.col_indptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(indices, minlength=n_terms), out=self.col_indptr[1:])
+
+    def query_vector(self, row, top_terms=0):
+        start, end = self.indptr[row], self.indptr[row + 1]
+        cols, weights = self.indices[start:end], self.data[start:end]
+        if top_terms and len(cols) > top_terms:
+            keep = np.argpartition(weights, -top_terms)[-top_terms:]
+            cols, weights = cols[keep], weights[keep]
+        return cols, weights
+
+    def scores(self, cols, weights):
+        """Produits scalaires requête · document pour tous les documents (vectorisé)."""
+        starts = self.col_indptr[cols]
+        lengths = self.col_indptr[cols + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.zeros(self.n_docs, dtype=np.float64)
+
+        # positions de toutes les colonnes concaténées, sans boucle Python
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        pos = np.arange(total) + offsets
+        contrib = self.col_data[pos] * np.repeat(weights, lengths)
+        return np.bincount(self.col_rows[pos], weights=contrib, minlength=self.n_docs)
+
+    def similar(self, doc_id, k=10, top_terms=DEFAULT_QUERY_TERMS):
+        """Renvoie [(doc_id, cosinus)] des k documents les plus proches (doc lui-même exclu)."""
+        row = self.row_of.get(str(doc_id))
+        if row is None:
+            return None
+        cols, weights = self.query_vector(row, top_terms)
+        sims = self.scores(cols, weights)
+        sims[row] = -1.0
+
+        k = min(k, self.n_docs - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(sims, -k)[-k:]
+        top = top[np.argsort(-sims[top], kind="stable")]
+        return [(self.doc_ids[i], round(float(sims[i]), 6)) for i in top if sims[i] > 0]
+
+
+def load_tfidf(path=TFIDF_PATH):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"tfidf.npz introuvable : {path} (lancer build_tfidf.py)")
+    with np.load(path) as npz:
+        return TfidfModel(
+            npz["indptr"], npz["indices"], npz["data"], npz["doc_ids"], int(npz["n_terms"])
+        )
+
+
+def print_similar(doc_id, k=10):
+    model = load_tfidf()
+    results = model.similar(doc_id, k)
+    if results is None:
+        print(f"Doc {doc_id} absent des vecteurs TF-IDF.")
+        return
+    if not results:
+        print("Aucun document similaire.")
+        return
+
+    metadata = {}
+    if os.path.exists(METADATA_PATH):
+        with open(METADATA_PATH, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+
+    print(f"\nDocuments similaires (TF-IDF) au document {doc_id} :\n")
+    for i, (d, sim) in enumerate(results, start=1):
+        title = metadata.get(d, {}).get("title", f"Document #{d}")
+        print(f"{i:2d}. Doc {d} | sim={sim:.4f} | {title}")
+    print()
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage : python3 similar_books.py <doc_id> [k]")
+        sys.exit(1)
+
+    doc_id = sys.argv[1]
+    k = 10
+    if len(sys.argv) >= 3:
+        try:
+            k = int(sys.argv[2])
+        except ValueError:
+            pass
+
+    print_similar(doc_id, k=k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import re
+from collections import Counter
+
+from ngram_index import word_trigrams
+
+# ========= Correction orthographique ("did you mean") =========
+#
+# Génération des candidats par l'index de trigrammes : on ne regarde que les
+# termes qui partagent des trigrammes avec le mot inconnu (jamais tout le
+# vocabulaire), puis on classe par distance d'édition et fréquence documentaire.
+
+WORD_REGEX = re.compile(r"\b\w+\b")
+
+MAX_DISTANCE = 2        # distance d'édition max acceptée
+MAX_VERIFIED = 50       # nb de candidats (meilleur recouvrement) vérifiés par distance d'édition
+MAX_GRAM_POSTINGS = 2000  # trigrammes plus fréquents ("ing", "the"...) non parcourus, sauf le plus rare
+PRESELECTED = 4 * MAX_VERIFIED  # candidats dont le recouvrement exact est recalculé
+
+
+def edit_distance(a: str, b: str, max_dist: int = MAX_DISTANCE) -> int:
+    """
+    Distance de Damerau-Levenshtein (transpositions adjacentes comprises).
+    Renvoie max_dist + 1 dès que la distance dépasse max_dist.
+    """
+    if abs(len(a) - len(b)) > max_dist:
+        return max_dist + 1
+
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if (prev2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > max_dist:
+            return max_dist + 1
+        prev2, prev = prev, cur
+    return min(prev[-1], max_dist + 1)
+
+
+def correction_candidates(term, ngram, index, k=5, max_dist=MAX_DISTANCE):
+    """
+    Renvoie [(terme, distance, df)] classés par (distance, -df).
+    Lemme des q-grammes : une insertion, suppression ou substitution détruit au
+    plus 3 trigrammes, une transposition (Damerau) jusqu'à 4, donc un candidat
+    à distance <= max_dist partage au moins |G| - 4 * max_dist trigrammes avec
+    le terme. Les trigrammes de plus de MAX_GRAM_POSTINGS termes ne sont pas
+    parcourus (sauf le plus rare) : le recouvrement compté sur les autres ne
+    sert qu'à présélectionner, il est recalculé exactement avant la vérification.
+    """
+    grams = word_trigrams(term)
+    by_rarity = sorted(grams, key=lambda g: len(ngram.postings(g)))
+    overlap = Counter()
+    for i, gram in enumerate(by_rarity):
+        posting = ngram.postings(gram)
+        if i > 0 and len(posting) > MAX_GRAM_POSTINGS:
+            break
+        overlap.update(posting)
+
+    min_shared = max(1, len(grams) - 4 * max_dist)
+    pool = []
+    for tid, _ in overlap.most_common(PRESELECTED):
+        cand = ngram.terms[tid]
+        if abs(len(cand) - len(term)) <= max_dist:
+            shared = len(grams & word_trigrams(cand))
+            if shared >= min_shared:
+                pool.append((-shared, tid))
+    shortlisted = [tid for _, tid in sorted(pool)[:MAX_VERIFIED]]
+
+    scored = []
+    for tid in shortlisted:
+        cand = ngram.terms[tid]
+        if cand == term:
+            continue
+        dist = edit_distance(term, cand, max_dist)
+        if dist <= max_dist:
+            scored.append((cand, dist, len(index.get(cand, ()))))
+
+    scored.sort(key=lambda x: (x[1], -x[2], x[0]))
+    return scored[:k]
+
+
+def correct_query(query, index, ngram, normalize):
+    """
+    Réécrit la requête en remplaçant chaque mot absent de l'index par
+    sa meilleure correction (le vocabulaire est racinisé : on propose la racine).
+    Renvoie (requête corrigée ou None, détails par mot).
+    """
+    corrected = []
+    details = []
+    changed = False
+    for word in WORD_REGEX.findall(query.lower()):
+        stems = normalize(word)
+        if not stems or stems[0] in index:   # stopword ou mot connu
+            corrected.append(word)
+            continue
+        candidates = correction_candidates(stems[0], ngram, index)
+        details.append({
+            "word": word,
+            "candidates": [{"term": t, "distance": d, "df": df} for t, d, df in candidates],
+        })
+        if candidates:
+            corrected.append(candidates[0][0])
+            changed = True
+        else:
+            corrected.append(word)
+
+    return (" ".join(corrected) if changed else None), details
@@ -0,0 +1,129 @@
+"""
+Benchmark Aho–Corasick : alternatives de littéraux ("king|queen|prince|duke").
+  - egrep : ancien chemin (bit-parallèle / DFA sur toutes les lignes, aucun facteur
+    unique obligatoire) vs Aho–Corasick (préfiltre en une passe + matchs) ;
+  - vocabulaire, RegEx avec joker en tête : parcours DFA du vocabulaire trié
+    vs préfiltre Aho–Corasick.
+Usage : python3 bench_aho.py [livre.txt]   (sinon texte généré d'environ 5 Mo)
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mySearchEngine"))
+
+from bitparallel import BitParallelMatcher, count_positions, MAX_POSITIONS
+from matching import DFASearcher
+from bytescan import ByteScanner
+from parallel_scan import build_scanner
+from search_regex_in_index import build_matcher, dfa_walk_vocabulary, match_vocabulary
+from compiled_dfa import CompiledDFA
+
+# ---------------- CONFIG ----------------
+GENERATED_CHARS = 5_000_000
+VOCAB_SIZE = 200_000
+LOG_PATH = "perf_aho.txt"
+
+NAMES = ["king", "queen", "prince", "duke", "Babylon", "Nineveh", "Sargon", "Gilgamesh"]
+
+PATTERNS = [
+    "king|queen|prince|duke",
+    "(king|queen)(dom|ly)",
+    "|".join(NAMES),
+    "(" + "|".join(f"w{i}rd" for i in range(100)) + ")",
+    "(a|b)*(king|queen)s",                  # facteurs obligatoires, pas une alternative pure
+]
+
+# vocabulaire : le préfiltre ne sert que si le parcours DFA ne peut rien élaguer (joker en tête)
+VOCAB_PATTERNS = [
+    ".*(king|queen).*",
+    ".*(dom|ly)",
+    ".*(" + "|".join(f"w{i}rd" for i in range(100)) + ")",
+    ".*(ab|cd).*e",
+]
+
+random.seed(0)
+
+
+# ---------------- LOG FILE ----------------
+def log(text):
+    with open(LOG_PATH, "a") as f:
+        f.write(text + "\n")
+
+
+# ---------------- TEXTE ----------------
+def generate_text(n_chars):
+    """Lignes de mots courants ; environ une ligne sur 200 contient un nom recherché."""
+    words = ("the of and to in that was he for it with as his on be at by had which "
+             "there when where then from they this not all were we are but temple gold").split()
+    rare = NAMES + ["kingdom", "queenly", "w7rd", "abkings"]
+    lines = []
+    written = 0
+    while written < n_chars:
+        line = [random.choice(words) for _ in range(random.randint(6, 14))]
+        if random.random() < 0.005:
+            line[random.randrange(len(line))] = random.choice(rare)
+        line = " ".join(line)
+        lines.append(line)
+        written += len(line) + 1
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def generate_vocabulary(n):
+    letters = "abcdeghiklmnopqrstuwy"
+    vocab = {"".join(random.choice(letters) for _ in range(random.randint(2, 12))) for _ in range(n)}
+    return sorted(vocab | set(NAMES) | {"kingdom", "queenly", "abkings"})
+
+
+# ---------------- BENCHMARK ----------------
+def old_scanner(pattern):
+    """Avant Aho–Corasick : bit-parallèle (ou DFA) sur toutes les lignes, faute de facteur unique."""
+    matcher = BitParallelMatcher(pattern) if count_positions(pattern) <= MAX_POSITIONS else DFASearcher(pattern)
+    return ByteScanner(pattern, matcher, literal="")
+
+
+def timed_scan(scanner, buf):
+    t0 = time.perf_counter()
+    matches = list(scanner.scan(buf))
+    return time.perf_counter() - t0, matches
+
+
+if len(sys.argv) > 1:
+    with open(sys.argv[1], "rb") as f:
+        buf = f.read()
+else:
+    buf = generate_text(GENERATED_CHARS)
+size_mb = len(buf) / 1e6
+
+print(f"\n=== egrep : alternatives de littéraux ({size_mb:.2f} Mo) ===\n")
+print(f"{'RegEx':30} {'avant (Mo/s)':>13} {'Aho (Mo/s)':>11} {'gain':>7} {'mêmes matchs':>13}")
+for pattern in PATTERNS:
+    label = pattern if len(pattern) <= 30 else pattern[:27] + "..."
+    old = old_scanner(pattern)
+    new = build_scanner(pattern)                        # compilations hors mesure
+    old_s, old_matches = timed_scan(old, buf)
+    new_s, new_matches = timed_scan(new, buf)
+    same = old_matches == new_matches
+    print(f"{label:30} {size_mb / old_s:13.1f} {size_mb / new_s:11.1f} {old_s / new_s:6.1f}× {'✔' if same else '✘':>13}")
+    log(f"[egrep] {pattern[:60]} size={size_mb:.2f}MB before={old_s:.3f}s aho={new_s:.3f}s same={same}")
+
+vocab = generate_vocabulary(VOCAB_SIZE)
+index = dict.fromkeys(vocab)
+print(f"\n=== Vocabulaire ({len(vocab)} termes, sans index de trigrammes) ===\n")
+print(f"{'RegEx':30} {'parcours DFA (ms)':>18} {'Aho (ms)':>9} {'termes vérifiés':>16} {'mêmes mots':>11}")
+for pattern in VOCAB_PATTERNS:
+    label = pattern if len(pattern) <= 30 else pattern[:27] + "..."
+    dfa = build_matcher(pattern)
+    t0 = time.perf_counter()
+    walked = dfa_walk_vocabulary(CompiledDFA.of(dfa), vocab)
+    walk_s = time.perf_counter() - t0
+    stats = {}
+    t0 = time.perf_counter()
+    matched = match_vocabulary(pattern, dfa, index, stats=stats)
+    aho_s = time.perf_counter() - t0
+    same = sorted(walked) == sorted(matched)
+    print(f"{label:30} {walk_s * 1000:18.1f} {aho_s * 1000:9.1f} {stats['words_scanned']:16d} {'✔' if same else '✘':>11}")
+    log(f"[vocab] {pattern[:60]} terms={len(vocab)} walk={walk_s * 1000:.1f}ms "
+        f"{stats['prefilter']}={aho_s * 1000:.1f}ms scanned={stats['words_scanned']} same={same}")
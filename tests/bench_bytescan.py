@@ -0,0 +1,122 @@
+"""
+Benchmark egrep : parcours en octets (mmap + préfiltre bytes.find sur un facteur
+obligatoire) vs lecture ligne à ligne en str, pour chacun des trois moteurs.
+Usage : python3 bench_bytescan.py [livre.txt]   (sinon texte généré d'environ 5 Mo)
+"""
+
+import io
+import os
+import sys
+import time
+import random
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mySearchEngine"))
+
+from KMP import KMP
+from bitparallel import BitParallelMatcher
+from matching import DFASearcher, scan_lines_in_file
+from bytescan import ByteScanner
+
+# ---------------- CONFIG ----------------
+GENERATED_CHARS = 5_000_000
+LOG_PATH = "perf_bytescan.txt"
+TEXT_PATH = "bench_bytescan_text.txt"
+
+NAMES = ["Babylon", "Nineveh", "Assyria", "Sargon", "Hammurabi", "Nebuchadnezzar",
+         "Ashurbanipal", "Gilgamesh", "Enkidu", "Ishtar"]
+
+# (moteur, RegEx)
+CASES = [
+    ("kmp", "Sargon"),
+    ("kmp", "the"),
+    ("bitparallel", "S(a|g|r)+on"),
+    ("bitparallel", "king(dom|ly)"),
+    ("dfa", "(" + "|".join(NAMES) + ")"),
+    ("dfa", "(" + "|".join(n + "ian" for n in NAMES) + ")"),
+]
+
+random.seed(0)
+
+
+# ---------------- LOG FILE ----------------
+def log(text):
+    with open(LOG_PATH, "a") as f:
+        f.write(text + "\n")
+
+
+# ---------------- TEXTE ----------------
+def generate_text(path, n_chars):
+    """Lignes de mots courants ; environ une ligne sur 200 contient un mot recherché."""
+    words = ("the of and to in that was he for it with as his on be at by had which "
+             "there when where then from they this not all were we are but temple gold").split()
+    rare = NAMES + ["kingdom", "kingly", "Saron"]
+    with open(path, "w") as f:
+        written = 0
+        while written < n_chars:
+            line = [random.choice(words) for _ in range(random.randint(6, 14))]
+            if random.random() < 0.005:
+                line[random.randrange(len(line))] = random.choice(rare)
+            line = " ".join(line)
+            f.write(line + "\n")
+            written += len(line) + 1
+
+
+# ---------------- MOTEURS ----------------
+def line_scan(engine, pattern):
+    """Ancien parcours : lecture ligne à ligne, moteur sur chaque ligne."""
+    if engine == "kmp":
+        return KMP(pattern).search_in_file
+    if engine == "bitparallel":
+        return BitParallelMatcher(pattern).search_in_file
+    searcher = DFASearcher(pattern)
+    return lambda path: scan_lines_in_file(searcher, path)
+
+
+def byte_scan(engine, pattern):
+    if engine == "kmp":
+        return ByteScanner(pattern, KMP(pattern), literal=pattern)
+    if engine == "bitparallel":
+        return ByteScanner(pattern, BitParallelMatcher(pattern))
+    return ByteScanner(pattern, DFASearcher(pattern))
+
+
+# ---------------- BENCHMARK ----------------
+def timed(fn, *args):
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        t0 = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - t0
+    return elapsed, out.getvalue()
+
+
+def matched_lines(output):
+    return {line.split(",")[0] for line in output.splitlines() if line.startswith("Match found")}
+
+
+if len(sys.argv) > 1:
+    path = sys.argv[1]
+else:
+    path = TEXT_PATH
+    generate_text(path, GENERATED_CHARS)
+size_mb = os.path.getsize(path) / 1e6
+
+print(f"\n=== Benchmark parcours en octets ({path}, {size_mb:.2f} Mo) ===\n")
+print(f"{'moteur':12} {'RegEx':22} {'littéral':>10} {'lignes (Mo/s)':>14} {'octets (Mo/s)':>14} "
+      f"{'gain':>7} {'mêmes lignes':>13}")
+
+for engine, pattern in CASES:
+    label = pattern if len(pattern) <= 22 else pattern[:19] + "..."
+    scanner = byte_scan(engine, pattern)            # compilations hors mesure
+    old_s, old_out = timed(line_scan(engine, pattern), path)
+    new_s, new_out = timed(scanner.search_in_file, path)
+    same = matched_lines(old_out) == matched_lines(new_out)
+    literal = scanner.literal.decode()
+
+    print(f"{engine:12} {label:22} {literal[:10]:>10} {size_mb / old_s:14.1f} {size_mb / new_s:14.1f} "
+          f"{old_s / new_s:6.1f}× {'✔' if same else '✘':>13}")
+    log(f"[{engine}] {pattern} literal={literal!r} size={size_mb:.2f}MB "
+        f"lines={old_s:.3f}s bytes={new_s:.3f}s same_lines={same}")
+
+if path == TEXT_PATH:
+    os.remove(path)
@@ -0,0 +1,102 @@
+"""
+Benchmark NFA : Thompson (transitions ε) vs Glushkov (automate des positions)
+Sur les RegEx des tests : construction du NFA, déterminisation, simulation.
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mySearchEngine"))
+
+from NFA import regex_to_nfa
+from DFA import nfa_to_dfa
+from compiled_dfa import CompiledDFA
+from lazy_dfa import PikeVM
+
+# ---------------- CONFIG ----------------
+REPEAT = 5
+N_WORDS = 5000
+LOG_PATH = "perf_glushkov.txt"
+
+random.seed(0)
+
+# RegEx de test_search_regex.py + exemples de Parser.py + une longue alternance
+PATTERNS = [
+    "king(dom|ly)",
+    ".*king",
+    "s(a|e|o)+rgon",
+    "daar(.)+",
+    "(a|b)*c",
+    "a|(b|c)d",
+    "(ab)*c",
+    "(ba)+",
+    "S(a|g|r)+on",
+    "(" + "|".join(f"word{i:03d}" for i in range(200)) + ")",
+]
+
+WORDS = ["".join(random.choice("abcdegiklnorsy") for _ in range(random.randint(3, 10)))
+         for _ in range(N_WORDS)]
+WORDS += ["king", "kingdom", "kingly", "sargon", "seorgon", "daarx", "abababc", "Sargon"]
+
+
+# ---------------- LOG FILE ----------------
+def log(text):
+    with open(LOG_PATH, "a") as f:
+        f.write(text + "\n")
+
+
+# ---------------- BENCHMARK ----------------
+def measure(fn, repeat=REPEAT):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def n_transitions(nfa):
+    return sum(len(dests) for trans in nfa.transitions.values() for dests in trans.values())
+
+
+def bench(pattern, method):
+    nfa_ms, nfa = measure(lambda: regex_to_nfa(pattern, method=method))
+    dfa_ms, dfa = measure(lambda: nfa_to_dfa(nfa))
+    vm = PikeVM(nfa)
+    sim_ms, sim = measure(lambda: [vm.match(w) for w in WORDS], repeat=1)
+    cdfa = CompiledDFA(dfa)
+    return {
+        "nfa_states": nfa.count_id,
+        "nfa_trans": n_transitions(nfa),
+        "nfa_ms": nfa_ms,
+        "dfa_ms": dfa_ms,
+        "dfa_states": len(dfa.transitions),
+        "sim_ms": sim_ms,
+        "matches": sim,
+        "dfa_matches": [cdfa.match(w) for w in WORDS],
+    }
+
+
+print("\n=== Benchmark Thompson vs Glushkov ===\n")
+print(f"{'RegEx':24} {'NFA':>6} {'états':>12} {'trans.':>12} {'NFA ms':>8} "
+      f"{'subset ms':>10} {'simu ms':>9} {'même langage':>13}")
+
+for pattern in PATTERNS:
+    label = pattern if len(pattern) <= 24 else pattern[:21] + "..."
+    res = {m: bench(pattern, m) for m in ("thompson", "glushkov")}
+    same = (res["thompson"]["matches"] == res["glushkov"]["matches"]
+            == res["thompson"]["dfa_matches"] == res["glushkov"]["dfa_matches"])
+
+    for method, r in res.items():
+        print(f"{label:24} {method[:6]:>6} {r['nfa_states']:12d} {r['nfa_trans']:12d} "
+              f"{r['nfa_ms']:8.2f} {r['dfa_ms']:10.2f} {r['sim_ms']:9.2f} "
+              f"{('✔' if same else '✘') if method == 'glushkov' else '':>13}")
+        log(f"[{pattern[:40]}] {method} nfa_states={r['nfa_states']} nfa={r['nfa_ms']:.2f}ms "
+            f"subset={r['dfa_ms']:.2f}ms simu={r['sim_ms']:.2f}ms")
+        label = ""
+
+    speedup = res["thompson"]["dfa_ms"] / max(res["glushkov"]["dfa_ms"], 1e-6)
+    print(f"{'':24} → déterminisation ×{speedup:.1f}\n")
@@ -0,0 +1,187 @@
+"""
+Benchmark minimisation : Hopcroft O(n·k·log n) vs ancienne version
+DFA de plusieurs milliers d'états (alternances de mots, DFA aléatoires, (a|b)*a(a|b)^k).
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mySearchEngine"))
+
+from NFA import regex_to_nfa
+from typing import Dict, FrozenSet, List, Set, Tuple
+from DFA import DFA, nfa_to_dfa, minimize_dfa_hopcroft, dfa_states, extract_symbols_dfa
+from compiled_dfa import CompiledDFA
+
+# ---------------- CONFIG ----------------
+LEGACY_MAX_STATES = 3000        # l'ancienne version devient trop lente au-delà
+N_CHECK_WORDS = 2000
+LOG_PATH = "perf_hopcroft.txt"
+
+random.seed(0)
+
+
+# ---------------- LOG FILE ----------------
+def log(text):
+    with open(LOG_PATH, "a") as f:
+        f.write(text + "\n")
+
+
+# ---------------- ANCIENNE MINIMISATION ----------------
+# Recherche des prédécesseurs en parcourant toutes les transitions à chaque
+# (groupe, symbole), et fausse sur les DFA partiels (ex: "(d|id)" acceptait "iid") :
+# l'implémentation remplacée, gardée ici comme référence.
+def minimize_dfa_hopcroft_legacy(dfa: DFA) -> DFA:
+    all_states = dfa_states(dfa)
+    alphabet = extract_symbols_dfa(dfa)
+
+    final_states = dfa.final_states
+    non_final_states = all_states - final_states
+
+    partitions: List[FrozenSet[int]] = []
+
+    if final_states:
+        partitions.append(frozenset(final_states))
+    if non_final_states:
+        partitions.append(frozenset(non_final_states))
+
+    worklist: Set[Tuple[FrozenSet[int], int]] = set()
+
+    if partitions:
+        smallest_group = min(partitions, key = len )
+        for symbol in alphabet:
+            worklist.add((smallest_group, symbol))
+
+    while worklist:
+        current_group, symbol = worklist.pop()
+
+        predecessors = set()
+        for state, transitions in dfa.transitions.items():
+            if transitions.get(symbol) in current_group:
+                predecessors.add(state)
+
+        new_partitions: List[FrozenSet[int]] = []
+
+        for group in partitions:
+            intersect = frozenset(group & predecessors)
+            difference = frozenset(group - predecessors)
+
+            if intersect and difference:
+                new_partitions.extend([intersect, difference])
+
+                for sym in alphabet:
+                    if (group, sym) in worklist:
+                        worklist.remove((group, sym))
+                        worklist.add((intersect, sym))
+                        worklist.add((difference, sym))
+                    else:
+                        smaller = intersect if len(intersect) <= len(difference) else difference
+                        worklist.add((smaller, sym))
+            else:
+                new_partitions.append(group)
+
+        partitions = new_partitions
+
+    minimized_dfa = DFA()
+
+    state_to_group_id: Dict[int, int] = {}
+    for group_id, group in enumerate(partitions):
+        for state in group:
+            state_to_group_id[state] = group_id
+
+    if dfa.start is not None:
+        minimized_dfa.start = state_to_group_id[dfa.start]
+
+    for state in final_states:
+        minimized_dfa.final_states.add(state_to_group_id[state])
+
+    for state, transitions in dfa.transitions.items():
+        for symbol, next_state in transitions.items():
+            minimized_dfa.add_transition(
+                state_to_group_id[state],
+                symbol,
+                state_to_group_id[next_state]
+            )
+
+    return minimized_dfa
+
+
+# ---------------- DFA DE TEST ----------------
+def words_alternation(n_words):
+    """Trie des mots (DFA partiel) : la minimisation fusionne les suffixes communs."""
+    words = {"".join(random.choice("abcdefgh") for _ in range(random.randint(4, 9)))
+             for _ in range(n_words)}
+    return nfa_to_dfa(regex_to_nfa("(" + "|".join(sorted(words)) + ")", method="glushkov"))
+
+
+def random_dfa(n_states, alphabet="abcd"):
+    """DFA complet aléatoire, tous les états accessibles depuis 0."""
+    dfa = DFA()
+    dfa.start = 0
+    for q in range(1, n_states):                    # arbre couvrant : q accessible
+        dfa.add_transition(random.randrange(q), ord(random.choice(alphabet)), q)
+    for q in range(n_states):
+        for c in alphabet:
+            if ord(c) not in dfa.transitions.get(q, {}):
+                dfa.add_transition(q, ord(c), random.randrange(n_states))
+    dfa.final_states = {q for q in range(n_states) if random.random() < 0.3}
+    return dfa
+
+
+def shift_pattern(k):
+    """(a|b)*a(a|b)^k : 2^(k+1) états, déjà minimal."""
+    return nfa_to_dfa(regex_to_nfa("(a|b)*a" + "(a|b)" * k, method="glushkov"))
+
+
+CASES = [
+    ("alternance 500 mots", lambda: words_alternation(500)),
+    ("alternance 2000 mots", lambda: words_alternation(2000)),
+    ("alternance 5000 mots", lambda: words_alternation(5000)),
+    ("aléatoire 1000 états", lambda: random_dfa(1000)),
+    ("aléatoire 3000 états", lambda: random_dfa(3000)),
+    ("aléatoire 10000 états", lambda: random_dfa(10000)),
+    ("(a|b)*a(a|b)^9", lambda: shift_pattern(9)),
+    ("(a|b)*a(a|b)^11", lambda: shift_pattern(11)),
+]
+
+
+# ---------------- BENCHMARK ----------------
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - t0) * 1000, result
+
+
+def same_language(a, b, alphabet="abcdefgh"):
+    ca, cb = CompiledDFA(a), CompiledDFA(b)
+    words = ["".join(random.choice(alphabet) for _ in range(random.randint(0, 12)))
+             for _ in range(N_CHECK_WORDS)]
+    return all(ca.match(w) == cb.match(w) for w in words)
+
+
+print("\n=== Benchmark minimisation de Hopcroft ===\n")
+print(f"{'DFA':24} {'états':>7} {'minimal':>8} {'nouveau (ms)':>13} "
+      f"{'ancien (ms)':>12} {'ancien états':>13} {'langage':>8}")
+
+for name, make in CASES:
+    dfa = make()
+    n_before = len(dfa_states(dfa))
+
+    new_ms, min_dfa = timed(minimize_dfa_hopcroft, dfa)
+    n_after = len(dfa_states(min_dfa))
+    same = same_language(dfa, min_dfa)
+
+    if n_before <= LEGACY_MAX_STATES:
+        old_ms, old_dfa = timed(minimize_dfa_hopcroft_legacy, dfa)
+        old_txt = f"{old_ms:12.1f} {len(dfa_states(old_dfa)):13d}"
+    else:
+        old_ms, old_txt = None, f"{'-':>12} {'-':>13}"
+
+    print(f"{name:24} {n_before:7d} {n_after:8d} {new_ms:13.1f} {old_txt} {'✔' if same else '✘':>8}")
+    log(f"[{name}] states={n_before}->{n_after} new={new_ms:.1f}ms "
+        f"old={'-' if old_ms is None else f'{old_ms:.1f}ms'}")
+
+print("\n'ancien états' différent de 'minimal' : l'ancienne version fusionnait à tort des états")
+print("des DFA partiels (transitions manquantes = état puits) et en laissait d'équivalents séparés.")
@@ -0,0 +1,89 @@
+"""
+Benchmark des littéraux purs : KMP vs Boyer–Moore–Horspool vs str.find, sur
+les livres passés en argument (Gutenberg), et egrep -c (bytes.find, sans
+formatage des matchs). Vérifie que les trois moteurs trouvent les mêmes occurrences.
+Usage : python3 bench_literal.py [livre1.txt livre2.txt ...]   (sinon texte généré d'environ 5 Mo)
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mySearchEngine"))
+
+from KMP import KMP
+from BMH import BMH, StrFind, choose_literal_engine
+from parallel_scan import build_scanner
+
+# ---------------- CONFIG ----------------
+GENERATED_CHARS = 5_000_000
+LOG_PATH = "perf_literal.txt"
+
+PATTERNS = ["on", "the", "and", "Sargon", "temple of", "Mesopotamia", "the kingdom of Babylon"]
+
+random.seed(0)
+
+
+# ---------------- LOG FILE ----------------
+def log(text):
+    with open(LOG_PATH, "a") as f:
+        f.write(text + "\n")
+
+
+# ---------------- TEXTE ----------------
+def generate_text(n_chars):
+    words = ("the of and to in that was he for it with as his on be at by had which "
+             "there when where then from they this not all were we are but temple gold").split()
+    rare = ["Sargon", "Mesopotamia", "kingdom of Babylon"]
+    lines = []
+    written = 0
+    while written < n_chars:
+        line = [random.choice(words) for _ in range(random.randint(6, 14))]
+        if random.random() < 0.005:
+            line[random.randrange(len(line))] = random.choice(rare)
+        line = " ".join(line)
+        lines.append(line)
+        written += len(line) + 1
+    return "\n".join(lines) + "\n"
+
+
+# ---------------- BENCHMARK ----------------
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def occurrences(matcher, text):
+    return [start for start, _ in matcher.finditer(text)]
+
+
+if len(sys.argv) > 1:
+    texts = []
+    for path in sys.argv[1:]:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            texts.append(f.read())
+    text = "\n".join(texts)
+    source = f"{len(sys.argv) - 1} livre(s)"
+else:
+    text = generate_text(GENERATED_CHARS)
+    source = "texte généré"
+buf = text.encode("utf-8")
+size_mb = len(buf) / 1e6
+
+print(f"\n=== Littéraux purs ({source}, {size_mb:.2f} Mo) ===\n")
+print(f"{'motif':24} {'choix':>6} {'occ.':>7} {'KMP (Mo/s)':>11} {'BMH (Mo/s)':>11} "
+      f"{'find (Mo/s)':>12} {'egrep -c (Mo/s)':>16} {'mêmes occ.':>11}")
+
+for pattern in PATTERNS:
+    kmp_s, kmp_occ = timed(occurrences, KMP(pattern), text)
+    bmh_s, bmh_occ = timed(occurrences, BMH(pattern), text)
+    find_s, find_occ = timed(occurrences, StrFind(pattern), text)
+    scanner = build_scanner(pattern)
+    count_s, lines = timed(scanner.count, buf)
+    same = kmp_occ == bmh_occ == find_occ
+    print(f"{pattern:24} {choose_literal_engine(pattern):>6} {len(find_occ):7d} {size_mb / kmp_s:11.1f} "
+          f"{size_mb / bmh_s:11.1f} {size_mb / find_s:12.1f} {size_mb / count_s:16.1f} {'✔' if same else '✘':>11}")
+    log(f"[{pattern}] size={size_mb:.2f}MB occ={len(find_occ)} lines={lines} kmp={kmp_s:.3f}s "
+        f"bmh={bmh_s:.3f}s find={find_s:.3f}s egrep_count={count_s:.3f}s same={same}")
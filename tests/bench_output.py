@@ -0,0 +1,124 @@
+"""
+Benchmark de la sortie des matchs (egrep) :
+  - print coloré par match (ancien affichage) vs MatchWriter par paquets
+    (coloré, sans couleur, -o) vs -c (aucun formatage) ;
+  - egrep() sur une RegEx DFA : --bench (DFA minimal + non minimisé) vs passage unique.
+La sortie va dans os.devnull : on mesure le formatage et les appels d'écriture, pas le terminal.
+Usage : python3 bench_output.py [livre.txt]   (sinon texte généré d'environ 5 Mo)
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mySearchEngine"))
+
+from parallel_scan import build_scanner
+from match_output import MatchWriter, print_match
+from egrep import egrep
+
+# ---------------- CONFIG ----------------
+GENERATED_CHARS = 5_000_000
+LOG_PATH = "perf_output.txt"
+
+PATTERNS = ["the", "king|queen", "t(h|o)e", "Sargon"]
+# plus de 64 symboles : moteur "dfa", le seul que --bench passe deux fois
+DFA_PATTERN = "(" + "|".join(f"w{i}r+d" for i in range(30)) + ")"
+
+random.seed(0)
+
+
+# ---------------- LOG FILE ----------------
+def log(text):
+    with open(LOG_PATH, "a") as f:
+        f.write(text + "\n")
+
+
+# ---------------- TEXTE ----------------
+def generate_text(n_chars):
+    words = ("the of and to in that was he for it with as his on be at by had which "
+             "there when where then from they this not all were we are but temple gold").split()
+    rare = ["king", "queen", "Sargon", "w7rrd", "w21rd"]
+    lines = []
+    written = 0
+    while written < n_chars:
+        line = [random.choice(words) for _ in range(random.randint(6, 14))]
+        if random.random() < 0.05:
+            line[random.randrange(len(line))] = random.choice(rare)
+        line = " ".join(line)
+        lines.append(line)
+        written += len(line) + 1
+    return "\n".join(lines) + "\n"
+
+
+# ---------------- BENCHMARK ----------------
+def timed(fn, *args, **kwargs):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        t0 = time.perf_counter()
+        result = fn(*args, **kwargs)
+        return time.perf_counter() - t0, result
+
+
+def per_match_print(scanner, buf):
+    lines = set()
+    for record in scanner.scan(buf):
+        lines.add(record.line_no)
+        print_match(*record)
+    return len(lines)
+
+
+def batched(scanner, buf, color, only_matching=False):
+    lines = set()
+    with MatchWriter(sys.stdout, only_matching=only_matching, color=color) as writer:
+        for record in scanner.scan(buf):
+            lines.add(record.line_no)
+            writer.write(record)
+    return len(lines)
+
+
+if len(sys.argv) > 1:
+    with open(sys.argv[1], "r", encoding="utf-8", errors="ignore") as f:
+        text = f.read()
+    source = os.path.basename(sys.argv[1])
+else:
+    text = generate_text(GENERATED_CHARS)
+    source = "texte généré"
+buf = text.encode("utf-8")
+size_mb = len(buf) / 1e6
+
+print(f"\n=== Affichage des matchs ({source}, {size_mb:.2f} Mo) ===\n")
+print(f"{'RegEx':14} {'matchs':>8} {'print (s)':>10} {'paquets (s)':>12} {'sans couleur (s)':>17} "
+      f"{'-o (s)':>8} {'-c (s)':>8} {'gain':>7} {'mêmes lignes':>13}")
+
+for pattern in PATTERNS:
+    scanner = build_scanner(pattern)
+    n_matches = sum(1 for _ in scanner.scan(buf))
+    print_s, print_lines = timed(per_match_print, scanner, buf)
+    color_s, color_lines = timed(batched, scanner, buf, True)
+    plain_s, plain_lines = timed(batched, scanner, buf, False)
+    only_s, only_lines = timed(batched, scanner, buf, False, True)
+    count_s, count = timed(scanner.count, buf)
+    same = print_lines == color_lines == plain_lines == only_lines == count
+    print(f"{pattern:14} {n_matches:8d} {print_s:10.3f} {color_s:12.3f} {plain_s:17.3f} "
+          f"{only_s:8.3f} {count_s:8.3f} {print_s / plain_s:6.1f}× {'✔' if same else '✘':>13}")
+    log(f"[output] {pattern} size={size_mb:.2f}MB matches={n_matches} print={print_s:.3f}s "
+        f"batched_color={color_s:.3f}s batched_plain={plain_s:.3f}s only={only_s:.3f}s "
+        f"count={count_s:.3f}s same={same}")
+
+with tempfile.NamedTemporaryFile("wb", suffix=".txt", delete=False) as f:
+    f.write(buf)
+    path = f.name
+try:
+    timed(egrep, DFA_PATTERN, path)                         # DFA compilés hors mesure
+    bench_s, bench_result = timed(egrep, DFA_PATTERN, path, bench=True)
+    single_s, single_found = timed(egrep, DFA_PATTERN, path)
+finally:
+    os.remove(path)
+same = bench_result[0] == single_found
+print(f"\n=== egrep, moteur DFA ({len(DFA_PATTERN)} caractères de RegEx) ===\n")
+print(f"{'--bench (s)':>12} {'normal (s)':>11} {'gain':>7} {'même résultat':>14}")
+print(f"{bench_s:12.3f} {single_s:11.3f} {bench_s / single_s:6.1f}× {'✔' if same else '✘':>14}")
+log(f"[egrep] dfa size={size_mb:.2f}MB bench={bench_s:.3f}s single={single_s:.3f}s same={same}")
@@ -0,0 +1,93 @@
+"""
+Benchmark egrep parallèle : temps et accélération selon le nombre de processus
+(1, 2, 4, ... jusqu'au nombre de coeurs), mêmes matchs que la version séquentielle.
+Usage : python3 bench_parallel.py [corpus.txt]   (sinon texte généré d'environ 50 Mo)
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mySearchEngine"))
+
+from parallel_scan import build_scanner, parallel_search
+
+# ---------------- CONFIG ----------------
+GENERATED_CHARS = 50_000_000
+LOG_PATH = "perf_parallel.txt"
+TEXT_PATH = "bench_parallel_text.txt"
+
+PATTERNS = [
+    "Sargon",                                                   # littéral rare : limité par la mémoire
+    "S(a|g|r)+on",                                              # littéral fréquent ("on")
+    "(th|wh)e(n|re)",                                           # bit-parallèle sur presque toutes les lignes
+    "(" + "|".join(f"w{i}rd" for i in range(40)) + "|temple)",  # DFA, sans littéral
+]
+
+random.seed(0)
+
+
+# ---------------- LOG FILE ----------------
+def log(text):
+    with open(LOG_PATH, "a") as f:
+        f.write(text + "\n")
+
+
+# ---------------- TEXTE ----------------
+def generate_text(path, n_chars):
+    words = ("the of and to in that was he for it with as his on be at by had which "
+             "there when where then from they this not all were we are but temple gold").split()
+    with open(path, "w") as f:
+        written = 0
+        while written < n_chars:
+            block = []
+            for _ in range(1000):
+                line = [random.choice(words) for _ in range(random.randint(6, 14))]
+                if random.random() < 0.005:
+                    line[random.randrange(len(line))] = "Sargon"
+                block.append(" ".join(line))
+            block = "\n".join(block) + "\n"
+            f.write(block)
+            written += len(block)
+
+
+# ---------------- BENCHMARK ----------------
+def run(scanner, path, jobs):
+    t0 = time.perf_counter()
+    matches = list(parallel_search(scanner, path, jobs))
+    return time.perf_counter() - t0, matches
+
+
+if len(sys.argv) > 1:
+    path = sys.argv[1]
+else:
+    path = TEXT_PATH
+    generate_text(path, GENERATED_CHARS)
+size_mb = os.path.getsize(path) / 1e6
+
+cores = os.cpu_count() or 1
+jobs_list = [1]
+while jobs_list[-1] * 2 <= cores:
+    jobs_list.append(jobs_list[-1] * 2)
+if jobs_list[-1] != cores:
+    jobs_list.append(cores)
+
+print(f"\n=== Benchmark egrep parallèle ({path}, {size_mb:.1f} Mo, {cores} coeurs) ===\n")
+print(f"{'RegEx':24} {'processus':>9} {'temps (s)':>10} {'Mo/s':>8} {'accélération':>13} {'mêmes matchs':>13}")
+
+for pattern in PATTERNS:
+    label = pattern if len(pattern) <= 24 else pattern[:21] + "..."
+    scanner = build_scanner(pattern)
+    base_s, base = run(scanner, path, 1)
+    for jobs in jobs_list:
+        elapsed, matches = (base_s, base) if jobs == 1 else run(scanner, path, jobs)
+        same = matches == base
+        print(f"{label:24} {jobs:9d} {elapsed:10.3f} {size_mb / elapsed:8.1f} "
+              f"{base_s / elapsed:12.2f}× {'✔' if same else '✘':>13}")
+        log(f"[{pattern[:40]}] jobs={jobs} time={elapsed:.3f}s speedup={base_s / elapsed:.2f} same={same}")
+        label = ""
+    print()
+
+if path == TEXT_PATH:
+    os.remove(path)
@@ -0,0 +1,228 @@
+"""
+Benchmark Parser : nouveau parseur (descente récursive) vs ancien (parse_legacy)
+Motifs de longueur croissante → le temps par caractère doit rester constant.
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mySearchEngine"))
+sys.setrecursionlimit(100000)   # les arbres ALT sont profonds (associatifs à gauche)
+
+from typing import List
+from Parser import parse, RegExTree, CONCAT, STAR, PLUS, ALT, PROT, DOT, LPAR, RPAR
+
+# ---------------- CONFIG ----------------
+SIZES = [250, 500, 1000, 2000, 4000, 8000]
+LEGACY_MAX_SIZE = 2000          # l'ancien parseur devient trop lent au-delà
+REPEAT = 5
+LOG_PATH = "perf_parser.txt"
+
+random.seed(0)
+
+
+# ---------------- LOG FILE ----------------
+def log(text):
+    with open(LOG_PATH, "a") as f:
+        f.write(text + "\n")
+
+
+# ---------------- ANCIEN PARSEUR ----------------
+# Réécritures successives de la liste de tokens, quadratique (chaque passe
+# recopie toute la liste) : l'implémentation remplacée, gardée ici comme référence.
+
+def char_to_root(c: str) -> int:
+    if c == ".": return DOT
+    if c == "*": return STAR
+    if c == "+": return PLUS
+    if c == "|": return ALT
+    if c == "(": return LPAR
+    if c == ")": return RPAR
+    return ord(c)
+
+
+def parse_legacy(regex: str) -> RegExTree:
+    token_list = [RegExTree(char_to_root(c), []) for c in regex]
+    return parse_tokens(token_list)
+
+def parse_tokens(token_list: List[RegExTree]) -> RegExTree:
+    while contain_par(token_list):
+        token_list = process_par(token_list)
+
+    while contain_star(token_list):
+        token_list = process_star(token_list)
+
+    while contain_plus(token_list):
+        token_list = process_plus(token_list)
+
+    while contain_cont(token_list):
+        token_list = process_cont(token_list)
+
+    while contain_alt(token_list):
+        token_list = process_alt(token_list)
+
+    if len(token_list) != 1:
+        return RegExTree(PROT, token_list)
+    return remove_prot(token_list[0])
+
+def remove_prot(token : RegExTree) -> RegExTree:
+    if not token.subs: return token
+    if token.root == PROT: return remove_prot(token.subs[0])
+    return RegExTree(token.root,[remove_prot(x) for x in token.subs])
+
+# -------------- Traitement des parenthèses --------------
+def contain_par(token_list: List[RegExTree]) -> bool:
+    return any(token.root == LPAR or token.root == RPAR for token in token_list)
+
+def process_par(token_list: List[RegExTree]) -> List[RegExTree]:
+    right_par = next(i for i, token in enumerate(token_list) if token.root == RPAR)
+    left_par = max(j for j in range(right_par) if token_list[j].root == LPAR)
+    sub = parse_tokens(token_list[left_par + 1: right_par])
+    return token_list[:left_par] + [RegExTree(PROT, [sub])] + token_list[right_par + 1:]
+
+# -------------- Traitement des concatenations --------------
+def contain_cont(token_list: List[RegExTree]) -> bool:
+    for i in range(len(token_list) - 1):
+        if token_list[i].root != ALT and token_list[i+1].root != ALT:
+            return True
+    return False
+
+
+def process_cont(token_list: List[RegExTree]) -> List[RegExTree]:
+    out = []
+    changed = False
+    i = 0
+    while i < len(token_list):
+        if i+1 < len(token_list) and token_list[i].root != ALT and token_list[i+1].root != ALT:
+            out.append(RegExTree(CONCAT, [token_list[i], token_list[i+1]]))
+            changed = True
+            i += 2
+        else:
+            out.append(token_list[i])
+            i += 1
+    return out if changed else token_list
+
+# -------------- Traitement des concatenations --------------
+def contain_star(token_list : List[RegExTree]) -> bool:
+    return any(token.root == STAR and not token.subs for token in token_list)
+
+def process_star(token_list : List[RegExTree]) -> List[RegExTree]:
+    out = []
+    found = False
+    for token in token_list:
+        if not found and token.root == STAR and not token.subs:
+            if not out: raise SyntaxError("Star without a previous token")
+            found = True
+            out[-1] = RegExTree(STAR, [out[-1]])
+        else:
+            out.append(token)
+    return out
+
+# -------------- Traitement des opérations PLUS -------------- ( à faire)
+def contain_plus(token_list : List[RegExTree]) -> bool:
+    return any(token.root == PLUS and not token.subs for token in token_list)
+
+def process_plus(token_list : List[RegExTree]) -> List[RegExTree]:
+    out = []
+    found = False
+    for token in token_list:
+        if not found and token.root == PLUS and not token.subs:
+            if not out: raise SyntaxError("PLUS without a previous token")
+            found = True
+            out[-1] = RegExTree(PLUS, [out[-1]])
+        else:
+            out.append(token)
+    return out
+
+
+# -------------- Traitement des alternatives --------------
+def contain_alt(token_list : List[RegExTree]) -> bool:
+    return any(token.root == ALT and not token.subs for token in token_list)
+
+def process_alt(token_list: List[RegExTree]) -> List[RegExTree]:
+    out = []
+    found = False
+    left = None
+    for token in token_list:
+        if not found and token.root == ALT and not token.subs:
+            if not out:
+                raise SyntaxError("Alt without a previous token")
+            found = True
+            left = out.pop()
+        elif found:
+            out.append(RegExTree(ALT, [left, token]))
+            found = False
+            left = None
+        else:
+            out.append(token)
+    return out
+
+
+# ---------------- FAMILLES DE MOTIFS ----------------
+def random_word():
+    return "".join(random.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(random.randint(3, 8)))
+
+
+def words_alternation(size):
+    """(mot1|mot2|...|motN) : la RegEx typique d'une liste de mots."""
+    words = []
+    while sum(len(w) + 1 for w in words) < size:
+        words.append(random_word())
+    return "(" + "|".join(words) + ")"
+
+
+def long_literal(size):
+    return "".join(random.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(size))
+
+
+def groups_with_stars(size):
+    """(ab)*c(de)+f.(g|h)*... : groupes, quantificateurs et jokers mélangés."""
+    parts = []
+    while sum(len(p) for p in parts) < size:
+        parts.append(random.choice(["(ab)*c", "(de)+f", ".", "(g|h)*", "i+"]))
+    return "".join(parts)
+
+
+FAMILIES = {
+    "alternance de mots": words_alternation,
+    "littéral long": long_literal,
+    "groupes + étoiles": groups_with_stars,
+}
+
+
+# ---------------- BENCHMARK ----------------
+def measure(fn, pattern, repeat=REPEAT):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(pattern)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+print("\n=== Benchmark Parser (nouveau vs ancien) ===\n")
+
+for family, make in FAMILIES.items():
+    print(f"--- {family} ---")
+    print(f"{'taille':>8} {'nouveau (ms)':>13} {'µs/car':>8} {'ancien (ms)':>12} {'même arbre':>11}")
+
+    for size in SIZES:
+        pattern = make(size)
+        new_ms = measure(parse, pattern)
+        per_char = new_ms * 1000 / len(pattern)
+
+        if size <= LEGACY_MAX_SIZE:
+            old_ms = measure(parse_legacy, pattern, repeat=1)
+            same = str(parse(pattern)) == str(parse_legacy(pattern))
+            old_txt, same_txt = f"{old_ms:12.2f}", "✔" if same else "✘"
+        else:
+            old_ms, old_txt, same_txt = None, f"{'-':>12}", "-"
+
+        print(f"{len(pattern):8d} {new_ms:13.2f} {per_char:8.2f} {old_txt} {same_txt:>11}")
+        log(f"[{family}] len={len(pattern)} new={new_ms:.2f}ms "
+            f"old={'-' if old_ms is None else f'{old_ms:.2f}ms'}")
+    print()
+
+print("Temps par caractère constant pour le nouveau parseur = croissance linéaire.")
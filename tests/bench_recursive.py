@@ -0,0 +1,107 @@
+"""
+Benchmark egrep -r : un processus egrep.py par fichier (ancienne façon, RegEx
+recompilée à chaque fois) vs search_tree (compilation unique, file d'attente
+bornée, 1 processus puis un par coeur). Mêmes nombres de lignes par fichier.
+Usage : python3 bench_recursive.py [répertoire]   (sinon 200 livres générés d'environ 250 Ko)
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import subprocess
+
+ENGINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mySearchEngine")
+sys.path.insert(0, ENGINE_DIR)
+
+from parallel_scan import build_scanner, iter_files, search_tree
+
+# ---------------- CONFIG ----------------
+N_FILES = 200
+FILE_CHARS = 250_000
+SUBPROCESS_SAMPLE = 20          # fichiers lancés un par un (temps extrapolé au répertoire)
+LOG_PATH = "perf_recursive.txt"
+TEXT_DIR = "bench_recursive_library"
+
+PATTERNS = [
+    "Sargon",
+    "S(a|g|r)+on",
+    "(" + "|".join(f"w{i}rd" for i in range(40)) + "|temple)",
+]
+
+random.seed(0)
+
+
+# ---------------- LOG FILE ----------------
+def log(text):
+    with open(LOG_PATH, "a") as f:
+        f.write(text + "\n")
+
+
+# ---------------- TEXTE ----------------
+def generate_library(directory, n_files, n_chars):
+    words = ("the of and to in that was he for it with as his on be at by had which "
+             "there when where then from they this not all were we are but temple gold").split()
+    os.makedirs(directory, exist_ok=True)
+    for i in range(n_files):
+        lines = []
+        written = 0
+        while written < n_chars:
+            line = [random.choice(words) for _ in range(random.randint(6, 14))]
+            if random.random() < 0.005:
+                line[random.randrange(len(line))] = "Sargon"
+            line = " ".join(line)
+            lines.append(line)
+            written += len(line) + 1
+        with open(os.path.join(directory, f"{i}.txt"), "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+# ---------------- BENCHMARK ----------------
+def run_tree(pattern, directory, jobs):
+    t0 = time.perf_counter()
+    scanner = build_scanner(pattern)                # compilation comprise, une seule fois
+    counts = {path: n for path, n, _ in search_tree(scanner, directory, jobs, count_only=True)}
+    return time.perf_counter() - t0, counts
+
+
+def run_one_process_per_file(pattern, files):
+    counts = {}
+    t0 = time.perf_counter()
+    for path in files:
+        proc = subprocess.run([sys.executable, "egrep.py", "-c", pattern, path],
+                              cwd=ENGINE_DIR, capture_output=True, text=True)
+        counts[path] = int(proc.stdout.strip() or 0)
+    return time.perf_counter() - t0, counts
+
+
+if len(sys.argv) > 1:
+    directory = os.path.abspath(sys.argv[1])
+else:
+    directory = os.path.abspath(TEXT_DIR)
+    generate_library(directory, N_FILES, FILE_CHARS)
+files = list(iter_files(directory))
+size_mb = sum(os.path.getsize(path) for path in files) / 1e6
+cores = os.cpu_count() or 1
+
+print(f"\n=== Benchmark egrep -r ({directory}, {len(files)} fichiers, {size_mb:.1f} Mo, {cores} coeurs) ===\n")
+print(f"{'RegEx':24} {'1 proc./fichier (s)':>20} {'-r -j 1 (s)':>12} {'-r -j 0 (s)':>12} "
+      f"{'Mo/s':>8} {'gain':>7} {'mêmes nombres':>14}")
+
+for pattern in PATTERNS:
+    label = pattern if len(pattern) <= 24 else pattern[:21] + "..."
+    sample = files[:SUBPROCESS_SAMPLE]
+    sample_s, sample_counts = run_one_process_per_file(pattern, sample)
+    per_file_s = sample_s * len(files) / len(sample)       # extrapolé à tout le répertoire
+    seq_s, seq_counts = run_tree(pattern, directory, 1)
+    par_s, par_counts = run_tree(pattern, directory, 0)
+    same = seq_counts == par_counts and all(seq_counts[p] == n for p, n in sample_counts.items())
+
+    print(f"{label:24} {per_file_s:20.2f} {seq_s:12.2f} {par_s:12.2f} {size_mb / par_s:8.1f} "
+          f"{per_file_s / par_s:6.1f}× {'✔' if same else '✘':>14}")
+    log(f"[{pattern[:40]}] files={len(files)} size={size_mb:.1f}MB one_process_per_file={per_file_s:.2f}s "
+        f"(extrapolated from {len(sample)}) tree_j1={seq_s:.2f}s tree_all_cores={par_s:.2f}s same={same}")
+
+if directory == os.path.abspath(TEXT_DIR):
+    shutil.rmtree(directory)
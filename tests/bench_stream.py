@@ -0,0 +1,131 @@
+"""
+Benchmark de egrep sur l'entrée standard (tube) : mémoire et débit selon la taille.
+Un texte généré (jusqu'à plusieurs Go) est écrit dans le tube de egrep.py ;
+le pic de mémoire résidente (VmHWM, /proc, Linux) du processus egrep est relevé :
+  - lecture par morceaux (egrep.py ... -) : pic constant quelle que soit la taille ;
+  - référence : entrée lue d'un bloc (sys.stdin.buffer.read()) puis parcourue.
+Vérifie que le nombre de lignes trouvées est celui de re sur le texte.
+Usage : python3 bench_stream.py [taille_max_Mo]   (défaut 4096)
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import subprocess
+
+ENGINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mySearchEngine")
+sys.path.insert(0, ENGINE_DIR)
+
+from parallel_scan import STREAM_CHUNK
+
+# ---------------- CONFIG ----------------
+SIZES_MB = [64, 256, 1024, 4096]
+BASELINE_MAX_MB = 1024          # au-delà, la lecture d'un bloc risque de saturer la mémoire
+BLOCK_CHARS = 1 << 20           # bloc généré une fois, écrit autant de fois que nécessaire
+LOG_PATH = "perf_stream.txt"
+
+# (arguments egrep, RegEx) : -c sans formatage, et matchs affichés (vers /dev/null)
+RUNS = [
+    (["-c"], "Sargon"),
+    (["-c"], "Sar(g|r)+on"),
+    ([], "king|queen"),
+]
+
+random.seed(0)
+
+
+# ---------------- LOG FILE ----------------
+def log(text):
+    with open(LOG_PATH, "a") as f:
+        f.write(text + "\n")
+
+
+# ---------------- TEXTE ----------------
+def generate_block(n_chars):
+    words = ("the of and to in that was he for it with as his on be at by had which "
+             "there when where then from they this not all were we are but temple gold").split()
+    rare = ["Sargon", "Saggon", "king", "queen", "Babylon"]
+    lines = []
+    written = 0
+    while written < n_chars:
+        line = [random.choice(words) for _ in range(random.randint(6, 14))]
+        if random.random() < 0.01:
+            line[random.randrange(len(line))] = random.choice(rare)
+        line = " ".join(line)
+        lines.append(line)
+        written += len(line) + 1
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+# ---------------- BENCHMARK ----------------
+def peak_rss_mb(pid):
+    """Pic de mémoire résidente du processus (VmHWM), en Mo ; 0 si illisible."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def feed(cmd, block, repeats, capture):
+    """Écrit block repeats fois dans le tube de cmd ; (secondes, pic RSS en Mo, sortie)."""
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, cwd=ENGINE_DIR,
+                            stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+                            env=dict(os.environ, DAAR_DFA_CACHE="0"))
+    peak = 0.0
+    t0 = time.perf_counter()
+    try:
+        for k in range(repeats):
+            proc.stdin.write(block)
+            if k % 16 == 0:
+                peak = max(peak, peak_rss_mb(proc.pid))
+    except BrokenPipeError:
+        pass
+    proc.stdin.close()
+    # le processus finit de lire le dernier morceau : dernier relevé juste avant sa sortie
+    while proc.poll() is None:
+        peak = max(peak, peak_rss_mb(proc.pid))
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - t0
+    out = proc.stdout.read().decode() if capture else ""
+    return elapsed, peak, out.strip()
+
+
+def whole_input_cmd(pattern):
+    return [sys.executable, "-c",
+            "import sys; from parallel_scan import build_scanner; "
+            f"print(build_scanner({pattern!r}).count(sys.stdin.buffer.read()))"]
+
+
+max_mb = int(sys.argv[1]) if len(sys.argv) > 1 else max(SIZES_MB)
+sizes = [size for size in SIZES_MB if size <= max_mb]
+block = generate_block(BLOCK_CHARS)
+block_text = block.decode("utf-8")
+
+print(f"\n=== egrep sur un tube (morceaux de {STREAM_CHUNK >> 20} Mo) ===\n")
+print(f"{'commande':26} {'taille (Mo)':>11} {'Mo/s':>7} {'pic RSS (Mo)':>13} "
+      f"{'bloc entier : pic RSS (Mo)':>27} {'mêmes lignes':>13}")
+
+for options, pattern in RUNS:
+    expected_per_block = len({m.start() for m in re.finditer(rf"^.*(?:{pattern}).*$", block_text, re.M)})
+    label = " ".join(["egrep"] + options + [pattern])
+    for size in sizes:
+        repeats = max(1, size * (1 << 20) // len(block))
+        size_mb = repeats * len(block) / 1e6
+        cmd = [sys.executable, "egrep.py"] + options + [pattern, "-"]
+        elapsed, peak, out = feed(cmd, block, repeats, capture=bool(options))
+        same = out == str(expected_per_block * repeats) if options else "-"
+        whole = "-"
+        if options and size <= BASELINE_MAX_MB:
+            _, whole_peak, whole_out = feed(whole_input_cmd(pattern), block, repeats, capture=True)
+            whole = f"{whole_peak:.0f}"
+            same = same and whole_out == out
+        mark = same if same == "-" else ("✔" if same else "✘")
+        print(f"{label:26} {size_mb:11.0f} {size_mb / elapsed:7.1f} {peak:13.0f} {whole:>27} {mark:>13}")
+        log(f"[stream] {label} size={size_mb:.0f}MB time={elapsed:.2f}s peak_rss={peak:.0f}MB "
+            f"whole_input_peak_rss={whole}MB same={same}")
@@ -0,0 +1,298 @@
+"""
+Suite de benchmarks compilation + parcours, avec vérification différentielle contre re.
+Familles de RegEx générées (concaténations longues, alternances larges, étoiles
+imbriquées, RegEx qui font exploser le DFA, classes de caractères comparées à
+l'alternance équivalente, ancres par branche comme "^a|b$", RegEx qui matchent le
+mot vide comme "(b)*" ou "x?"), textes générés de 1 Mo à 1 Go :
+  - compilation : temps de chaque étape (Parser.parse, regex_to_nfa, nfa_to_dfa,
+    minimize_dfa_hopcroft) sur .*(R), nombre d'états, et build_scanner (ce que compile egrep) ;
+  - parcours : Mo/s de egrep (ByteScanner, tous les matchs) vs re.finditer et grep -E -c ;
+  - vérification : mêmes lignes avec match que re (et grep -E), lignes qui ne matchent
+    que le mot vide comprises, chaque match de egrep est un match de re (re.fullmatch)
+    et les matchs ne se chevauchent pas.
+Usage : python3 bench_suite.py [taille_max_Mo]   (défaut 16 ; 1024 pour aller jusqu'à 1 Go)
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import string
+import shutil
+import subprocess
+
+# compilations mesurées sans le cache disque des DFA (cf. dfa_store.py)
+os.environ.setdefault("DAAR_DFA_CACHE", "0")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mySearchEngine"))
+
+from Parser import parse, fold_tree, anchor_branches, has_anchors, CONCAT, STAR, PLUS, ALT, QUEST, DOT, CLASS, BOL, EOL
+from NFA import tree_to_nfa
+from DFA import nfa_to_dfa, minimize_dfa_hopcroft, dfa_states, DFATooLarge
+from matching import UNANCHORED_METHOD
+from bitparallel import choose_engine
+from parallel_scan import build_scanner
+
+# ---------------- CONFIG ----------------
+TEXT_SIZES_MB = [1, 16, 128, 1024]
+DEFAULT_MAX_MB = 16
+BLOCK_CHARS = 1 << 20           # bloc de 1 Mo généré une fois, répété pour les grandes tailles
+WITNESS_RATE = 0.01             # proportion de lignes qui contiennent un match de la RegEx
+MAX_DFA_STATES = 50_000         # au-delà, nfa_to_dfa s'arrête (DFATooLarge)
+LOG_PATH = "perf_suite.txt"
+
+random.seed(0)
+
+WORDS = ("the of and to in that was he for it with as his on be at by had which "
+         "there when where then from they this not all were we are but temple gold").split()
+LETTERS = "abcdeghiklmnorstuw"
+
+
+# ---------------- LOG FILE ----------------
+def log(text):
+    with open(LOG_PATH, "a") as f:
+        f.write(text + "\n")
+
+
+# ---------------- FAMILLES DE REGEX ----------------
+def random_word(lo=3, hi=8):
+    return "".join(random.choice(LETTERS) for _ in range(random.randint(lo, hi)))
+
+
+def long_concatenation(n):
+    """n caractères, un sur cinq remplacé par '.' : pas un littéral pur."""
+    return "".join("." if i % 5 == 4 else random.choice(LETTERS) for i in range(n))
+
+
+def wide_alternation(n):
+    """n mots, plus un joker : ni littéral ni alternative de littéraux."""
+    return "(" + "|".join(random_word() for _ in range(n)) + ")s+"
+
+
+def nested_stars(depth):
+    """(((t|h)*e)*r)*...s : depth étoiles imbriquées."""
+    regex = "(t|h)"
+    for i in range(depth):
+        regex = f"({regex}*{LETTERS[i]})"
+    return regex + "*s" + random_word(2, 3)
+
+
+def dfa_blowup(k):
+    """a.{k} : le DFA de .*a.{k} a 2^(k+1) états (il retient les k+1 derniers 'a')."""
+    return "a" + "." * k
+
+
+def spelled_out(chars):
+    """Classe écrite comme une alternance de ses caractères ([a-z] → (a|b|...|z))."""
+    return "(" + "|".join(chars) + ")"
+
+
+CLASS_PATTERNS = [
+    "[a-z]+ing",
+    spelled_out(string.ascii_lowercase) + "+ing",
+    "[a-z]{2}[0-9]{2,4}",
+    spelled_out(string.ascii_lowercase) * 2 + spelled_out(string.digits) + "{2,4}",
+    "[^ ]+tion",                # classe niée : 2 intervalles, pas 1,1 million de caractères
+]
+
+NULLABLE_PATTERNS = [         # matchent le mot vide : toute ligne matche (sauf ancres)
+    "(b)*",
+    "x?",
+    "((d)?)*$",
+    "^(the )?[a-z]*$|^$",
+]
+
+ANCHORED_PATTERNS = [
+    "^a|b$",
+    "^the|gold$",
+    "^w[a-z]+|[a-z]+ld$",
+    "^(the|of) [a-z]+|temple$|h[aeiou]s",
+    "^[a-z]+ (was|were) [a-z]+ [a-z]+$|^gold",
+]
+
+FAMILIES = [
+    ("concaténation", [long_concatenation(n) for n in (8, 32, 128)]),
+    ("alternance", [wide_alternation(n) for n in (16, 128, 1024)]),
+    ("étoiles imbriquées", [nested_stars(d) for d in (2, 4, 8)]),
+    ("explosion du DFA", [dfa_blowup(k) for k in (4, 10, 16)]),
+    ("classes", CLASS_PATTERNS),
+    ("ancres par branche", ANCHORED_PATTERNS),
+    ("mot vide", NULLABLE_PATTERNS),
+]
+
+PRINTABLE = string.ascii_letters + string.digits + string.punctuation + " "
+
+
+def sample_match(tree, alphabet=LETTERS):
+    """Un mot du langage de la RegEx, tiré au hasard (témoin inséré dans le texte)."""
+    def combine(node, subs):
+        if node.root == CONCAT:
+            return subs[0] + subs[1]
+        if node.root == ALT:
+            return random.choice(subs)
+        if node.root == STAR:
+            return subs[0] * random.randint(0, 2)
+        if node.root == PLUS:
+            return subs[0] * random.randint(1, 2)
+        if node.root == QUEST:
+            return random.choice(["", subs[0]])
+        if node.root == DOT:
+            return random.choice(alphabet)
+        if node.root in (BOL, EOL):
+            return ""
+        if node.root == CLASS:
+            inside = [c for c in PRINTABLE if any(lo <= ord(c) <= hi for lo, hi in node.ranges)]
+            return random.choice(inside) if inside else chr(node.ranges[0][0])
+        return chr(node.root)
+    return fold_tree(tree, combine)
+
+
+# ---------------- TEXTE ----------------
+def generate_block(pattern, n_chars):
+    """
+    Lignes de mots courants ; WITNESS_RATE des lignes contiennent un match de la RegEx
+    (d'une branche tirée au hasard, placé en tête / en fin de ligne si la branche est ancrée).
+    """
+    branches = anchor_branches(parse(pattern))
+    lines = []
+    written = 0
+    while written < n_chars:
+        line = [random.choice(WORDS) for _ in range(random.randint(6, 14))]
+        if random.random() < WITNESS_RATE:
+            at_start, core, at_end = random.choice(branches)
+            witness = sample_match(core) if core is not None else ""
+            if at_start and at_end:
+                line = []
+            position = 0 if at_start else len(line) if at_end else random.randrange(len(line) + 1)
+            line.insert(position, witness)
+        line = " ".join(line)
+        lines.append(line)
+        written += len(line) + 1
+    return "\n".join(lines) + "\n"
+
+
+# ---------------- BENCHMARK ----------------
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - t0, result
+
+
+def compile_stages(pattern):
+    """
+    Temps (ms) et tailles des étapes de compilation du DFA de .*(R) (celui de egrep) ;
+    de R pour une RegEx ancrée (automates lancés depuis le bord de la ligne).
+    """
+    stages = {}
+    if not has_anchors(parse(pattern)):
+        pattern = f".*({pattern})"
+    t, tree = timed(parse, pattern)
+    stages["parse"] = t * 1000
+    t, nfa = timed(tree_to_nfa, tree, UNANCHORED_METHOD)
+    stages["nfa"] = t * 1000
+    stages["nfa_states"] = nfa.count_id
+    try:
+        t, dfa = timed(nfa_to_dfa, nfa, MAX_DFA_STATES)
+    except DFATooLarge:
+        stages["dfa"] = stages["min"] = None
+        stages["dfa_states"] = stages["min_states"] = f">{MAX_DFA_STATES}"
+        return stages
+    stages["dfa"] = t * 1000
+    stages["dfa_states"] = len(dfa_states(dfa))
+    t, minimal = timed(minimize_dfa_hopcroft, dfa)
+    stages["min"] = t * 1000
+    stages["min_states"] = len(dfa_states(minimal))
+    return stages
+
+
+def ms(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def check_block(scanner, regex, text):
+    """(mêmes lignes que re, matchs valides) sur le bloc de 1 Mo."""
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    expected = {no for no, line in enumerate(lines, start=1) if regex.search(line)}
+    found = set()
+    valid = True
+    last = (0, 0)
+    for record in scanner.scan(text.encode("utf-8")):
+        found.add(record.line_no)
+        valid = valid and regex.fullmatch(record.text) is not None
+        valid = valid and (record.line_no, record.start) >= last            # ni chevauchement ni retour
+        last = (record.line_no, record.end)
+    return found == expected, valid
+
+
+def egrep_scan(scanner, buf):
+    return sum(1 for _ in scanner.scan(buf))
+
+
+def re_scan(regex, text):
+    return sum(1 for _ in regex.finditer(text))
+
+
+def grep_count(pattern, path):
+    proc = subprocess.run(["grep", "-E", "-c", pattern, path], capture_output=True, text=True)
+    return int(proc.stdout.strip() or 0)
+
+
+max_mb = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MAX_MB
+sizes = [size for size in TEXT_SIZES_MB if size <= max_mb]
+has_grep = shutil.which("grep") is not None
+text_path = "bench_suite_text.txt"
+
+print("\n=== Compilation (DFA de .*(R), méthode " + UNANCHORED_METHOD + ") ===\n")
+print(f"{'famille':19} {'RegEx':24} {'moteur':>11} {'parse':>7} {'NFA':>7} {'DFA':>8} {'min':>8} "
+      f"{'états NFA':>9} {'états DFA':>10} {'états min':>10} {'egrep (ms)':>11}")
+for family, patterns in FAMILIES:
+    for pattern in patterns:
+        label = pattern if len(pattern) <= 24 else pattern[:21] + "..."
+        stages = compile_stages(pattern)
+        build_s, _ = timed(build_scanner, pattern)
+        print(f"{family:19} {label:24} {choose_engine(pattern):>11} {ms(stages['parse']):>7} "
+              f"{ms(stages['nfa']):>7} {ms(stages['dfa']):>8} {ms(stages['min']):>8} "
+              f"{stages['nfa_states']:>9} {stages['dfa_states']:>10} {stages['min_states']:>10} "
+              f"{build_s * 1000:11.1f}")
+        log(f"[compile] {family} {pattern[:60]} engine={choose_engine(pattern)} parse={ms(stages['parse'])}ms "
+            f"nfa={ms(stages['nfa'])}ms dfa={ms(stages['dfa'])}ms min={ms(stages['min'])}ms "
+            f"nfa_states={stages['nfa_states']} dfa_states={stages['dfa_states']} "
+            f"min_states={stages['min_states']} build_scanner={build_s * 1000:.1f}ms")
+
+print(f"\n=== Parcours (Mo/s) et vérification contre re{' et grep -E' if has_grep else ''} ===\n")
+print(f"{'RegEx':24} {'taille (Mo)':>11} {'egrep':>8} {'re':>8} {'grep -E':>8} "
+      f"{'lignes':>9} {'mêmes lignes':>13} {'matchs valides':>15}")
+try:
+    for family, patterns in FAMILIES:
+        for pattern in patterns:
+            label = pattern if len(pattern) <= 24 else pattern[:21] + "..."
+            scanner = build_scanner(pattern)
+            regex = re.compile(pattern, re.MULTILINE)         # '^' / '$' à chaque ligne du texte
+            block = generate_block(pattern, BLOCK_CHARS)
+            same_block, valid = check_block(scanner, regex, block)
+            for size in sizes:
+                repeats = max(1, size * (1 << 20) // len(block))
+                text = block * repeats
+                buf = text.encode("utf-8")
+                size_mb = len(buf) / 1e6
+                egrep_s, _ = timed(egrep_scan, scanner, buf)
+                re_s, _ = timed(re_scan, regex, text)
+                lines = scanner.count(buf)
+                same = same_block
+                grep_rate = "-"
+                if has_grep:
+                    with open(text_path, "wb") as f:
+                        f.write(buf)
+                    grep_s, grep_lines = timed(grep_count, pattern, text_path)
+                    grep_rate = f"{size_mb / grep_s:.1f}"
+                    same = same and grep_lines == lines
+                print(f"{label:24} {size_mb:11.0f} {size_mb / egrep_s:8.1f} {size_mb / re_s:8.1f} "
+                      f"{grep_rate:>8} {lines:9d} {'✔' if same else '✘':>13} {'✔' if valid else '✘':>15}")
+                log(f"[scan] {family} {pattern[:60]} size={size_mb:.0f}MB egrep={egrep_s:.3f}s "
+                    f"re={re_s:.3f}s grep={grep_rate}MB/s lines={lines} same={same} valid={valid}")
+                del text, buf
+finally:
+    if os.path.exists(text_path):
+        os.remove(text_path)
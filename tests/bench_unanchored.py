@@ -0,0 +1,132 @@
+"""
+Benchmark egrep (chemin DFA) : recherche non ancrée en un passage (.*R + DFA miroir)
+vs ancienne version (DFA ancré relancé à chaque colonne).
+Usage : python3 bench_unanchored.py [livre.txt]   (sinon texte généré d'environ 1 Mo)
+"""
+
+import io
+import os
+import sys
+import time
+import random
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mySearchEngine"))
+
+from colorama import Fore, Style
+from compiled_dfa import CompiledDFA, DEAD
+from matching import DFASearcher, scan_lines_in_file, compile_min
+
+# ---------------- CONFIG ----------------
+GENERATED_CHARS = 1_000_000
+LOG_PATH = "perf_unanchored.txt"
+TEXT_PATH = "bench_unanchored_text.txt"
+
+PATTERNS = [
+    "S(a|g|r)+on",
+    "king(dom|ly)",
+    "(th|wh)e(n|re)",
+    "a(b|c)*d",
+    "(" + "|".join(["Babylon", "Nineveh", "Assyria", "Sargon", "Hammurabi"]) + ")",
+    "e.*e",
+]
+
+random.seed(0)
+
+
+# ---------------- LOG FILE ----------------
+def log(text):
+    with open(LOG_PATH, "a") as f:
+        f.write(text + "\n")
+
+
+# ---------------- ANCIENNE VERSION ----------------
+# Le DFA ancré est relancé à chaque colonne de chaque ligne (O(n·m)) et tous les
+# couples (début, fin) acceptés sont affichés : l'implémentation remplacée,
+# gardée ici comme référence.
+def match_dfa_in_file_legacy(dfa, filepath):
+    cdfa = CompiledDFA.of(dfa)
+    found = False
+    with open(filepath, 'r') as f:
+        line_no = 0
+        while True:
+            line = f.readline()
+            if not line:
+                break
+            line_no += 1
+            line = line.rstrip('\n')
+            for start in range(len(line)):
+                state = cdfa.start
+                i = start
+                while i < len(line):
+                    state = cdfa.step(state, line[i])
+                    if state == DEAD:
+                        break
+                    if cdfa.is_final(state):
+                        found = True
+                        colored_line = (
+                            line[:start] +
+                            Fore.RED + line[start:i+1] + Style.RESET_ALL +
+                            line[i+1:]
+                        )
+                        print(f"Match found: line {line_no}, column {start+1}, text '{line[start:i+1]}', full line: {colored_line}")
+                    i += 1
+    return found
+
+
+# ---------------- TEXTE ----------------
+def generate_text(path, n_chars):
+    """Lignes de mots courants ; environ une ligne sur 50 contient un mot recherché."""
+    words = ("the of and to in that was he for it with as his on be at by had which "
+             "there when where then from they this not all were we are but temple gold").split()
+    rare = "kingdom kingly Sargon Saron Babylon Nineveh abbcd".split()
+    with open(path, "w") as f:
+        written = 0
+        while written < n_chars:
+            line = [random.choice(words) for _ in range(random.randint(6, 14))]
+            if random.random() < 0.02:
+                line[random.randrange(len(line))] = random.choice(rare)
+            line = " ".join(line)
+            f.write(line + "\n")
+            written += len(line) + 1
+
+
+# ---------------- BENCHMARK ----------------
+def timed(fn, *args):
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        t0 = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - t0
+    return elapsed, out.getvalue()
+
+
+def matched_lines(output):
+    return {line.split(",")[0] for line in output.splitlines() if line.startswith("Match found")}
+
+
+if len(sys.argv) > 1:
+    path = sys.argv[1]
+else:
+    path = TEXT_PATH
+    generate_text(path, GENERATED_CHARS)
+size_mb = os.path.getsize(path) / 1e6
+
+print(f"\n=== Benchmark recherche non ancrée ({path}, {size_mb:.2f} Mo) ===\n")
+print(f"{'RegEx':24} {'ancien (s)':>11} {'Mo/s':>7} {'nouveau (s)':>12} {'Mo/s':>7} {'gain':>7} {'lignes':>8}")
+
+for pattern in PATTERNS:
+    label = pattern if len(pattern) <= 24 else pattern[:21] + "..."
+    searcher = DFASearcher(pattern)                 # compilation hors mesure
+    old_s, old_out = timed(match_dfa_in_file_legacy, compile_min(pattern), path)
+    new_s, new_out = timed(scan_lines_in_file, searcher, path)
+    same = matched_lines(old_out) == matched_lines(new_out)
+
+    print(f"{label:24} {old_s:11.3f} {size_mb / old_s:7.2f} {new_s:12.3f} {size_mb / new_s:7.2f} "
+          f"{old_s / new_s:6.1f}× {'✔' if same else '✘':>8}")
+    log(f"[{pattern}] size={size_mb:.2f}MB old={old_s:.3f}s new={new_s:.3f}s same_lines={same}")
+
+print("\n'lignes' : mêmes lignes trouvées par les deux versions (l'ancienne affiche en plus")
+print("tous les matchs qui se chevauchent, la nouvelle le plus à gauche puis le plus long).")
+
+if path == TEXT_PATH:
+    os.remove(path)
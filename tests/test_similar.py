@@ -0,0 +1,115 @@
+"""
+Test Similar (TF-IDF) : CLI vs API + Performance + Log
+"""
+
+import subprocess
+import time
+from utils import api_get, measure_time
+
+# ---------------- CONFIG ----------------
+BOOK_IDS = [1723, 2016]   # Livres à tester
+SCRIPT_DIR = "../mySearchEngine"
+SCRIPT_NAME = "similar_books.py"
+LOG_PATH = "perf_similar.txt"
+
+print("\n=== Test Similar TF-IDF (CLI vs API + performance + log) ===\n")
+print(f"→ On lance {SCRIPT_NAME} depuis {SCRIPT_DIR}\n")
+
+
+# ---------------- LOG FILE ----------------
+def log(text):
+    with open(LOG_PATH, "a") as f:
+        f.write(text + "\n")
+
+
+# -------------------------------------------------------
+#            TEST POUR CHAQUE LIVRE
+# -------------------------------------------------------
+
+for book_id in BOOK_IDS:
+
+    print(f"\n=============== Test pour le livre {book_id} ===============\n")
+
+    # ---------------- CLI ----------------
+    print("🔹 CLI (DAAR)")
+    cli_result = None
+    try:
+        t0 = time.perf_counter()
+        output = subprocess.check_output(
+            ["python3", SCRIPT_NAME, str(book_id)],
+            stderr=subprocess.STDOUT,
+            cwd=SCRIPT_DIR
+        ).decode("utf-8")
+        cli_time = (time.perf_counter() - t0) * 1000
+        cli_result = output.strip()
+    except subprocess.CalledProcessError as e:
+        print("Erreur CLI :", e.output.decode("utf-8"))
+        cli_time = -1
+
+    print(cli_result)
+    print(f"⏱ Temps CLI : {cli_time:.2f} ms\n")
+
+    # ---------------- API ----------------
+    print("🔹 API /similar/")
+    t0 = time.perf_counter()
+    api_result = api_get(f"/similar/{book_id}")
+    api_time = (time.perf_counter() - t0) * 1000
+
+    if isinstance(api_result, list):
+        for i, book in enumerate(api_result, start=1):
+            print(f" {i}. Doc {book['doc_id']} | sim={book['similarity']:.4f} | {book['title']}")
+    else:
+        print(api_result)
+
+    print(f"⏱ Temps API : {api_time:.2f} ms\n")
+
+    # ---------------- COMPARAISON ----------------
+    print("🔹 Comparaison CLI vs API")
+
+    if cli_result is None or not isinstance(api_result, list):
+        print(" Impossible de comparer (erreur CLI ou API)\n")
+        continue
+
+    cli_ids = []
+    for line in cli_result.split("\n"):
+        line = line.strip()
+        if line.startswith(tuple(str(x) + "." for x in range(1, 101))) and "Doc" in line:
+            try:
+                part = line.split("Doc", 1)[1]
+                doc_id = part.split("|", 1)[0].strip()
+                cli_ids.append(doc_id)
+            except:
+                pass
+
+    api_ids = [b["doc_id"] for b in api_result]
+
+    print("doc_id CLI :", cli_ids)
+    print("doc_id API :", api_ids)
+
+    if cli_ids == api_ids:
+        print("✔ CLI et API donnent les MÊMES livres similaires.\n")
+    else:
+        print(" CLI et API DIFFÈRENT.\n")
+
+    # Tous les termes vs top termes : le top-k doit rester très proche
+    api_full = api_get(f"/similar/{book_id}", {"top_terms": 0})
+    if isinstance(api_full, list):
+        full_ids = [b["doc_id"] for b in api_full]
+        overlap = len(set(full_ids) & set(api_ids))
+        print(f"Recouvrement top_terms=200 / tous les termes : {overlap}/{len(full_ids)}\n")
+
+    # ---------------- LOG ----------------
+    log(f"[{book_id}] CLI={cli_time:.2f}ms API={api_time:.2f}ms")
+
+
+# -------------------------------------------------------
+#            BENCHMARK GLOBAL (API seulement)
+# -------------------------------------------------------
+print("\n=== Benchmark Global /similar (API seulement) ===\n")
+
+mean, times = measure_time(api_get, f"/similar/{BOOK_IDS[0]}", repeat=10)
+
+print(f"Temps moyen API : {mean:.2f} ms")
+print("Mesures :", [round(t, 2) for t in times])
+
+log(f"[GLOBAL] API_mean={mean:.2f}ms")